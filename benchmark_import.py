@@ -0,0 +1,31 @@
+import statistics
+import subprocess
+import sys
+
+# number of fresh interpreter starts per measurement
+REPETITIONS = 10
+
+CORE_IMPORT = ("import network.network, network.builder, neuron_models.leaky_integrate_and_fire, "
+               "neuron_models.perfect_integrate_and_fire, synapse_models.static_synapse, "
+               "synapse_models.stdp_all_to_all_synapse, synapse_models.stdp_nn_symm_synapse")
+CODE = ("import sys, time\n"
+        "start = time.perf_counter()\n"
+        "{}\n"
+        "print(time.perf_counter() - start, 'matplotlib' in sys.modules)\n")
+
+
+def measure(statement):
+    """ Return median import time in ms of statement in fresh interpreters and whether matplotlib was loaded. """
+    times = []
+    for _ in range(REPETITIONS):
+        out = subprocess.run([sys.executable, "-c", CODE.format(statement)], capture_output=True, text=True, check=True).stdout.split()
+        times.append(float(out[0]) * 1000.)
+    return statistics.median(times), out[1] == "True"
+
+
+print("median import time over " + str(REPETITIONS) + " interpreter starts")
+for name, statement in [("numpy", "import numpy"),
+                        ("simulation core", CORE_IMPORT),
+                        ("core + plotting", CORE_IMPORT + "; import network.plotting")]:
+    ms, matplotlib_loaded = measure(statement)
+    print("{:<18}{:>10.1f} ms   matplotlib loaded: {}".format(name, ms, matplotlib_loaded))
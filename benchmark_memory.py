@@ -0,0 +1,93 @@
+import gc
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import tracemalloc
+
+# commit whose neuron and synapse classes still keep their attributes in a __dict__
+BASELINE = "66d533f"
+# number of synapses per measurement and number of pending postsynaptic spikes per STDP synapse
+N_SYNAPSES = 20000
+N_POST_SPIKES = 4
+
+
+def bytes_per_synapse(create):
+    """ Return allocated bytes per synapse for N_SYNAPSES synapses created by create(). """
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    synapses = [create() for _ in range(N_SYNAPSES)]
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    return used / N_SYNAPSES
+
+
+def make_factory(Network, lif_neuron_matrix, syn_class, spikedata):
+    """ Return function creating a registered synapse of syn_class with N_POST_SPIKES pending postsynaptic spikes
+    created by spikedata(ts), or without postsynaptic spike history if spikedata is None. """
+    net = Network(sim_params={"t_sim": 1.})
+    source = lif_neuron_matrix(net)
+    target = lif_neuron_matrix(net)
+
+    def create():
+        syn = syn_class(net, source, target, 100., 1.)
+        if spikedata is not None:
+            syn.postsynaptic_spikedata = [spikedata(ts) for ts in range(N_POST_SPIKES)]
+        return syn
+    return create
+
+
+def measure():
+    """ Return dictionary of bytes per synapse by model for the classes of the source tree first on sys.path. """
+    from network.network import Network
+    from neuron_models.leaky_integrate_and_fire import lif_neuron_matrix
+    from synapse_models import static_synapse, stdp_all_to_all_synapse, stdp_nn_symm_synapse
+
+    # STDP_NN_SymmSnyapse only keeps a postsynaptic spike history in versions with PostsynapticSpikeData
+    nn_spikedata = getattr(stdp_nn_symm_synapse, "PostsynapticSpikeData", None)
+    cases = [
+        ("StaticSynapse", static_synapse.StaticSynapse, None),
+        ("STDPAllToAllSynapse", stdp_all_to_all_synapse.STDPAllToAllSynapse,
+         lambda ts: stdp_all_to_all_synapse.PostsynapticSpikeData(ts, 1.5)),
+        ("STDP_NN_SymmSnyapse", stdp_nn_symm_synapse.STDP_NN_SymmSnyapse, nn_spikedata),
+    ]
+    return {name: bytes_per_synapse(make_factory(Network, lif_neuron_matrix, syn_class, spikedata))
+            for name, syn_class, spikedata in cases}
+
+
+def measure_baseline():
+    """ Return measure() for the classes of the BASELINE commit, extracted with git archive into a temporary
+    directory and measured in a separate interpreter, since its modules have the same names. """
+    repository = os.path.dirname(os.path.abspath(__file__))
+    directory = tempfile.mkdtemp()
+    try:
+        archive = subprocess.run(["git", "archive", BASELINE, "network", "neuron_models", "synapse_models"],
+                                 cwd=repository, capture_output=True, check=True).stdout
+        with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+            tar.extractall(directory)
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), directory], capture_output=True, check=True,
+                                text=True, env=dict(os.environ, MPLBACKEND="Agg")).stdout
+        return json.loads(output)
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # measurement of the source tree in the given directory, used by measure_baseline
+        sys.path.insert(0, sys.argv[1])
+        print(json.dumps(measure()))
+    else:
+        baseline = measure_baseline()
+        current = measure()
+        print("bytes per synapse (" + str(N_POST_SPIKES) + " pending postsynaptic spikes for synapses with spike history)")
+        print("{:<22}{:>20}{:>22}".format("model", BASELINE + " (__dict__)", "current (__slots__)"))
+        for name, used in current.items():
+            print("{:<22}{:>20.0f}{:>22.0f}".format(name, baseline[name], used))
+        print("STDP_NN_SymmSnyapse of " + BASELINE + " also keeps its postsynaptic spike history, the current one a fixed-size state.")
@@ -0,0 +1,98 @@
+import numpy as np
+from network.network import Network
+from network.builder import build_network
+from neuron_models.leaky_integrate_and_fire import lif_neuron_euler, lif_neuron_euler_adaptive, lif_neuron_matrix, lif_neuron_matrix_ps
+from neuron_models.perfect_integrate_and_fire import pif_neuron
+from synapse_models.static_synapse import StaticSynapse
+
+# Accuracy of the precision settings against the exact lif_neuron_matrix reference.
+# float64 populations reproduce single lif_neuron_matrix objects exactly. With mixed precision
+# only the recordings are rounded (|dV_m| ~ 4e-6 mV) and spike times stay identical in both cases.
+# float32 keeps the spike times of the small validation case of test_lif_exp_static.py
+# (|dV_m| ~ 3e-5 mV), but in the recurrent network rounding differences move single spikes
+# by one step and the network activity diverges afterwards.
+# Single neuron objects keep their state in double precision with mixed precision as well,
+# so their recorded V_m is the float64 one rounded to single precision.
+
+N = 250
+
+
+def static_spec(precision):
+    """ Return configuration of test_lif_exp_static.py as declarative specification. """
+    return {
+        "sim_params": {"t_sim": 100., "precision": precision},
+        "populations": {
+            "input": {"model": "lif_psc_exp_exact", "size": 10, "params": {"I_e": [600. - (i % 5) * 100 for i in range(10)]}},
+            "output": {"model": "lif_psc_exp_exact", "size": 1, "params": {"I_e": 200.}, "record": ["V_m"]},
+        },
+        "projections": [{"source": "input", "target": "output", "weight": 700., "delay": 2.5}],
+    }
+
+
+def recurrent_spec(precision):
+    """ Return specification of a recurrent network with input population. """
+    return {
+        "sim_params": {"t_sim": 1000., "precision": precision},
+        "populations": {
+            "input": {"model": "lif_psc_exp_exact", "size": 50, "params": {"I_e": np.linspace(380., 800., 50)}},
+            "exc": {"model": "lif_psc_exp_exact", "size": N, "params": {"I_e": np.linspace(200., 370., N)}, "record": ["V_m"]},
+        },
+        "projections": [
+            {"source": "input", "target": "exc", "connectivity": {"rule": "explicit", "sources": np.arange(N) % 50,
+                                                                  "targets": np.arange(N)}, "weight": 900., "delay": 1.0},
+            {"source": "exc", "target": "exc", "weight": np.linspace(-20., 30., N * N), "delay": 1.5},
+        ],
+    }
+
+
+def run_objects(neuron_class, precision):
+    """ Simulate the configuration of test_lif_exp_static.py with single neuron objects and return V_m of the output neuron. """
+    net = Network(sim_params={"t_sim": 100., "precision": precision})
+    input_neurons = [neuron_class(net, {"I_e": 600. - (i % 5) * 100}) for i in range(10)]
+    output_neuron = neuron_class(net, {"I_e": 200.})
+    for i, neuron in enumerate(input_neurons):
+        StaticSynapse(net, neuron, output_neuron, 700.1 - i * 0.37, 2.5)
+    net.simulate()
+    return output_neuron.V_m
+
+
+def run(spec, name):
+    """ Simulate network and return recorded V_m, spike steps and neuron indices of the given population. """
+    net = build_network(spec)
+    net.simulate()
+    population = net.get_population(name)
+    steps, indices = population.get_spikes()
+    return population, population.V_m, steps, indices
+
+
+# single lif_neuron_matrix objects as reference
+net = Network(sim_params={"t_sim": 100.})
+input_neurons = [lif_neuron_matrix(net, {"I_e": 600. - (i % 5) * 100}) for i in range(10)]
+output_neuron = lif_neuron_matrix(net, {"I_e": 200.})
+for neuron in input_neurons:
+    StaticSynapse(net, neuron, output_neuron, 700., 2.5)
+net.simulate()
+
+for title, spec, name, reference in [("test_lif_exp_static", static_spec, "output", output_neuron.V_m[:, None]),
+                                     ("recurrent network", recurrent_spec, "exc", None)]:
+    _, V_ref, steps_ref, indices_ref = run(spec("float64"), name)
+    if reference is not None:
+        assert np.array_equal(V_ref, reference)
+    print(title + ":", len(steps_ref), "spikes with float64")
+    print("{:<10}{:>13}{:>14}{:>18}{:>18}".format("precision", "state bytes", "record bytes", "max |dV_m| [mV]", "matching spikes"))
+    for precision in ("float64", "mixed", "float32"):
+        population, V_m, steps, indices = run(spec(precision), name)
+        codes = steps * population.size + indices
+        codes_ref = steps_ref * population.size + indices_ref
+        matching = len(np.intersect1d(codes, codes_ref))
+        # V_m is compared up to the first step with a deviating spike
+        deviating = np.setxor1d(codes, codes_ref) // population.size
+        end = deviating.min() if len(deviating) > 0 else len(V_m)
+        diff = np.abs(V_m[:end].astype(np.float64) - V_ref[:end]).max()
+        print("{:<10}{:>13}{:>14}{:>18.2e}{:>18}".format(precision, population.V_m_rel_to_E_L.itemsize, V_m.itemsize, diff,
+                                                         str(matching) + "/" + str(len(steps_ref))))
+
+for neuron_class in (pif_neuron, lif_neuron_euler, lif_neuron_euler_adaptive, lif_neuron_matrix, lif_neuron_matrix_ps):
+    V_m = run_objects(neuron_class, "mixed")
+    print(neuron_class.__name__, "objects with mixed precision record the float64 V_m: ",
+          V_m.dtype == np.float32 and np.array_equal(V_m, run_objects(neuron_class, "float64").astype(np.float32)))
@@ -0,0 +1,35 @@
+import os
+import sys
+import time
+import numpy as np
+from network.builder import build_network
+
+# size of the population and number of simulated steps
+N_NEURONS = 1000000
+T_SIM = 20.
+
+
+def run(threads):
+    """ Simulate a large unconnected population with the given number of threads and return runtime and spikes. """
+    spec = {
+        "sim_params": {"t_sim": T_SIM, "threads": threads},
+        "populations": {
+            "exc": {"model": "lif_psc_exp_exact", "size": N_NEURONS, "params": {"I_e": np.linspace(300., 1200., N_NEURONS)}},
+        },
+    }
+    net = build_network(spec)
+    start = time.perf_counter()
+    net.simulate()
+    return time.perf_counter() - start, net.get_population("exc").get_spikes()
+
+
+max_threads = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count()
+thread_counts = sorted({2 ** i for i in range(max_threads.bit_length()) if 2 ** i <= max_threads} | {max_threads})
+
+print(N_NEURONS, "neurons,", int(T_SIM / 0.1), "steps,", os.cpu_count(), "cores available")
+print("{:>8}{:>12}{:>10}".format("threads", "time [s]", "speedup"))
+base_time, base_spikes = run(1)
+for threads in thread_counts:
+    runtime, spikes = (base_time, base_spikes) if threads == 1 else run(threads)
+    assert all(np.array_equal(a, b) for a, b in zip(spikes, base_spikes))
+    print("{:>8}{:>12.3f}{:>10.2f}".format(threads, runtime, base_time / runtime))
@@ -0,0 +1,211 @@
+import numpy as np
+
+# default number of values processed at once by chunked functions
+CHUNK_SIZE = 2 ** 22
+
+
+def get_bins(dt, bin_size, t_start, t_stop):
+    """ Return first timestep, timesteps per bin and number of bins of the interval (t_start, t_stop] in ms.
+    Timestep s covers the time ((s - 1) * dt, s * dt]. """
+    bin_steps = max(1, int(round(bin_size / dt)))
+    first_step = int(round(t_start / dt)) + 1
+    num_bins = (int(round(t_stop / dt)) - first_step + 1) // bin_steps
+    return first_step, bin_steps, num_bins
+
+
+def bin_train(steps, first_step, bin_steps, num_bins):
+    """ Return spike counts of the spikes at the given timesteps in num_bins bins of bin_steps starting at first_step. """
+    bins = (steps - first_step) // bin_steps
+    return np.bincount(bins[(steps >= first_step) & (bins < num_bins)], minlength=num_bins)
+
+
+def bin_spikes(steps, indices, num_neurons, dt, bin_size, t_start=0., t_stop=None, neurons=None):
+    """ Return spike counts of shape (number of bins, number of neurons) in bins of bin_size ms within (t_start, t_stop].
+    steps, indices: Timesteps and neuron indices of the spikes, e.g. from Population.get_spikes
+    num_neurons: Number of neurons of the population
+    t_stop: End of the last bin in ms; If None: time of the last spike
+    neurons: Array of neuron indices to return in this order; If None: all neurons
+    """
+    steps, indices = np.asarray(steps), np.asarray(indices)
+    t_stop = (steps.max() if len(steps) > 0 else 0) * dt if t_stop is None else t_stop
+    first_step, bin_steps, num_bins = get_bins(dt, bin_size, t_start, t_stop)
+    columns = np.arange(num_neurons) if neurons is None else np.full(num_neurons, -1)
+    if neurons is not None:
+        columns[neurons] = np.arange(len(neurons))
+    num_columns = num_neurons if neurons is None else len(neurons)
+    bins = (steps - first_step) // bin_steps
+    keep = (steps >= first_step) & (bins < num_bins) & (columns[indices] >= 0)
+    counts = np.bincount(bins[keep] * num_columns + columns[indices[keep]], minlength=num_bins * num_columns)
+    return counts.reshape(num_bins, num_columns)
+
+
+def firing_rates(steps, indices, num_neurons, dt, t_start=0., t_stop=None):
+    """ Return mean firing rate of every neuron in Hz within (t_start, t_stop] in ms. """
+    steps, indices = np.asarray(steps), np.asarray(indices)
+    t_stop = (steps.max() if len(steps) > 0 else 0) * dt if t_stop is None else t_stop
+    keep = (steps > int(round(t_start / dt))) & (steps <= int(round(t_stop / dt)))
+    return np.bincount(indices[keep], minlength=num_neurons) / ((t_stop - t_start) / 1000.)
+
+
+def population_rate(steps, num_neurons, dt, bin_size, t_start=0., t_stop=None):
+    """ Return start times of the bins in ms and mean firing rate of the population in Hz of every bin. """
+    steps = np.asarray(steps)
+    t_stop = (steps.max() if len(steps) > 0 else 0) * dt if t_stop is None else t_stop
+    first_step, bin_steps, num_bins = get_bins(dt, bin_size, t_start, t_stop)
+    counts = bin_train(steps, first_step, bin_steps, num_bins)
+    times = (first_step - 1 + np.arange(num_bins) * bin_steps) * dt
+    return times, counts / (num_neurons * bin_steps * dt / 1000.)
+
+
+def isi_statistics(steps, indices, num_neurons, dt):
+    """ Return mean interspike interval in ms and coefficient of variation of the interspike intervals of every
+    neuron, NaN for neurons with less than two intervals. """
+    steps, indices = np.asarray(steps, dtype=np.int64), np.asarray(indices, dtype=np.int64)
+    # sorting one combined key is much faster than a lexsort of both arrays
+    span = int(steps.max(initial=0)) + 1
+    keys = np.sort(indices * span + steps)
+    steps, indices = keys % span, keys // span
+    same = indices[1:] == indices[:-1]
+    isi = (steps[1:] - steps[:-1])[same] * dt
+    neuron = indices[1:][same]
+    n = np.bincount(neuron, minlength=num_neurons)
+    total = np.bincount(neuron, isi, minlength=num_neurons)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = total / n
+        # variance from the deviations of the mean, which is more accurate than from the sum of squares
+        variance = np.bincount(neuron, (isi - mean[neuron]) ** 2, minlength=num_neurons) / n
+        cv = np.sqrt(variance) / mean
+    mean[n < 2] = np.nan
+    cv[n < 2] = np.nan
+    return mean, cv
+
+
+def cv_isi(steps, indices, num_neurons, dt):
+    """ Return coefficient of variation of the interspike intervals of every neuron, NaN for less than two intervals. """
+    return isi_statistics(steps, indices, num_neurons, dt)[1]
+
+
+def get_fft_size(n, max_lag):
+    """ Return power of two FFT length for cross-correlations of signals of length n without wrap-around up to max_lag. """
+    return 1 << int(np.ceil(np.log2(n + max_lag + 1)))
+
+
+def correlate_spectra(x_spectrum, y_spectrum, size, max_lag):
+    """ Return cross-correlation for lag in [-max_lag, max_lag] from the real FFTs of length size of two signals. """
+    corr = np.fft.irfft(np.conj(x_spectrum) * y_spectrum, size)
+    return np.concatenate((corr[..., size - max_lag:], corr[..., :max_lag + 1]), axis=-1)
+
+
+def cross_correlate(x, y, max_lag):
+    """ Return cross-correlation sum_t x[..., t] * y[..., t + lag] for lag in [-max_lag, max_lag] of the signals along the
+    last axis, computed with real FFTs zero-padded against wrap-around. """
+    size = get_fft_size(x.shape[-1], max_lag)
+    return correlate_spectra(np.fft.rfft(x, size), np.fft.rfft(y, size), size, max_lag)
+
+
+def correlogram(steps_a, steps_b, dt, bin_size, max_lag, t_start=0., t_stop=None):
+    """ Return lags in ms and cross-correlogram of two spike trains, the number of spike pairs with
+    t_b - t_a in each lag bin, computed on binned trains with FFTs.
+    steps_a, steps_b: Timesteps of the spikes of the two trains, e.g. of a neuron or of a whole population
+    bin_size: Width of the lag bins in ms
+    max_lag: Largest lag in ms
+    """
+    steps_a, steps_b = np.asarray(steps_a), np.asarray(steps_b)
+    if t_stop is None:
+        t_stop = max(steps_a.max() if len(steps_a) > 0 else 0, steps_b.max() if len(steps_b) > 0 else 0) * dt
+    first_step, bin_steps, num_bins = get_bins(dt, bin_size, t_start, t_stop)
+    max_bins = int(round(max_lag / (bin_steps * dt)))
+    train_a = bin_train(steps_a, first_step, bin_steps, num_bins).astype(float)
+    train_b = bin_train(steps_b, first_step, bin_steps, num_bins).astype(float)
+    lags = np.arange(-max_bins, max_bins + 1) * bin_steps * dt
+    return lags, np.round(cross_correlate(train_a, train_b, max_bins))
+
+
+def pairwise_correlograms(steps, indices, pairs, dt, bin_size, max_lag, t_start=0., t_stop=None, chunk_size=CHUNK_SIZE):
+    """ Return lags in ms and cross-correlograms of shape (number of pairs, number of lags) of many neuron pairs
+    of a population. Pairs are processed in chunks, so at most about chunk_size binned values are held at once.
+    pairs: Array of shape (number of pairs, 2) with the neuron indices of the first and second train
+    """
+    steps, indices, pairs = np.asarray(steps), np.asarray(indices), np.asarray(pairs).reshape(-1, 2)
+    t_stop = (steps.max() if len(steps) > 0 else 0) * dt if t_stop is None else t_stop
+    first_step, bin_steps, num_bins = get_bins(dt, bin_size, t_start, t_stop)
+    max_bins = int(round(max_lag / (bin_steps * dt)))
+    size = get_fft_size(num_bins, max_bins)
+    # spikes sorted by neuron, so the spikes of a chunk of neurons are contiguous
+    span = int(steps.max(initial=0)) + 1
+    keys = np.sort(indices.astype(np.int64) * span + steps)
+    steps, indices = keys % span, keys // span
+    bounds = np.searchsorted(indices, np.arange(max(indices.max(initial=-1), pairs.max(initial=-1)) + 2))
+    result = np.zeros((len(pairs), 2 * max_bins + 1))
+    pairs_per_chunk = max(1, chunk_size // max(1, 2 * num_bins))
+    for start in range(0, len(pairs), pairs_per_chunk):
+        chunk = pairs[start:start + pairs_per_chunk]
+        neurons, columns = np.unique(chunk, return_inverse=True)
+        # binned trains of all neurons of the chunk from their contiguous spikes
+        counts = bounds[neurons + 1] - bounds[neurons]
+        ends = np.cumsum(counts)
+        spike = np.arange(ends[-1]) + np.repeat(bounds[neurons] - ends + counts, counts)
+        rows = np.repeat(np.arange(len(neurons)), counts)
+        bins = (steps[spike] - first_step) // bin_steps
+        keep = (steps[spike] >= first_step) & (bins < num_bins)
+        trains = np.bincount(rows[keep] * num_bins + bins[keep], minlength=len(neurons) * num_bins).reshape(len(neurons), num_bins)
+        # one FFT per neuron of the chunk, shared by all its pairs
+        spectra = np.fft.rfft(trains, size)
+        columns = columns.reshape(-1, 2)
+        result[start:start + len(chunk)] = correlate_spectra(spectra[columns[:, 0]], spectra[columns[:, 1]], size, max_bins)
+    return np.arange(-max_bins, max_bins + 1) * bin_steps * dt, np.round(result)
+
+
+def stdp_pairing(pre_steps, pre_indices, post_steps, post_indices, sources, targets, dt, window, chunk_size=CHUNK_SIZE):
+    """ Return for every synapse the number of causal (0 < t_post - t_pre <= window) and acausal
+    (0 <= t_pre - t_post < window) spike pairs of its source and target neuron, the pairs seen by all-to-all STDP.
+    pre_steps, pre_indices: Spikes of the source population
+    post_steps, post_indices: Spikes of the target population
+    sources, targets: Arrays with source and target neuron index of every synapse
+    window: Largest time difference of a pair in ms
+    chunk_size: Maximal number of (synapse, presynaptic spike) combinations processed at once
+    """
+    pre_steps, pre_indices = np.asarray(pre_steps, dtype=np.int64), np.asarray(pre_indices, dtype=np.int64)
+    post_steps, post_indices = np.asarray(post_steps, dtype=np.int64), np.asarray(post_indices, dtype=np.int64)
+    sources, targets = np.asarray(sources, dtype=np.int64), np.asarray(targets, dtype=np.int64)
+    window_steps = int(round(window / dt))
+    # postsynaptic spikes as sorted keys neuron * span + step, so counts in a time range of a neuron are searchsorted differences
+    span = int(max(pre_steps.max(initial=0), post_steps.max(initial=0))) + 2 * window_steps + 2
+    post_keys = np.sort(post_indices * span + post_steps + window_steps)
+    # presynaptic spikes sorted by neuron
+    pre_keys = np.sort(pre_indices * span + pre_steps)
+    pre_steps = pre_keys % span
+    pre_bounds = np.searchsorted(pre_keys // span, np.arange(max(sources.max(initial=-1), pre_indices.max(initial=-1)) + 2))
+    # synapses are processed grouped by target, so consecutive searches hit the same postsynaptic spikes, which is much faster
+    synapse_order = np.argsort(targets, kind="stable")
+    sources, targets = sources[synapse_order], targets[synapse_order]
+    starts, counts = pre_bounds[sources], pre_bounds[sources + 1] - pre_bounds[sources]
+
+    causal = np.zeros(len(sources), dtype=np.int64)
+    acausal = np.zeros(len(sources), dtype=np.int64)
+    ends = np.cumsum(counts)
+    first = 0
+    while first < len(sources):
+        # synapses whose presynaptic spikes fit into the chunk, at least one synapse
+        last = max(first + 1, int(np.searchsorted(ends, (ends[first - 1] if first > 0 else 0) + chunk_size, side="right")))
+        c = counts[first:last]
+        chunk_ends = np.cumsum(c)
+        if len(c) > 0 and chunk_ends[-1] > 0:
+            spike = np.arange(chunk_ends[-1]) + np.repeat(starts[first:last] - chunk_ends + c, c)
+            synapse = np.repeat(np.arange(first, last), c)
+            base = targets[synapse] * span + pre_steps[spike] + window_steps
+            at = np.searchsorted(post_keys, base, side="right")
+            after = np.searchsorted(post_keys, base + window_steps, side="right") - at
+            before = at - np.searchsorted(post_keys, base - window_steps, side="right")
+            causal[first:last] = np.bincount(synapse - first, after, minlength=last - first).astype(np.int64)
+            acausal[first:last] = np.bincount(synapse - first, before, minlength=last - first).astype(np.int64)
+        first = last
+    result_causal, result_acausal = np.empty_like(causal), np.empty_like(acausal)
+    result_causal[synapse_order], result_acausal[synapse_order] = causal, acausal
+    return result_causal, result_acausal
+
+
+def weight_changes(network, start_step, end_step):
+    """ Return weight change of every synapse ordered by synapse index between the ends of the two timesteps. """
+    initial_weights = network.get_synapse_table()[2]
+    return network.weight_events.weights_at(end_step, initial_weights) - network.weight_events.weights_at(start_step, initial_weights)
@@ -0,0 +1,109 @@
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+
+from network import rng
+
+# version of the cached projections, to be increased whenever connection rules, random streams
+# or the arrays of projections change, so that entries of older versions are not used anymore
+CACHE_VERSION = 2
+
+
+class BuildCache:
+    """ On-disk cache of the projections of built networks for repeated launches of the same specification.
+    Every projection is stored after its construction, with its synapse arrays sorted by source neuron and all its lookup
+    structures (see Projection.save), in a directory named by the content hash of everything it depends on:
+    the projection specification and its index, the global sizes of source and target population, the local part of the
+    target population, seed, resolution, precision and the versions of the cache and of NumPy. A later build of the same
+    projection adopts the arrays memory-mapped copy-on-write (see Projection.load) instead of drawing, sorting and
+    grouping the connections again. Synapse objects are not cached. Entries are evicted in least recently used order
+    as soon as all entries together exceed max_size bytes. """
+
+    def __init__(self, directory, max_size=2 ** 30):
+        """ Initialize cache.
+        directory: Directory of the cache entries, created if necessary
+        max_size: Maximal total size of all entries in bytes [2 ** 30]
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self.num_hits = 0
+        self.num_misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def get_key(self, network, proj_spec, index=0):
+        """ Return content hash of the connections of the projection described by proj_spec.
+        index: Index of the projection in the specification, which selects its random streams
+        """
+        source = network.get_population(proj_spec["source"])
+        target = network.get_population(proj_spec["target"])
+        content = {"version": CACHE_VERSION, "numpy": np.__version__, "block_size": rng.BLOCK_SIZE,
+                   "seed": network.get_random_streams().seed, "dt": network.get_resolution(), "index": index,
+                   "precision": (np.dtype(network.get_state_dtype()).name, np.dtype(network.get_storage_dtype()).name),
+                   "projection": proj_spec, "source_size": source.global_size, "target_size": target.global_size,
+                   "target_range": (target.offset, target.size)}
+        text = json.dumps(content, sort_keys=True, default=lambda value: np.asarray(value).tolist())
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def get_path(self, key):
+        """ Return directory of the entry with the given key. """
+        return os.path.join(self.directory, key)
+
+    def load(self, key):
+        """ Return directory of the entry with the given key, to be loaded with Projection.load, or None if there is no such entry. """
+        path = self.get_path(key)
+        if not os.path.isdir(path):
+            self.num_misses += 1
+            return None
+        # mark entry as most recently used
+        os.utime(path)
+        self.num_hits += 1
+        return path
+
+    def store(self, key, projection):
+        """ Store a newly built projection under the given key and evict least recently used entries if necessary. """
+        path = self.get_path(key)
+        # entries are written to a temporary directory and renamed, so concurrent builds never see partial entries
+        temporary = path + ".tmp" + str(os.getpid())
+        os.makedirs(temporary, exist_ok=True)
+        projection.save(temporary)
+        try:
+            os.rename(temporary, path)
+        except OSError:
+            # another process stored the same entry in the meantime
+            shutil.rmtree(temporary)
+        self.evict(keep=key)
+
+    def get_entries(self):
+        """ Return list of (last use, size in bytes, key) of all entries. """
+        entries = []
+        for key in os.listdir(self.directory):
+            path = self.get_path(key)
+            if ".tmp" in key or not os.path.isdir(path):
+                continue
+            size = sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+            entries.append((os.path.getmtime(path), size, key))
+        return entries
+
+    def get_size(self):
+        """ Return total size of all entries in bytes. """
+        return sum(size for _, size, _ in self.get_entries())
+
+    def evict(self, keep=None):
+        """ Remove least recently used entries until all entries together fit into max_size.
+        keep: Key of an entry that is never removed [None]
+        """
+        entries = sorted(self.get_entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in entries:
+            if total <= self.max_size:
+                break
+            if key != keep:
+                shutil.rmtree(self.get_path(key), ignore_errors=True)
+                total -= size
+
+    def clear(self):
+        """ Remove all entries. """
+        for _, _, key in self.get_entries():
+            shutil.rmtree(self.get_path(key), ignore_errors=True)
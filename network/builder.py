@@ -0,0 +1,345 @@
+import functools
+import json
+import os
+import numpy as np
+
+from network import rng
+from network.network import Network
+from network.distributed import DistributedNetwork
+from network.build_cache import BuildCache
+from network.structural_plasticity import StructuralPlasticity
+from neuron_models.leaky_integrate_and_fire import lif_population_euler, lif_population_euler_adaptive, lif_population_matrix
+from neuron_models.perfect_integrate_and_fire import pif_population
+from neuron_models.poisson_generator import poisson_population
+from neuron_models.population_model import GenericPopulation
+from synapse_models.projection import Projection
+from synapse_models.static_synapse import StaticProjection
+from synapse_models.mapped_projection import MappedStaticProjection
+from synapse_models.stdp_all_to_all_synapse import STDPAllToAllSynapse
+from synapse_models.stdp_nn_symm_synapse import STDP_NN_SymmSnyapse, STDP_NN_SymmProjection
+
+
+# population classes by model name of the corresponding single neuron model
+POPULATION_MODELS = {
+    "lif_psc_exp_euler": lif_population_euler,
+    "lif_psc_exp_euler_adaptive": lif_population_euler_adaptive,
+    "lif_psc_exp_exact": lif_population_matrix,
+    "pif_psc_exp": pif_population,
+    "poisson_generator": poisson_population,
+}
+
+# array-backed projection classes by synapse model name
+PROJECTION_MODELS = {
+    "static_synapse": StaticProjection,
+    "stdp_nn_symm_synapse": STDP_NN_SymmProjection,
+}
+
+# single synapse classes by model name, synapse models without array-backed projection and delays shorter than
+# the projection supports are built as synapse objects
+SYNAPSE_MODELS = {
+    "stdp_all_to_all_synapse": STDPAllToAllSynapse,
+    "stdp_nn_symm_synapse": STDP_NN_SymmSnyapse,
+}
+
+# keys of the dictionaries of a network specification
+SPEC_KEYS = ("sim_params", "populations", "projections", "structural_plasticity")
+POPULATION_KEYS = ("model", "size", "params", "record")
+PROJECTION_KEYS = ("source", "target", "model", "connectivity", "weight", "delay", "params", "directory")
+# keys of the connectivity dictionaries by rule
+CONNECTIVITY_KEYS = {
+    "all_to_all": ("allow_autapses",),
+    "one_to_one": (),
+    "explicit": ("sources", "targets"),
+    "pairwise_bernoulli": ("p", "allow_autapses"),
+    "fixed_indegree": ("indegree", "allow_autapses", "allow_multapses"),
+}
+
+
+def register_population_model(model):
+    """ Make a PopulationModel instance (see neuron_models.population_model) available
+    in network specifications under its model name. """
+    POPULATION_MODELS[model.model_name] = functools.partial(GenericPopulation, model=model)
+
+
+def load_spec(spec):
+    """ Return network specification as dictionary.
+    spec: Either a dictionary or the path of a JSON or YAML file
+    """
+    if isinstance(spec, dict):
+        return spec
+    with open(spec) as f:
+        if spec.endswith(".yaml") or spec.endswith(".yml"):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("Loading YAML specifications requires PyYAML.")
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def check_keys(spec, allowed, description):
+    """ Raise ValueError if the dictionary spec has keys that are not in allowed.
+    description: Description of the dictionary used in the error message
+    """
+    unknown = [key for key in spec if key not in allowed]
+    if len(unknown) > 0:
+        raise ValueError("Unknown keys " + ", ".join("'" + str(key) + "'" for key in unknown) + " in " + description +
+                         ", allowed keys are " + ", ".join("'" + key + "'" for key in allowed) + ".")
+
+
+def connect(rule, n_source, n_target, target_range=None, generator=None, same_population=False):
+    """ Return source indices, target indices and positions in the full list of connections
+    of all connections created by a connectivity rule that end in the given range of targets.
+    Connections are ordered by source and then by target index.
+    rule: Either the name of the rule or a dictionary with key "rule" and rule specific entries:
+        -all_to_all (every source with every target, "allow_autapses" [True])
+        -one_to_one (source i with target i, both populations need the same size)
+        -explicit (connections given by the lists "sources" and "targets")
+        -pairwise_bernoulli (every source with every target with probability "p", "allow_autapses" [True])
+        -fixed_indegree ("indegree" random sources per target, "allow_autapses" [True], "allow_multapses" [True])
+    n_source: Size of the source population
+    n_target: Size of the target population
+    target_range: Tuple (start, end) of target indices to create connections for; If None: all targets
+    generator: NumPy generator for the random rules, the positions of random connections are None
+    same_population: Whether source and target are the same population, "allow_autapses" only matters then [False]
+    """
+    if isinstance(rule, str):
+        rule = {"rule": rule}
+    name = rule["rule"]
+    lo, hi = target_range if target_range is not None else (0, n_target)
+    # autapses only exist within one population
+    autapses = rule.get("allow_autapses", True) or not same_population
+    if name == "all_to_all":
+        sources = np.repeat(np.arange(n_source, dtype=np.int64), hi - lo)
+        targets = np.tile(np.arange(lo, hi, dtype=np.int64), n_source)
+        positions = sources * n_target + targets
+        if not autapses:
+            keep = sources != targets
+            sources, targets = sources[keep], targets[keep]
+            positions = sources * (n_target - 1) + targets - (targets > sources)
+    elif name == "one_to_one":
+        if n_source != n_target:
+            raise ValueError("Rule one_to_one requires populations of equal size.")
+        sources = np.arange(lo, hi, dtype=np.int64)
+        targets = np.arange(lo, hi, dtype=np.int64)
+        positions = targets.copy()
+    elif name == "explicit":
+        sources = np.asarray(rule["sources"], dtype=np.int64)
+        targets = np.asarray(rule["targets"], dtype=np.int64)
+        positions = np.flatnonzero((targets >= lo) & (targets < hi))
+        sources, targets = sources[positions], targets[positions]
+    elif name in ("pairwise_bernoulli", "fixed_indegree"):
+        if generator is None:
+            raise ValueError("Rule " + name + " requires a random generator.")
+        # without autapses the source index is drawn from n_source - 1 values and skips the target
+        n_choices = n_source if autapses else n_source - 1
+        if name == "pairwise_bernoulli":
+            counts = generator.binomial(n_choices, rule["p"], hi - lo)
+            replace = False
+        else:
+            counts = np.full(hi - lo, rule["indegree"], dtype=np.int64)
+            replace = rule.get("allow_multapses", True)
+        targets = np.repeat(np.arange(lo, hi, dtype=np.int64), counts)
+        if replace:
+            sources = generator.integers(0, n_choices, len(targets))
+        else:
+            sources = np.concatenate([generator.choice(n_choices, k, replace=False) for k in counts]) \
+                if len(counts) > 0 else np.zeros(0, dtype=np.int64)
+        sources = sources.astype(np.int64)
+        if not autapses:
+            sources += sources >= targets
+        order = np.lexsort((targets, sources))
+        sources, targets = sources[order], targets[order]
+        positions = None
+    else:
+        raise ValueError("Unknown connectivity rule '" + name + "'.")
+    return sources, targets, positions
+
+
+def select(value, positions, n=None, generator=None):
+    """ Return scalar value, the entries of a per connection list at the given positions
+    or n values drawn with the generator from a distribution (see network.rng.draw). """
+    if isinstance(value, dict):
+        return rng.draw(generator, value, n)
+    value = np.asarray(value, dtype=float)
+    if value.ndim == 0:
+        return value
+    if positions is None:
+        raise ValueError("Per connection values cannot be combined with a random connectivity rule.")
+    return value[positions]
+
+
+def resolve_params(network, name, params, size):
+    """ Return copy of population parameters with the distributions replaced by values drawn for every neuron.
+    The values are drawn for the whole population from the stream of the population and parameter,
+    every process keeps its local part. """
+    streams = network.get_random_streams()
+    return {key: rng.draw(streams.population_stream(name, "params", key), value, size) if isinstance(value, dict) else value
+            for key, value in params.items()}
+
+
+def build_population(network, name, pop_spec):
+    """ Create the population described by pop_spec in the network. """
+    check_keys(pop_spec, POPULATION_KEYS, "specification of population '" + name + "'")
+    model = pop_spec["model"]
+    if model not in POPULATION_MODELS:
+        raise ValueError("Unknown neuron model '" + model + "'.")
+    params = pop_spec.get("params")
+    if params is not None:
+        params = resolve_params(network, name, params, pop_spec["size"])
+    return POPULATION_MODELS[model](network, pop_spec["size"], params, name=name, record=pop_spec.get("record"))
+
+
+def build_projection(network, proj_spec, index=0, cache=None):
+    """ Create the synapses described by proj_spec in the network. Returns the projection
+    for array-backed synapse models and the list of synapse objects otherwise.
+    index: Index of the projection in the specification, which selects its random streams
+    cache: BuildCache the projection is loaded from or stored in, memory-mapped projections and synapse objects are not cached [None]
+    """
+    check_keys(proj_spec, PROJECTION_KEYS, "specification of projection " + str(index))
+    source = network.get_population(proj_spec["source"])
+    target = network.get_population(proj_spec["target"])
+    model = proj_spec.get("model", "static_synapse")
+    if proj_spec.get("directory") is not None:
+        if model != "static_synapse":
+            raise ValueError("Only static_synapse projections can be memory-mapped.")
+        if proj_spec.get("params"):
+            raise ValueError("static_synapse has no parameters.")
+        directory = proj_spec["directory"]
+        # every rank stores the synapses onto its part of the target population
+        if not network.is_local_only():
+            directory = os.path.join(directory, "rank_" + str(network.transport.rank))
+        return MappedStaticProjection(network, source, target, directory, iter_connection_blocks(network, proj_spec, index))
+
+    key = None
+    if cache is not None and model in PROJECTION_MODELS:
+        key = cache.get_key(network, proj_spec, index)
+        path = cache.load(key)
+        if path is not None:
+            empty = np.zeros(0)
+            projection = create_synapses(network, source, target, empty.astype(np.int64), empty.astype(np.int64), empty, empty,
+                                         model, proj_spec.get("params"))
+            projection.load(path)
+            return projection
+
+    parts = list(iter_connection_blocks(network, proj_spec, index))
+    sources, targets, weights, delays = (np.concatenate([part[i] for part in parts]) if len(parts) > 0 else np.zeros(0)
+                                         for i in range(4))
+    created = create_synapses(network, source, target, sources.astype(np.int64), targets.astype(np.int64), weights, delays,
+                              model, proj_spec.get("params"))
+    if key is not None and isinstance(created, Projection):
+        cache.store(key, created)
+    return created
+
+
+def iter_connection_blocks(network, proj_spec, index=0):
+    """ Yield the connections described by proj_spec as (sources, targets, weights, delays) for every block of
+    target neurons overlapping the local part of the target population, with targets inside the local part.
+    index: Index of the projection in the specification, which selects its random streams
+    """
+    source = network.get_population(proj_spec["source"])
+    target = network.get_population(proj_spec["target"])
+    rule = proj_spec.get("connectivity", "all_to_all")
+    if isinstance(rule, dict):
+        if rule.get("rule") not in CONNECTIVITY_KEYS:
+            raise ValueError("Unknown connectivity rule '" + str(rule.get("rule")) + "'.")
+        check_keys(rule, ("rule",) + CONNECTIVITY_KEYS[rule["rule"]], "connectivity of projection " + str(index))
+    weight = proj_spec.get("weight", 1.)
+    delay = proj_spec.get("delay", 1.)
+    streams = network.get_random_streams()
+    connect_stream = streams.block_stream("projection", index, "connect")
+    weight_stream = streams.block_stream("projection", index, "weight")
+    delay_stream = streams.block_stream("projection", index, "delay")
+
+    # connections are created for whole blocks of targets with one random stream each, so that random
+    # connections do not depend on the number of processes, then the local part of the targets is kept
+    lo, hi = target.offset, target.offset + target.size
+    for block in range(lo // rng.BLOCK_SIZE, -(-hi // rng.BLOCK_SIZE)):
+        block_range = (block * rng.BLOCK_SIZE, min((block + 1) * rng.BLOCK_SIZE, target.global_size))
+        s, t, positions = connect(rule, source.global_size, target.global_size, block_range,
+                                  connect_stream.get_block_generator(block), source is target)
+        w = np.broadcast_to(select(weight, positions, len(s), weight_stream.get_block_generator(block)), s.shape)
+        d = np.broadcast_to(select(delay, positions, len(s), delay_stream.get_block_generator(block)), s.shape)
+        keep = (t >= lo) & (t < hi)
+        yield s[keep], t[keep] - target.offset, w[keep], d[keep]
+
+
+def get_projection_class(network, model, delays):
+    """ Return the array-backed projection class for synapses of the given model and delays, or None if they are
+    built as synapse objects. Delays shorter than the projection supports (see Projection.min_delay_steps) fall back
+    to synapse objects in single process networks if the model has a single synapse implementation.
+    delays: Scalar or array of delays in ms
+    """
+    projection_class = PROJECTION_MODELS.get(model)
+    if projection_class is not None and model in SYNAPSE_MODELS and network.is_local_only():
+        if np.any(np.round(np.asarray(delays, dtype=float) / network.get_resolution()) < projection_class.min_delay_steps):
+            return None
+    return projection_class
+
+
+def create_synapses(network, source, target, sources, targets, weights, delays, model="static_synapse", params=None):
+    """ Create synapses of one model between two populations in a single call. Returns the projection
+    for array-backed synapse models and the list of synapse objects otherwise (see get_projection_class).
+    sources: Array of source neuron indices inside the whole source population
+    targets: Array of target neuron indices inside the local part of the target population
+    weights, delays: Scalars or arrays matching sources
+    params: Parameters of the synapse model [None]
+    """
+    projection_class = get_projection_class(network, model, delays)
+    if projection_class is not None:
+        return projection_class(network, source, target, sources, targets, weights, delays, params=params)
+    if model not in SYNAPSE_MODELS:
+        raise ValueError("Unknown synapse model '" + model + "'.")
+    if not network.is_local_only():
+        raise ValueError("Synapse model '" + model + "' is not supported in distributed simulations.")
+
+    # synapse models without projection implementation fall back to synapse objects
+    weights = np.broadcast_to(weights, np.shape(sources))
+    delays = np.broadcast_to(delays, np.shape(sources))
+    source_ids = (np.asarray(sources) + source.first_id).tolist()
+    target_ids = (np.asarray(targets) + target.first_id).tolist()
+    syn_class = SYNAPSE_MODELS[model]
+    return [syn_class(network, s, t, init_weight=w, delay=d, params=params)
+            for s, t, w, d in zip(source_ids, target_ids, weights.tolist(), delays.tolist())]
+
+
+def build_network(spec, transport=None, cache=None):
+    """ Build a network from a declarative specification and return it.
+    spec: Dictionary or path of a JSON/YAML file with the following entries:
+        -sim_params (dictionary passed to Network)[None]
+        -populations (dictionary mapping population names to dictionaries with "model", "size",
+         optional "params" with scalar values, per neuron values or distributions and optional "record")
+        -projections (list of dictionaries with "source", "target", "model" [static_synapse],
+         "connectivity" [all_to_all], "weight" [1.0], "delay" [1.0] and optional synapse "params";
+         weight and delay are scalars, per connection values or distributions; static synapses with a
+         "directory" are stored in memory-mapped files in that directory, see MappedStaticProjection)
+        -structural_plasticity (dictionary with the arguments of network.structural_plasticity.StructuralPlasticity
+         and optional "growth", a list of dictionaries with the arguments of its add_growth)[None]
+        Distributions are dictionaries like {"distribution": "uniform", "low": -70., "high": -55.}, see network.rng.draw.
+    transport: Transport of a distributed simulation (see network.distributed); If None: single process network
+    cache: BuildCache or its directory, which keeps the built projections for later builds
+        of the same specification (see network.build_cache); If None: connections are always drawn
+    """
+    spec = load_spec(spec)
+    check_keys(spec, SPEC_KEYS, "network specification")
+    if isinstance(cache, str):
+        cache = BuildCache(cache)
+    if transport is None:
+        network = Network(sim_params=spec.get("sim_params"))
+    else:
+        network = DistributedNetwork(transport, sim_params=spec.get("sim_params"))
+
+    for name, pop_spec in spec.get("populations", {}).items():
+        build_population(network, name, pop_spec)
+    for index, proj_spec in enumerate(spec.get("projections", [])):
+        build_projection(network, proj_spec, index, cache)
+
+    if spec.get("structural_plasticity") is not None:
+        sp_spec = dict(spec["structural_plasticity"])
+        growth = sp_spec.pop("growth", [])
+        structural_plasticity = StructuralPlasticity(**sp_spec)
+        for rule in growth:
+            structural_plasticity.add_growth(**rule)
+        network.set_structural_plasticity(structural_plasticity)
+
+    return network
@@ -0,0 +1,112 @@
+import asyncio
+import numpy as np
+
+
+class ClosedLoop:
+    """ asyncio interface for closed-loop experiments. The network is simulated in chunks of interval
+    timesteps; after every chunk the spikes of the chunk are put into the queues of all subscribers and
+    the coroutine iterating over run yields, so controllers can react and inject spikes or currents
+    for the following chunks. Optionally chunks are simulated in a worker thread, so the event loop
+    stays responsive and I/O overlaps with the simulation.
+
+    Example:
+        closed_loop = ClosedLoop(network, interval=10)
+        async for timestep in closed_loop.run():
+            closed_loop.inject_current("output", current)
+    """
+
+    def __init__(self, network, interval=10, in_thread=False):
+        """ Initialize closed loop.
+        network: Network instance to simulate
+        interval: Number of timesteps of every chunk [10]
+        in_thread: Simulate chunks in the default executor of the event loop instead of the event loop itself [False]
+        """
+        if interval < 1:
+            raise ValueError("Closed loop interval must be at least one timestep.")
+        self.network = network
+        self.interval = interval
+        self.in_thread = in_thread
+        self.subscribers = []
+        # injections requested since the last chunk, applied in order before the next chunk
+        self.pending = []
+
+    def subscribe(self, populations=None):
+        """ Return unbounded asyncio.Queue receiving after every chunk a dictionary mapping population names to the
+        timesteps and local neuron indices of the spikes of the chunk, and None after the last chunk.
+        populations: Names of the populations to stream; If None: all populations
+        """
+        names = [population.name for population in self.network.populations] if populations is None else list(populations)
+        queue = asyncio.Queue()
+        self.subscribers.append((queue, names))
+        return queue
+
+    def inject_spikes(self, name, indices, weights, delay=0.):
+        """ Inject spikes into the neurons of the population with the given name.
+        indices: Local neuron indices
+        weights: Weights of the spikes, either a scalar or an array matching indices;
+            positive weights are excitatory, all others inhibitory like for synapses
+        delay: Time after the start of the next chunk in ms at which the spikes arrive [0.0 ms]
+        """
+        delay_steps = int(round(delay / self.network.get_resolution()))
+        if delay_steps < 0:
+            raise ValueError("Injected spikes cannot arrive in the past.")
+        indices = np.atleast_1d(np.asarray(indices, dtype=np.int64))
+        weights = np.broadcast_to(np.asarray(weights, dtype=float), indices.shape)
+        self.pending.append(("spikes", name, indices, weights, delay_steps))
+
+    def inject_current(self, name, current, indices=None):
+        """ Set the external current I_e of neurons of the population with the given name in pA from the next chunk on.
+        indices: Local neuron indices; If None: all neurons
+        """
+        self.pending.append(("current", name, np.array(current, dtype=float), indices))
+
+    def apply_injections(self):
+        """ Apply all pending injections to the populations. """
+        for injection in self.pending:
+            population = self.network.get_population(injection[1])
+            if injection[0] == "spikes":
+                indices, weights, delay_steps = injection[2:]
+                population.ensure_delay_capacity(delay_steps)
+                # input added with delay d arrives d + 1 steps after the current timestep, which is the next one to simulate
+                population.add_input(indices, np.full(len(indices), delay_steps - 1), weights)
+            else:
+                population.set_external_current(injection[2], injection[3])
+        self.pending = []
+
+    def simulate_chunk(self, i, n, num_time_steps):
+        """ Simulate the steps [i, i + n) of the simulation and return the spikes of the chunk of every population. """
+        populations = self.network.populations
+        first = [len(population.spike_steps) for population in populations]
+        for step in range(i, i + n):
+            self.network.simulate_step(step, num_time_steps)
+        spikes = {}
+        for population, start in zip(populations, first):
+            steps, indices = population.spike_steps[start:], population.spike_indices[start:]
+            spikes[population.name] = ((np.concatenate(steps), np.concatenate(indices)) if len(steps) > 0 else
+                                       (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)))
+        return spikes
+
+    def publish(self, spikes):
+        """ Put the spikes of a chunk (None at the end) into the queues of all subscribers without blocking. """
+        for queue, names in self.subscribers:
+            queue.put_nowait(None if spikes is None else {name: spikes[name] for name in names})
+
+    async def run(self):
+        """ Asynchronous generator simulating the whole simulation duration chunk by chunk
+        and yielding the current timestep after every chunk. """
+        network = self.network
+        loop = asyncio.get_running_loop()
+        num_time_steps = network.begin_simulation()
+        try:
+            for i in range(0, num_time_steps, self.interval):
+                self.apply_injections()
+                n = min(self.interval, num_time_steps - i)
+                if self.in_thread:
+                    spikes = await loop.run_in_executor(None, self.simulate_chunk, i, n, num_time_steps)
+                else:
+                    spikes = self.simulate_chunk(i, n, num_time_steps)
+                self.publish(spikes)
+                yield network.get_timestep()
+        finally:
+            network.end_simulation()
+            self.publish(None)
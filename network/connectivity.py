@@ -0,0 +1,138 @@
+import numpy as np
+
+from network.builder import SYNAPSE_MODELS, create_synapses
+from synapse_models.static_synapse import StaticSynapse
+
+
+# model names of the synapse object classes
+OBJECT_MODEL_NAMES = {cls: name for name, cls in SYNAPSE_MODELS.items()}
+OBJECT_MODEL_NAMES[StaticSynapse] = "static_synapse"
+OBJECT_MODELS = {name: cls for cls, name in OBJECT_MODEL_NAMES.items()}
+
+
+def export_connections(network, timestep=None):
+    """ Return all synapses of the network ordered by synapse index in COO format as a dictionary with the arrays
+    source_ids, target_ids, weights, delays, models (index into model_names) and the list model_names.
+    Synapses removed by structural plasticity up to the timestep are left out.
+    timestep: Weights are taken at the end of this timestep from the weight events; If None: current weights
+    """
+    source_ids, target_ids, initial_weights = network.get_synapse_table()
+    delays = np.zeros(network.num_synapses)
+    models = np.zeros(network.num_synapses, dtype=np.int64)
+    model_names = []
+
+    def model_index(name):
+        if name not in model_names:
+            model_names.append(name)
+        return model_names.index(name)
+
+    synapses = [syn for syns in network.synapse_dict_by_sources.values() for syn in syns]
+    if len(synapses) > 0:
+        indices = np.array([syn.index for syn in synapses])
+        delays[indices] = [syn.delay for syn in synapses]
+        models[indices] = [model_index(OBJECT_MODEL_NAMES[type(syn)]) for syn in synapses]
+    for projections in network.projection_dict_by_sources.values():
+        for proj in projections:
+            delays[proj.synapse_indices] = proj.get_delays()
+            models[proj.synapse_indices] = model_index(proj.model_name)
+
+    timestep = network.get_timestep() if timestep is None else timestep
+    exists = np.ones(network.num_synapses, dtype=bool)
+    for step, indices, _, _, _, removed_delays, model in network.removed_synapses:
+        delays[indices] = removed_delays
+        models[indices] = model_index(model if isinstance(model, str) else OBJECT_MODEL_NAMES[model])
+        exists[indices] = step > timestep
+
+    weights = network.weight_events.weights_at(timestep, initial_weights)
+    return {"source_ids": source_ids[exists], "target_ids": target_ids[exists], "weights": weights[exists],
+            "delays": delays[exists], "models": models[exists], "model_names": model_names}
+
+
+def locate(network, ids):
+    """ Return for every global neuron id the index of its population in network.populations or -1 for single neurons. """
+    if len(network.populations) == 0:
+        return np.full(len(ids), -1, dtype=np.int64)
+    first_ids = np.array([pop.first_id - pop.offset for pop in network.populations])
+    sizes = np.array([pop.global_size for pop in network.populations])
+    pos = np.searchsorted(first_ids, ids, side="right") - 1
+    inside = (pos >= 0) & (ids < first_ids[pos] + sizes[pos])
+    return np.where(inside, pos, -1)
+
+
+def import_connections(network, connections, params=None):
+    """ Create the synapses of an exported connection dictionary (see export_connections) in the network
+    and return the list of created projections and synapse lists. Synapses of one model between two populations
+    are restored with one projection, or one create_synapses call for models without projection; synapses of
+    single neuron objects are created one by one. Exported weights become the initial weights.
+    params: Dictionary of synapse model parameters by model name [None]
+    """
+    params = {} if params is None else params
+    source_ids = np.asarray(connections["source_ids"], dtype=np.int64)
+    target_ids = np.asarray(connections["target_ids"], dtype=np.int64)
+    weights = np.asarray(connections["weights"], dtype=float)
+    delays = np.asarray(connections["delays"], dtype=float)
+    models = np.asarray(connections["models"], dtype=np.int64)
+    model_names = connections["model_names"]
+
+    source_pops = locate(network, source_ids)
+    target_pops = locate(network, target_ids)
+    # group synapses by model, source and target population with one integer key, keeping the synapse order
+    n_keys = len(network.populations) + 1
+    keys = (models * n_keys + source_pops + 1) * n_keys + target_pops + 1
+    order = np.argsort(keys, kind="stable")
+    groups, bounds = np.unique(keys[order], return_index=True)
+    bounds = np.append(bounds, len(keys))
+
+    created = []
+    for g, key in enumerate(groups.tolist()):
+        model, source_pop, target_pop = key // n_keys ** 2, key // n_keys % n_keys - 1, key % n_keys - 1
+        indices = order[bounds[g]:bounds[g + 1]]
+        name = model_names[model]
+        if source_pop >= 0 and target_pop >= 0:
+            source = network.populations[source_pop]
+            target = network.populations[target_pop]
+            sources = source_ids[indices] - (source.first_id - source.offset)
+            targets = target_ids[indices] - target.first_id
+            # only synapses onto the local part of the target population are created
+            local = (targets >= 0) & (targets < target.size)
+            indices = indices[local]
+            created.append(create_synapses(network, source, target, sources[local], targets[local], weights[indices],
+                                           delays[indices], name, params.get(name)))
+        else:
+            if not network.is_local_only():
+                raise ValueError("Single neuron objects are not supported in distributed simulations.")
+            if name not in OBJECT_MODELS:
+                raise ValueError("Synapse model '" + name + "' has no single synapse implementation.")
+            syn_class = OBJECT_MODELS[name]
+            if syn_class is StaticSynapse:
+                created.append([StaticSynapse(network, s, t, w, d) for s, t, w, d in zip(
+                    source_ids[indices].tolist(), target_ids[indices].tolist(), weights[indices].tolist(), delays[indices].tolist())])
+            else:
+                created.append([syn_class(network, s, t, init_weight=w, delay=d, params=params.get(name)) for s, t, w, d in zip(
+                    source_ids[indices].tolist(), target_ids[indices].tolist(), weights[indices].tolist(), delays[indices].tolist())])
+    return created
+
+
+def to_sparse(connections, num_neurons, values="weights"):
+    """ Return scipy.sparse COO matrix M[source id, target id] of the given connection entry ("weights" or "delays").
+    Multiple synapses between the same neurons are kept as duplicate entries, which are summed on conversion. """
+    try:
+        import scipy.sparse
+    except ImportError:
+        raise ImportError("Sparse matrix export requires SciPy.")
+    return scipy.sparse.coo_matrix((connections[values], (connections["source_ids"], connections["target_ids"])),
+                                   shape=(num_neurons, num_neurons))
+
+
+def from_sparse(matrix, delays=1., model="static_synapse"):
+    """ Return connection dictionary (see export_connections) with one synapse per stored entry of a sparse
+    weight matrix M[source id, target id].
+    delays: Scalar delay or sparse matrix with the same sparsity structure [1.0 ms]
+    model: Synapse model name of all synapses [static_synapse]
+    """
+    matrix = matrix.tocoo()
+    if not np.isscalar(delays):
+        delays = np.asarray(delays.tocsr()[matrix.row, matrix.col]).ravel()
+    return {"source_ids": matrix.row.astype(np.int64), "target_ids": matrix.col.astype(np.int64),
+            "weights": matrix.data.astype(float), "delays": np.broadcast_to(np.asarray(delays, dtype=float), matrix.data.shape),
+            "models": np.zeros(matrix.nnz, dtype=np.int64), "model_names": [model]}
@@ -0,0 +1,223 @@
+import multiprocessing
+import queue
+import time
+import traceback
+import numpy as np
+from abc import ABC as AbstractBaseClass, abstractmethod
+
+from network.network import Network
+
+
+class Transport(AbstractBaseClass):
+    """ Abstract base class for the communication between the processes (ranks) of a distributed simulation. """
+
+    def __init__(self, rank, size):
+        """ Initialize transport.
+        rank: Rank of this process
+        size: Number of processes
+        """
+        self.rank = rank
+        self.size = size
+
+    @abstractmethod
+    def allgather(self, data):
+        """ Send data to all ranks and return the list of the data of all ranks ordered by rank.
+        Needs to be implemented by subclasses. """
+        pass
+
+
+class MPITransport(Transport):
+    """ Transport using MPI via mpi4py. """
+
+    def __init__(self, comm=None):
+        """ Initialize MPI transport.
+        comm: MPI communicator; If None: MPI.COMM_WORLD
+        """
+        try:
+            from mpi4py import MPI
+        except ImportError:
+            raise ImportError("MPITransport requires mpi4py.")
+        self.comm = MPI.COMM_WORLD if comm is None else comm
+        super().__init__(self.comm.Get_rank(), self.comm.Get_size())
+
+    def allgather(self, data):
+        """ Gather data of all ranks with MPI_Allgather. """
+        return self.comm.allgather(data)
+
+
+class LocalTransport(Transport):
+    """ Stand-in for MPI with processes on one machine that communicate through multiprocessing queues. """
+
+    def __init__(self, rank, size, queues):
+        """ Initialize local transport.
+        rank: Rank of this process
+        size: Number of processes
+        queues: List with one multiprocessing queue per rank
+        """
+        super().__init__(rank, size)
+        self.queues = queues
+        self.round = 0
+        # messages of later rounds received too early
+        self.pending = {}
+
+    def allgather(self, data):
+        """ Put data into the queues of all other ranks and collect their data of this round. """
+        for rank, rank_queue in enumerate(self.queues):
+            if rank != self.rank:
+                rank_queue.put((self.round, self.rank, data))
+        gathered = [None] * self.size
+        gathered[self.rank] = data
+        received = self.pending.pop(self.round, {})
+        while len(received) < self.size - 1:
+            msg_round, rank, msg = self.queues[self.rank].get()
+            if msg_round == self.round:
+                received[rank] = msg
+            else:
+                self.pending.setdefault(msg_round, {})[rank] = msg
+        for rank, msg in received.items():
+            gathered[rank] = msg
+        self.round += 1
+        return gathered
+
+
+def _run_rank(func, rank, size, queues, results, args):
+    """ Entry point of a process started by run_local. Puts (rank, True, return value) or, if func raises,
+    (rank, False, traceback) on the results queue. """
+    try:
+        value = func(LocalTransport(rank, size, queues), *args)
+    except Exception:
+        results.put((rank, False, traceback.format_exc()))
+    else:
+        results.put((rank, True, value))
+
+
+def run_local(func, size, *args, timeout=None):
+    """ Run func(transport, *args) in size processes connected by LocalTransport
+    and return the list of return values ordered by rank. Return values must be picklable.
+    If a rank raises an exception or dies, the other ranks are terminated and RuntimeError is raised.
+    timeout: Maximal time in seconds to wait for all ranks, TimeoutError is raised after it; If None: no limit
+    """
+    ctx = multiprocessing.get_context()
+    queues = [ctx.Queue() for _ in range(size)]
+    results = ctx.Queue()
+    processes = [ctx.Process(target=_run_rank, args=(func, rank, size, queues, results, args)) for rank in range(size)]
+    for p in processes:
+        p.start()
+    start = time.monotonic()
+    values = {}
+    try:
+        while len(values) < size:
+            try:
+                rank, success, value = results.get(timeout=0.1)
+            except queue.Empty:
+                # ranks that exited without result were killed, e.g. by a signal or running out of memory
+                for rank, p in enumerate(processes):
+                    if p.exitcode is not None and p.exitcode != 0 and rank not in values:
+                        raise RuntimeError("Rank " + str(rank) + " exited with code " + str(p.exitcode) + ".")
+                if timeout is not None and time.monotonic() - start > timeout:
+                    raise TimeoutError("Ranks did not finish within " + str(timeout) + " s.")
+                continue
+            if not success:
+                raise RuntimeError("Rank " + str(rank) + " raised an exception:\n" + value)
+            values[rank] = value
+    finally:
+        # ranks blocked in allgather of a failed simulation never finish by themselves
+        if len(values) < size:
+            for p in processes:
+                p.terminate()
+        for p in processes:
+            p.join()
+    return [values[rank] for rank in range(size)]
+
+
+class DistributedNetwork(Network):
+    """ Network simulated by several processes. Every rank owns a contiguous slice of each
+    population together with all projections onto it. Spikes are collected locally and exchanged
+    with an all-gather after every communication interval of min delay + 1 steps, which is
+    early enough because a spike emitted at step t arrives at step t + 1 + delay steps.
+    Only array-backed populations and projections are supported. """
+
+    def __init__(self, transport, sim_params=None):
+        """ Initialize distributed network.
+        transport: Transport instance connecting the ranks
+        sim_params: Dict with network specific parameters, see Network
+        """
+        super().__init__(sim_params)
+        self.transport = transport
+        # spikes of the current communication interval as (timestep, population index, population indices)
+        self.spike_buffer = []
+
+    def is_local_only(self):
+        """ Return whether all neurons of the network are simulated by this process. """
+        return self.transport.size == 1
+
+    def get_local_range(self, size):
+        """ Return start and end index of the slice of a population owned by this rank. """
+        rank, n_ranks = self.transport.rank, self.transport.size
+        return size * rank // n_ranks, size * (rank + 1) // n_ranks
+
+    def register_neuron(self, neuron):
+        """ Single neuron objects are not supported in distributed simulations. """
+        raise ValueError("Single neuron objects are not supported in distributed simulations, use populations.")
+
+    def handle_population_spikes(self, population, indices):
+        """ Buffer spikes of local neurons until the next exchange and handle the postsynaptic side immediately. """
+        self.spike_buffer.append((self.cur_time_step, self.populations.index(population), indices + population.offset))
+        for proj in self.projection_dict_by_targets.get(population.name, ()):
+            proj.handle_postsynaptic_spikes(indices)
+
+    def exchange_spikes(self):
+        """ All-gather the buffered spikes of all ranks and deliver them to the local projections.
+        Spikes are delivered ordered by timestep, population and neuron index, which gives the same
+        summation order as a single process simulation. """
+        gathered = self.transport.allgather(self.spike_buffer)
+        self.spike_buffer = []
+        events = {}
+        for rank_events in gathered:
+            for step, pop_index, indices in rank_events:
+                events.setdefault((step, pop_index), []).append(indices)
+        cur_time_step = self.cur_time_step
+        for step, pop_index in sorted(events):
+            # deliver as if at the timestep of the spike
+            self.cur_time_step = step
+            indices = np.concatenate(events[(step, pop_index)])
+            for proj in self.projection_dict_by_sources.get(self.populations[pop_index].name, ()):
+                proj.handle_presynaptic_spikes(indices)
+        self.cur_time_step = cur_time_step
+
+    def get_min_delay_steps(self):
+        """ Return minimal delay in steps of all projections of all ranks. """
+        local = [int(proj.delay_steps.min()) for projections in self.projection_dict_by_sources.values()
+                 for proj in projections if len(proj) > 0]
+        delays = [d for rank_delays in self.transport.allgather(local) for d in rank_delays]
+        return min(delays) if len(delays) > 0 else None
+
+    def begin_simulation(self):
+        """ Prepare stepping through the simulation of the local part of the network and return its number of timesteps.
+        Collective operation, all ranks need to call it. """
+        min_delay_steps = self.get_min_delay_steps()
+        num_time_steps = super().begin_simulation()
+        self.exchange_interval = num_time_steps if min_delay_steps is None else min_delay_steps + 1
+        return num_time_steps
+
+    def simulate_step(self, i, num_time_steps):
+        """ Simulate step i of the local part of the network, exchanging spikes with the other ranks at the end of every
+        communication interval and before structural plasticity changes the connectivity.
+        Collective operation, all ranks need to simulate the same steps. """
+        for population in self.populations:
+            population.update_step()
+        structural_plasticity = self.structural_plasticity
+        if ((i + 1) % self.exchange_interval == 0 or i == num_time_steps - 1 or
+                (structural_plasticity is not None and self.cur_time_step + 1 == structural_plasticity.next_step)):
+            self.exchange_spikes()
+        self.advance_timestep(i)
+
+    def gather_spikes(self, name):
+        """ Return timesteps and indices of all spikes of the population with the given name from all ranks. """
+        population = self.get_population(name)
+        steps, indices = population.get_spikes()
+        gathered = self.transport.allgather((steps, indices + population.offset))
+        steps = np.concatenate([g[0] for g in gathered])
+        indices = np.concatenate([g[1] for g in gathered])
+        order = np.lexsort((indices, steps))
+        return steps[order], indices[order]
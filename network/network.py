@@ -1,22 +1,66 @@
+import bisect
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from network.weight_events import WeightEventBuffer
+from network.rng import RandomStreams
+from network.progress import ProgressMonitor
+
+
+# dtypes of state and of recordings/weights for each precision setting
+PRECISIONS = {"float64": (np.float64, np.float64), "float32": (np.float32, np.float32), "mixed": (np.float64, np.float32)}
+
+
 class Network:
     """Network class to manage all neurons and synapses of a spiking neural network."""
 
     def __init__(self, sim_params=None):
         """ Initialize network with specific network parameters
-        sim_params: Dict with network specific parameters t_sim [1000 ms] and dt [0.1 ms].       
+        sim_params: Dict with network specific parameters t_sim [1000 ms], dt [0.1 ms] and
+            threads (number of threads updating the chunks of large populations) [1], seed of all random streams [0]
+            and precision [float64]:
+            -float64 (double precision for state, recordings and weights)
+            -float32 (single precision for state, recordings and weights)
+            -mixed (double precision for the state of populations, single precision for recordings, input buffers and weights)
+            Single neuron objects keep their state and input buffers in the state dtype and only record in the storage dtype,
+            synapse objects keep their weights as Python floats in every mode.
         """
-        params = {"t_sim": 1000., "dt": 0.1}
+        params = {"t_sim": 1000., "dt": 0.1, "threads": 1, "seed": 0, "precision": "float64"}
         if sim_params is not None:
             params.update(sim_params)
         
         self.dt = params["dt"]
         self.t_sim = params["t_sim"]
+        self.num_threads = params["threads"]
+        if params["precision"] not in PRECISIONS:
+            raise ValueError("Unknown precision '" + str(params["precision"]) + "'.")
+        self.state_dtype, self.storage_dtype = PRECISIONS[params["precision"]]
+        self.thread_pool = None
+        self.random_streams = RandomStreams(params["seed"])
 
         self.neuron_dict = {}
         self.synapse_dict_by_sources = {}
         self.synapse_dict_by_targets = {}
 
+        # array-backed populations and projections
+        self.num_neurons = 0
+        self.population_dict = {}
+        self.population_first_ids = []
+        self.populations = []
+        self.projection_dict_by_sources = {}
+        self.projection_dict_by_targets = {}
+
+        # synapse indices, network-wide log of weight changes and synapses removed by structural plasticity
+        self.num_synapses = 0
+        self.weight_events = WeightEventBuffer()
+        self.removed_synapses = []
+
         self.cur_time_step = 1
+        # number of spikes of the local neurons and optional progress reports of simulate
+        self.num_spikes = 0
+        self.progress_monitor = None
+        self.structural_plasticity = None
+        # offset of the spike currently being handled before the end of its timestep in ms, non-zero for precise spike timing models
+        self.spike_offset = 0.
         
     def get_resolution(self):
         """ Returns simulation resolution of this network. """
@@ -26,28 +70,138 @@ class Network:
         """ Returns duration of simulation. """
         return self.t_sim
 
+    def get_state_dtype(self):
+        """ Returns dtype of the neuron state of populations. """
+        return self.state_dtype
+
+    def get_storage_dtype(self):
+        """ Returns dtype of recordings, input buffers and weights. """
+        return self.storage_dtype
+
+    def get_random_streams(self):
+        """ Returns seeded random streams of this network (see network.rng). """
+        return self.random_streams
+
+    def get_num_threads(self):
+        """ Returns number of threads used to update populations. """
+        return self.num_threads
+
+    def get_thread_pool(self):
+        """ Returns thread pool of the running simulation or None if populations are updated in the main thread. """
+        return self.thread_pool
+
+    def start_thread_pool(self):
+        """ Start thread pool for population updates if more than one thread is requested. """
+        if self.num_threads > 1 and self.thread_pool is None:
+            self.thread_pool = ThreadPoolExecutor(self.num_threads)
+
+    def stop_thread_pool(self):
+        """ Shut down the thread pool for population updates. """
+        if self.thread_pool is not None:
+            self.thread_pool.shutdown()
+            self.thread_pool = None
+
+    def set_progress_callback(self, callback, interval=1000):
+        """ Call callback with a progress report (see network.progress) every interval timesteps of simulate and at its end.
+        callback: Function taking the report dictionary, e.g. network.progress.print_progress; If None: Reports are disabled
+        interval: Number of timesteps between reports [1000]
+        """
+        self.progress_monitor = None if callback is None else ProgressMonitor(callback, interval)
+
+    def set_structural_plasticity(self, structural_plasticity):
+        """ Apply structural plasticity (see network.structural_plasticity) during simulate; If None: connectivity is fixed. """
+        self.structural_plasticity = structural_plasticity
+
+    def count_spikes(self, n):
+        """ Add n spikes of local neurons to the spike counter. """
+        self.num_spikes += n
+
+    def get_num_spikes(self):
+        """ Return number of spikes of the local neurons so far. """
+        return self.num_spikes
+
+    def get_num_local_neurons(self):
+        """ Return number of neurons simulated by this process. """
+        return len(self.neuron_dict) + sum(population.size for population in self.populations)
+
     def get_next_neuron_id(self):
         """ Returns next available neuron id. """
-        return len(self.neuron_dict)
+        return self.num_neurons
 
     def register_neuron(self, neuron):
         """ Register a neuron in the network and distribute an ID to it. """
         neuron.id = self.get_next_neuron_id()
         self.neuron_dict[neuron.id] = neuron
+        self.num_neurons += 1
+
+    def register_population(self, population):
+        """ Register a population in the network and distribute a contiguous range of IDs to it. """
+        if population.name is None:
+            population.name = "population_" + str(len(self.populations))
+        if population.name in self.population_dict:
+            raise ValueError("Population name '" + population.name + "' is already in use.")
+        population.first_id = self.get_next_neuron_id() + population.offset
+        self.num_neurons += population.global_size
+        self.population_dict[population.name] = population
+        self.population_first_ids.append(population.first_id)
+        self.populations.append(population)
+
+    def get_local_range(self, size):
+        """ Return start and end index of the part of a population of the given size
+        that is simulated by this process. A single process simulates all neurons. """
+        return 0, size
+
+    def is_local_only(self):
+        """ Return whether all neurons of the network are simulated by this process. """
+        return True
 
     def register_synapse(self, synapse):
-        """ Register a synapse in the network """
+        """ Register a synapse in the network and distribute an index to it. """
+        synapse.index = self.num_synapses
+        self.num_synapses += 1
         if synapse.get_source_id() not in self.synapse_dict_by_sources:
             self.synapse_dict_by_sources[synapse.get_source_id()] = []
         self.synapse_dict_by_sources[synapse.get_source_id()].append(synapse)
         if synapse.get_target_id() not in self.synapse_dict_by_targets:
             self.synapse_dict_by_targets[synapse.get_target_id()] = []
         self.synapse_dict_by_targets[synapse.get_target_id()].append(synapse)
+
+    def allocate_synapse_indices(self, n):
+        """ Return array of n new synapse indices for the synapses of a projection. """
+        indices = np.arange(self.num_synapses, self.num_synapses + n)
+        self.num_synapses += n
+        return indices
+
+    def register_projection(self, projection):
+        """ Register an array-backed projection in the network. """
+        self.projection_dict_by_sources.setdefault(projection.source.name, []).append(projection)
+        self.projection_dict_by_targets.setdefault(projection.target.name, []).append(projection)
     
-    def handle_spike(self, neuron):
-        """ Handles an action potential of the given neuron. The paramter neuron can be either a neuron object or a neuron id."""
+    def remove_synapse(self, synapse):
+        """ Remove a synapse object from the network. """
+        for synapse_dict, key in ((self.synapse_dict_by_sources, synapse.get_source_id()),
+                                  (self.synapse_dict_by_targets, synapse.get_target_id())):
+            synapse_dict[key].remove(synapse)
+            if len(synapse_dict[key]) == 0:
+                del synapse_dict[key]
+        self.record_removed_synapses(np.array([synapse.index]), np.array([synapse.source_id]), np.array([synapse.target_id]),
+                                     np.array([synapse.initial_weight]), np.array([synapse.delay]), type(synapse))
+
+    def record_removed_synapses(self, indices, source_ids, target_ids, initial_weights, delays, model):
+        """ Record synapses removed in the current timestep. From then on their weight is 0 in the log of weight changes.
+        model: Model name of a projection or class of a synapse object
+        """
+        self.removed_synapses.append((self.cur_time_step, indices, source_ids, target_ids, initial_weights, delays, model))
+        self.weight_events.record_batch(self.cur_time_step, indices, np.zeros(len(indices)))
+
+    def handle_spike(self, neuron, offset=0.):
+        """ Handles an action potential of the given neuron. The paramter neuron can be either a neuron object or a neuron id.
+        offset: Time of the spike before the end of the current timestep in ms, available to the synapses
+            and target neurons via get_spike_offset while the spike is handled [0.0 ms]
+        """
         if isinstance(neuron, int):
-            neuron = self.neuron_dict[neuron]
+            neuron = self.get_neuron_by_id(neuron)
+        self.spike_offset = offset
         if neuron.id in self.synapse_dict_by_sources:
             synapses = self.synapse_dict_by_sources[neuron.id]
             for syn in synapses:
@@ -56,20 +210,126 @@ class Network:
             synapses = self.synapse_dict_by_targets[neuron.id]
             for syn in synapses:
                 syn.handle_postsynaptic_spike()
+        self.spike_offset = 0.
+
+    def handle_population_spikes(self, population, indices):
+        """ Handles the action potentials of the neurons with the given indices of a population. """
+        for proj in self.projection_dict_by_sources.get(population.name, ()):
+            proj.handle_presynaptic_spikes(indices)
+        for proj in self.projection_dict_by_targets.get(population.name, ()):
+            proj.handle_postsynaptic_spikes(indices)
+        # object synapses connected to single neurons of the population
+        if self.synapse_dict_by_sources or self.synapse_dict_by_targets:
+            for index in indices:
+                neuron_id = population.first_id + int(index)
+                if neuron_id in self.synapse_dict_by_sources or neuron_id in self.synapse_dict_by_targets:
+                    self.handle_spike(population.get_neuron(int(index)))
 
     def get_timestep(self):
         """ Return current timestep of the simulation. """
         return self.cur_time_step
 
+    def get_spike_offset(self):
+        """ Return offset before the end of the current timestep in ms of the spike currently being handled. """
+        return self.spike_offset
+
+    def get_precise_timestep(self):
+        """ Return time of the spike currently being handled in timesteps, the current timestep minus the offset of the spike. """
+        return self.cur_time_step - self.spike_offset / self.dt
+
     def simulate(self):
         """ Start simulation of the network with all its neurons and synapses. """
+        num_time_steps = self.begin_simulation()
+        try:
+            for i in range(num_time_steps):
+                self.simulate_step(i, num_time_steps)
+        finally:
+            self.end_simulation()
+
+    def begin_simulation(self):
+        """ Prepare stepping through the simulation (see simulate_step) and return its number of timesteps. """
         num_time_steps = int(round(self.t_sim/self.dt,0))
-        
-        for i in range(num_time_steps):
-            for neuron in self.neuron_dict.values():
-                neuron.update_step()
-            self.cur_time_step += 1
+        if self.progress_monitor is not None:
+            self.progress_monitor.start(self, num_time_steps)
+        if self.structural_plasticity is not None:
+            self.structural_plasticity.start(self)
+        self.start_thread_pool()
+        return num_time_steps
+
+    def simulate_step(self, i, num_time_steps):
+        """ Simulate step i of the num_time_steps timesteps of the simulation. """
+        for neuron in self.neuron_dict.values():
+            neuron.update_step()
+        for population in self.populations:
+            population.update_step()
+        self.advance_timestep(i)
+
+    def advance_timestep(self, i):
+        """ Finish step i of the simulation: advance the current timestep, then apply structural plasticity and report progress if due. """
+        self.cur_time_step += 1
+        structural_plasticity = self.structural_plasticity
+        if structural_plasticity is not None and self.cur_time_step == structural_plasticity.next_step:
+            structural_plasticity.update()
+        progress = self.progress_monitor
+        if progress is not None and i + 1 == progress.next_step:
+            progress.report(i + 1)
+
+    def end_simulation(self):
+        """ Release the resources of the simulation after the last step. """
+        self.stop_thread_pool()
 
     def get_neuron_by_id(self, id):
-        """ Return neuron object corresponding to given neuron id. """
-        return self.neuron_dict[id]
+        """ Return neuron object corresponding to given neuron id. 
+        For neurons of a population a view on the neuron is returned. """
+        if id in self.neuron_dict:
+            return self.neuron_dict[id]
+        pos = bisect.bisect_right(self.population_first_ids, id) - 1
+        if pos >= 0 and id < self.populations[pos].first_id + self.populations[pos].size:
+            return self.populations[pos].get_neuron(id - self.populations[pos].first_id)
+        raise KeyError(id)
+
+    def get_population(self, name):
+        """ Return population with the given name. """
+        return self.population_dict[name]
+
+    def add_reducer(self, name, reducer):
+        """ Attach an online reducer (see network.reducers) to the population with the given name and return it. """
+        return self.get_population(name).add_reducer(reducer)
+
+    def get_synapse_table(self):
+        """ Return source ids, target ids and initial weights of all synapses ordered by synapse index. """
+        source_ids = np.zeros(self.num_synapses, dtype=np.int64)
+        target_ids = np.zeros(self.num_synapses, dtype=np.int64)
+        initial_weights = np.zeros(self.num_synapses)
+        synapses = [syn for syns in self.synapse_dict_by_sources.values() for syn in syns]
+        if len(synapses) > 0:
+            indices = np.array([syn.index for syn in synapses])
+            source_ids[indices] = [syn.source_id for syn in synapses]
+            target_ids[indices] = [syn.target_id for syn in synapses]
+            initial_weights[indices] = [syn.initial_weight for syn in synapses]
+        for projections in self.projection_dict_by_sources.values():
+            for proj in projections:
+                alive = proj.alive
+                indices = proj.synapse_indices[alive]
+                source_ids[indices] = proj.get_source_ids()[alive]
+                target_ids[indices] = proj.get_target_ids()[alive]
+                initial_weights[indices] = proj.get_initial_weights()[alive]
+        # removed synapses keep their entries, their weights are 0 from the removal on
+        for step, indices, removed_sources, removed_targets, removed_weights, delays, model in self.removed_synapses:
+            source_ids[indices] = removed_sources
+            target_ids[indices] = removed_targets
+            initial_weights[indices] = removed_weights
+        return source_ids, target_ids, initial_weights
+
+    def get_weights_at(self, timestep):
+        """ Return weights of all synapses ordered by synapse index at the end of the given timestep. """
+        return self.weight_events.weights_at(timestep, self.get_synapse_table()[2])
+
+    def get_weight_matrix(self, timestep):
+        """ Return dense weight matrix W[source id, target id] at the end of the given timestep.
+        Weights of multiple synapses between the same neurons are summed up. """
+        source_ids, target_ids, initial_weights = self.get_synapse_table()
+        weights = self.weight_events.weights_at(timestep, initial_weights)
+        matrix = np.zeros((self.num_neurons, self.num_neurons))
+        np.add.at(matrix, (source_ids, target_ids), weights)
+        return matrix
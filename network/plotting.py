@@ -0,0 +1,57 @@
+import numpy as np
+import matplotlib.pyplot as plt
+
+# This module is only imported when a plot is requested, so that importing
+# the simulation core does not load matplotlib.
+
+
+def plot_results(neuron, plot_input=True, title=None):
+    """ Plot membrane voltage of a neuron. Neuron must have been simulated already!
+    neuron: Neuron to plot
+    plot_input: Boolean to specify whether the input current should be plotted in the same plot
+    title: Title of the plot; If None: Title will be Simulation of <model_name> 
+    """
+    fig, ax = plt.subplots()
+    if title is None:
+        fig.suptitle("Simulation of "+neuron.model_name)
+    else:
+        fig.suptitle(title)
+
+    ax.set_xlabel("t [ms]", fontsize=14)
+    if plot_input:
+        ax2 = ax.twinx()
+        ax2.plot(np.arange(neuron.dt, neuron.t_sim + (neuron.dt/2.), neuron.dt),
+                 neuron.input_current[1:], color="blue", linewidth=0.6, linestyle=":")
+        ax2.set_ylabel("I [pA]", color="blue", fontsize=14)
+
+    ax.plot(np.arange(0, neuron.t_sim+(neuron.dt/2.), neuron.dt),
+            neuron.V_m, color="red", linewidth=1)
+    ax.set_ylabel("V_m [mV]", color="red", fontsize=14)
+    V_th = neuron.get_param("V_th")
+    V_reset = neuron.get_param("V_reset")
+    if V_th is not None and V_reset is not None:
+        ax.set_ylim((V_reset-1, V_th+1))
+
+    plt.show()
+
+
+def plot_weight_history(synapse, title=None):
+    """ Plot weight history of a synapse.
+    synapse: Synapse to plot
+    title: Title of the plot; If None: Title will be Synaptic weight history
+    """
+    if title is None:
+        title = "Synaptic weight history"
+
+    network = synapse.network
+    steps, weight_changes = synapse.get_weight_history()
+    end = int(round(network.get_simulation_duration() / network.get_resolution(), 0))
+    weights = np.repeat(weight_changes, np.diff(np.append(steps, end)))
+
+    fig, ax = plt.subplots()
+    fig.suptitle(title)
+    ax.set_xlabel("t [ms]", fontsize=14)
+    ax.plot(np.arange(0, network.get_simulation_duration(), network.get_resolution()), weights, linewidth=1)
+    ax.set_ylabel("w", fontsize=14)
+
+    plt.show()
@@ -0,0 +1,81 @@
+import os
+import sys
+import time
+
+
+def get_memory_usage():
+    """ Return resident memory of this process in bytes or None if it cannot be determined.
+    The current value is read from /proc on Linux, elsewhere the peak value of getrusage is used. """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def print_progress(report):
+    """ Print a progress report in one line. """
+    memory = report["memory"]
+    print("{:5.1f}% t = {:.1f} ms, real-time factor {:.3g}, {:.3g} spikes/s, {} MB, ETA {:.0f} s".format(
+        100. * report["fraction"], report["t"], report["real_time_factor"], report["spikes_per_second"],
+        "?" if memory is None else int(memory / 2 ** 20), report["eta"]))
+
+
+class ProgressMonitor:
+    """ Calls a callback with a progress report every interval timesteps of a simulation and at its end.
+    Between reports the simulation loop only compares the step counter, so the cost is amortized
+    over the interval. Reports are dictionaries with the entries
+        -step (timesteps simulated in this call of simulate), num_steps (timesteps of the call)
+        -t (simulated time in ms), fraction (simulated fraction of the call)
+        -wall_time (wall clock time since the start of the simulation in s), eta (estimated remaining wall clock time in s)
+        -real_time_factor (simulated time / wall clock time since the last report)
+        -spikes (spikes of the local neurons since the start), spikes_per_second (spikes per wall clock second
+         since the last report), rate (mean firing rate of the local neurons since the last report in Hz)
+        -memory (resident memory of the process in bytes or None)
+    """
+
+    def __init__(self, callback=print_progress, interval=1000):
+        """ Initialize progress monitor.
+        callback: Function called with every report [print_progress]
+        interval: Number of timesteps between reports [1000]
+        """
+        if interval < 1:
+            raise ValueError("Progress interval must be at least one timestep.")
+        self.callback = callback
+        self.interval = interval
+
+    def start(self, network, num_steps):
+        """ Start timing a simulation of num_steps timesteps. """
+        self.network = network
+        self.num_steps = num_steps
+        self.start_time = self.last_time = time.perf_counter()
+        self.start_spikes = self.last_spikes = network.get_num_spikes()
+        self.last_step = 0
+        self.next_step = min(self.interval, num_steps)
+
+    def report(self, step):
+        """ Call the callback with the report after the given number of timesteps of the simulation. """
+        now = time.perf_counter()
+        spikes = self.network.get_num_spikes()
+        dt = self.network.get_resolution()
+        wall_time, interval_time = now - self.start_time, max(now - self.last_time, 1e-12)
+        interval_sim_time = (step - self.last_step) * dt / 1000.
+        num_neurons = max(1, self.network.get_num_local_neurons())
+        self.callback({
+            "step": step, "num_steps": self.num_steps,
+            "t": (self.network.get_timestep() - 1) * dt, "fraction": step / max(1, self.num_steps),
+            "wall_time": wall_time, "eta": wall_time / step * (self.num_steps - step),
+            "real_time_factor": interval_sim_time / interval_time,
+            "spikes": spikes - self.start_spikes, "spikes_per_second": (spikes - self.last_spikes) / interval_time,
+            "rate": (spikes - self.last_spikes) / (num_neurons * interval_sim_time) if interval_sim_time > 0 else 0.,
+            "memory": get_memory_usage(),
+        })
+        self.last_time, self.last_spikes, self.last_step = now, spikes, step
+        self.next_step = min(step + self.interval, self.num_steps)
@@ -0,0 +1,98 @@
+import numpy as np
+from abc import ABC as AbstractBaseClass, abstractmethod
+
+
+class Reducer(AbstractBaseClass):
+    """ Abstract base class for online reducers. A reducer is attached to a population and
+    accumulates statistics during the simulation with memory independent of the simulation duration. """
+
+    def attach(self, population):
+        """ Attach reducer to a population and allocate its accumulators. """
+        self.population = population
+        self.network = population.network
+        self.first_step = self.network.get_timestep()
+        self.allocate()
+
+    def get_num_steps(self):
+        """ Return number of timesteps accumulated so far. """
+        return self.network.get_timestep() - self.first_step
+
+    @abstractmethod
+    def allocate(self):
+        """ Abstract method to allocate the accumulators.
+        Needs to be implemented by subclasses. """
+        pass
+
+    def record_state(self, sl, V_m, input_current):
+        """ Accumulate state of the neurons in slice sl of the current timestep.
+        Called from the update kernels, possibly in parallel for disjoint slices. Ignored by default. """
+        pass
+
+    def record_spikes(self, step, indices):
+        """ Accumulate spikes of the neurons with the given indices in the given timestep. Ignored by default. """
+        pass
+
+    @abstractmethod
+    def get_result(self):
+        """ Abstract method to return the accumulated statistic.
+        Needs to be implemented by subclasses. """
+        pass
+
+
+class SpikeCountReducer(Reducer):
+    """ Counts the spikes of every neuron. """
+
+    def allocate(self):
+        """ Allocate one counter per neuron. """
+        self.counts = np.zeros(self.population.size, dtype=np.int64)
+
+    def record_spikes(self, step, indices):
+        """ Increase counters of the spiking neurons. """
+        self.counts[indices] += 1
+
+    def get_result(self):
+        """ Return number of spikes of every neuron. """
+        return self.counts
+
+
+class PopulationRateReducer(Reducer):
+    """ Counts the spikes of the whole population in time bins. """
+
+    def __init__(self, bin_size=10.):
+        """ Initialize reducer.
+        bin_size: Width of the time bins in ms [10.0 ms]
+        """
+        self.bin_size = bin_size
+
+    def allocate(self):
+        """ Allocate one counter per time bin of the simulation. """
+        self.bin_steps = max(1, int(round(self.bin_size / self.network.get_resolution(), 0)))
+        num_steps = int(round(self.network.get_simulation_duration() / self.network.get_resolution(), 0))
+        self.counts = np.zeros(num_steps // self.bin_steps + 1, dtype=np.int64)
+
+    def record_spikes(self, step, indices):
+        """ Add spikes to the counter of the bin containing the timestep. """
+        self.counts[(step - self.first_step) // self.bin_steps] += len(indices)
+
+    def get_result(self):
+        """ Return start times of the bins in ms and mean firing rate of the population in Hz of every completed bin. """
+        n_bins = self.get_num_steps() // self.bin_steps
+        bin_duration = self.bin_steps * self.network.get_resolution() / 1000.
+        times = (self.first_step - 1 + np.arange(n_bins) * self.bin_steps) * self.network.get_resolution()
+        return times, self.counts[:n_bins] / (self.population.size * bin_duration)
+
+
+class MeanVmReducer(Reducer):
+    """ Averages the membrane voltage of every neuron over time. """
+
+    def allocate(self):
+        """ Allocate one sum of the membrane voltage per neuron, always in double precision. """
+        self.V_m_sum = np.zeros(self.population.size)
+
+    def record_state(self, sl, V_m, input_current):
+        """ Add membrane voltages of the current timestep. """
+        self.V_m_sum[sl] += V_m
+
+    def get_result(self):
+        """ Return mean membrane voltage of every neuron. """
+        return self.V_m_sum / max(1, self.get_num_steps())
@@ -0,0 +1,89 @@
+import zlib
+import numpy as np
+
+# number of neurons sharing one random stream in block-wise draws
+BLOCK_SIZE = 4096
+
+
+def key_to_ints(key):
+    """ Return tuple of non-negative integers for a key of strings and integers.
+    Strings are hashed with CRC32, which unlike hash() is stable across processes. """
+    return tuple(k if isinstance(k, (int, np.integer)) else zlib.crc32(str(k).encode()) for k in key)
+
+
+def draw(generator, spec, size):
+    """ Draw size values from the distribution described by spec.
+    spec: Dictionary with key "distribution" and the parameters of the distribution:
+        -uniform ("low", "high")
+        -normal ("mean", "std")
+        -lognormal ("mean", "std" of the underlying normal distribution)
+    """
+    name = spec["distribution"]
+    if name == "uniform":
+        return generator.uniform(spec["low"], spec["high"], size)
+    if name == "normal":
+        return generator.normal(spec["mean"], spec["std"], size)
+    if name == "lognormal":
+        return generator.lognormal(spec["mean"], spec["std"], size)
+    raise ValueError("Unknown distribution '" + name + "'.")
+
+
+class RandomStreams:
+    """ Seeded random number streams of a network. Every stream is derived from the seed of the
+    network and a key naming its purpose (NumPy SeedSequence spawn keys), so streams are independent
+    of each other and do not depend on creation order, number of threads or number of processes. """
+
+    def __init__(self, seed):
+        """ Initialize streams.
+        seed: Seed of the network
+        """
+        self.seed = seed
+
+    def get_seed_sequence(self, *key):
+        """ Return the SeedSequence of the stream with the given key. """
+        return np.random.SeedSequence(self.seed, spawn_key=key_to_ints(key))
+
+    def get_generator(self, *key):
+        """ Return a new generator of the stream with the given key. """
+        return np.random.Generator(np.random.PCG64(self.get_seed_sequence(*key)))
+
+    def population_stream(self, name, *key):
+        """ Return generator of the stream of the population with the given name. """
+        return self.get_generator("population", name, *key)
+
+    def block_stream(self, *key):
+        """ Return BlockStream with the given key. """
+        return BlockStream(self, key)
+
+
+class BlockStream:
+    """ Random stream for repeated vectorized draws over the neurons of a population. Neurons are grouped
+    into blocks of BLOCK_SIZE with one generator each, and every draw advances the generators of
+    whole blocks. Therefore the values of a neuron do not depend on how the population is split
+    between threads or processes. """
+
+    def __init__(self, streams, key):
+        """ Initialize block stream.
+        streams: RandomStreams instance
+        key: Key of the stream
+        """
+        self.streams = streams
+        self.key = key
+        self.generators = {}
+
+    def get_block_generator(self, block):
+        """ Return generator of the block with the given index, creating it on first use. """
+        if block not in self.generators:
+            self.generators[block] = self.streams.get_generator(*self.key, block)
+        return self.generators[block]
+
+    def draw(self, lo, hi, n, func):
+        """ Return values for the neurons [lo, hi) of a population of n neurons.
+        func: Function (generator, size) returning size values
+        """
+        values = []
+        for block in range(lo // BLOCK_SIZE, (hi - 1) // BLOCK_SIZE + 1):
+            start = block * BLOCK_SIZE
+            block_values = func(self.get_block_generator(block), min(BLOCK_SIZE, n - start))
+            values.append(block_values[max(lo - start, 0):hi - start])
+        return np.concatenate(values) if len(values) > 0 else np.zeros(0)
@@ -0,0 +1,114 @@
+import numpy as np
+
+
+class StructuralPlasticity:
+    """ Changes the connectivity of a network during the simulation. At every check, synapses whose absolute
+    weight has stayed below a threshold for at least the given duration are removed, and new synapses with
+    random source and target neurons are grown between populations. Projections drop the entries of removed
+    synapses in amortized compactions (see synapse_models.projection), synapse objects are removed at once,
+    so synapses driven to 0 by plasticity stop costing time on every presynaptic spike.
+    New synapses are drawn from streams of the network seed and only kept on the rank owning the target,
+    so the connectivity does not depend on the number of processes. """
+
+    def __init__(self, interval=100., threshold=1., duration=None):
+        """ Initialize structural plasticity.
+        interval: Time between two checks in ms [100.0 ms]
+        threshold: Synapses with an absolute weight below threshold are candidates for removal [1.0]
+        duration: Time the weight has to stay below the threshold at all checks before the synapse is removed
+            in ms; If None: interval, i.e. two consecutive checks
+        """
+        self.interval = interval
+        self.threshold = threshold
+        self.duration = interval if duration is None else duration
+        self.growth = []
+        self.num_removed = 0
+        self.num_created = 0
+
+    def add_growth(self, source, target, n, weight, delay, model="static_synapse", params=None):
+        """ Grow n synapses with random source and target neurons between two populations at every check.
+        source, target: Names of the source and target populations
+        weight, delay: Weight and delay in ms of the new synapses
+        model: Synapse model [static_synapse]
+        params: Parameters of the synapse model [None]
+        """
+        self.growth.append({"source": source, "target": target, "n": n, "weight": weight, "delay": delay,
+                            "model": model, "params": params})
+
+    def start(self, network):
+        """ Schedule the first check after one interval of the simulation of the network. """
+        self.network = network
+        self.interval_steps = max(1, int(round(self.interval / network.get_resolution())))
+        self.duration_steps = int(round(self.duration / network.get_resolution()))
+        # sorted indices of the synapses whose weight is below the threshold and the timesteps at which it fell below,
+        # kept only for these synapses, so memory does not grow with the number of synapses
+        self.below_indices = np.zeros(0, dtype=np.int64)
+        self.below_steps = np.zeros(0, dtype=np.int64)
+        self.next_step = network.get_timestep() + self.interval_steps
+
+    def get_prune_mask(self, indices, weights):
+        """ Update the timesteps below threshold of the synapses with the given indices and weights
+        and return boolean array of the synapses to remove. """
+        step = self.network.get_timestep()
+        below = np.abs(weights) < self.threshold
+        since = np.full(len(indices), step, dtype=np.int64)
+        if len(self.below_indices) > 0:
+            pos = np.minimum(np.searchsorted(self.below_indices, indices), len(self.below_indices) - 1)
+            known = self.below_indices[pos] == indices
+            since[known] = self.below_steps[pos[known]]
+        prune = below & (step - since >= self.duration_steps)
+        # replace the entries of the given synapses by the ones still below the threshold and not removed
+        keep = below & ~prune
+        other = ~np.isin(self.below_indices, indices)
+        below_indices = np.concatenate((self.below_indices[other], indices[keep]))
+        order = np.argsort(below_indices, kind="stable")
+        self.below_indices = below_indices[order]
+        self.below_steps = np.concatenate((self.below_steps[other], since[keep]))[order]
+        return prune
+
+    def prune(self):
+        """ Remove all synapses whose weight stayed below the threshold long enough. """
+        network = self.network
+        for projections in network.projection_dict_by_sources.values():
+            for proj in projections:
+                # the synapse arrays of projections without structural plasticity are not even read
+                if not proj.supports_structural_plasticity:
+                    continue
+                alive = proj.alive
+                self.num_removed += proj.remove_synapses(alive & self.get_prune_mask(proj.synapse_indices, np.where(alive, proj.get_weights(), np.inf)))
+        synapses = [syn for syns in network.synapse_dict_by_sources.values() for syn in syns]
+        if len(synapses) > 0:
+            prune = self.get_prune_mask(np.array([syn.index for syn in synapses]), np.array([syn.weight for syn in synapses]))
+            for index in np.flatnonzero(prune):
+                network.remove_synapse(synapses[index])
+            self.num_removed += int(np.count_nonzero(prune))
+
+    def grow(self):
+        """ Create the new synapses of all growth rules. """
+        # imported here, the builder depends on the network module
+        from network.builder import get_projection_class, create_synapses
+        network = self.network
+        for g, rule in enumerate(self.growth):
+            source = network.get_population(rule["source"])
+            target = network.get_population(rule["target"])
+            generator = network.get_random_streams().get_generator("structural", g, network.get_timestep())
+            sources = generator.integers(0, source.global_size, rule["n"])
+            targets = generator.integers(0, target.global_size, rule["n"])
+            local = (targets >= target.offset) & (targets < target.offset + target.size)
+            sources, targets = sources[local], targets[local] - target.offset
+            # synapses of projection models are added to an existing projection between the populations with the same parameters
+            projection = None
+            if get_projection_class(network, rule["model"], rule["delay"]) is not None:
+                projection = next((proj for proj in network.projection_dict_by_sources.get(source.name, ())
+                                   if proj.target is target and proj.model_name == rule["model"] and
+                                   proj.supports_structural_plasticity and proj.has_params(rule["params"])), None)
+            if projection is not None:
+                projection.add_synapses(sources, targets, rule["weight"], rule["delay"])
+            else:
+                create_synapses(network, source, target, sources, targets, rule["weight"], rule["delay"], rule["model"], rule["params"])
+            self.num_created += len(sources)
+
+    def update(self):
+        """ Prune and grow synapses and schedule the next check. """
+        self.prune()
+        self.grow()
+        self.next_step += self.interval_steps
@@ -0,0 +1,91 @@
+import numpy as np
+
+
+class WeightEventBuffer:
+    """ Network-wide log of weight changes. Every change is stored as a record
+    (timestep, synapse index, new weight) in preallocated blocks; a full block is
+    flushed to the list of completed blocks and a new one is allocated. """
+
+    def __init__(self, block_size=65536):
+        """ Initialize empty buffer.
+        block_size: Number of records per preallocated block
+        """
+        self.block_size = block_size
+        self.blocks = []
+        self.new_block()
+
+    def new_block(self):
+        """ Allocate a new block for upcoming records. """
+        self.steps = np.empty(self.block_size, dtype=np.int64)
+        self.indices = np.empty(self.block_size, dtype=np.int64)
+        self.weights = np.empty(self.block_size)
+        self.pos = 0
+
+    def flush(self):
+        """ Move the filled part of the current block to the completed blocks. """
+        if self.pos > 0:
+            self.blocks.append((self.steps[:self.pos], self.indices[:self.pos], self.weights[:self.pos]))
+            self.new_block()
+
+    def record(self, step, index, weight):
+        """ Store a single weight change.
+        step: Timestep of the change
+        index: Index of the synapse
+        weight: New weight of the synapse
+        """
+        pos = self.pos
+        self.steps[pos] = step
+        self.indices[pos] = index
+        self.weights[pos] = weight
+        self.pos = pos + 1
+        if self.pos == self.block_size:
+            self.flush()
+
+    def record_batch(self, step, indices, weights):
+        """ Store the weight changes of several synapses in the same timestep.
+        step: Timestep of the changes
+        indices: Array of synapse indices
+        weights: Array of new weights
+        """
+        start = 0
+        while start < len(indices):
+            n = min(len(indices) - start, self.block_size - self.pos)
+            self.steps[self.pos:self.pos + n] = step
+            self.indices[self.pos:self.pos + n] = indices[start:start + n]
+            self.weights[self.pos:self.pos + n] = weights[start:start + n]
+            self.pos += n
+            start += n
+            if self.pos == self.block_size:
+                self.flush()
+
+    def __len__(self):
+        """ Return number of stored records. """
+        return sum(len(block[0]) for block in self.blocks) + self.pos
+
+    def get_events(self):
+        """ Return timesteps, synapse indices and weights of all records in chronological order. """
+        blocks = self.blocks + [(self.steps[:self.pos], self.indices[:self.pos], self.weights[:self.pos])]
+        return tuple(np.concatenate([block[i] for block in blocks]) for i in range(3))
+
+    def weights_at(self, step, initial_weights):
+        """ Return weights of all synapses at the end of the given timestep.
+        step: Timestep
+        initial_weights: Array with the initial weight of every synapse index
+        """
+        steps, indices, weights = self.get_events()
+        n = np.searchsorted(steps, step, side="right")
+        # last record of every synapse up to the timestep
+        reversed_indices = indices[:n][::-1]
+        changed, last = np.unique(reversed_indices, return_index=True)
+        result = np.array(initial_weights, dtype=float)
+        result[changed] = weights[:n][::-1][last]
+        return result
+
+    def history(self, index, initial_weight):
+        """ Return timesteps and weights of all changes of one synapse, starting with the initial weight at timestep 0.
+        index: Index of the synapse
+        initial_weight: Initial weight of the synapse
+        """
+        steps, indices, weights = self.get_events()
+        mask = indices == index
+        return np.concatenate(([0], steps[mask])), np.concatenate(([initial_weight], weights[mask]))
@@ -1,4 +1,5 @@
 from neuron_models.neuron import Neuron
+from neuron_models.population import Population
 import numpy as np
 
 
@@ -6,6 +7,8 @@ class lif_neuron_euler(Neuron):
     """ Implementation of approximation of an integrate and fire neuron 
     with exponentially shaped postsynaptic current with euler method """
 
+    __slots__ = ("V_th", "V_reset", "tau_m", "C_m", "V_init", "E_L", "I_E", "tau_in", "tau_ex", "spike_current_in", "spike_current_ex", "I_syn_in", "I_syn_ex", "V", "I_prev")
+
     def __init__(self, network, params=None):
         """ Initialize lif_psc_exp_euler neuron. 
         network: Network instance the neuron belongs to
@@ -37,12 +40,14 @@ class lif_neuron_euler(Neuron):
         self.tau_in = self.get_param("tau_in")
         self.tau_ex = self.get_param("tau_ex")
 
-        # add initial voltage to voltage trace
+        # membrane voltage and input current of the previous timestep, V_m and input_current only record them
+        self.V = self.V_init
+        self.I_prev = 0.
         self.V_m[0] = self.V_init
 
         # initialize synaptic current and spike buffer
-        self.spike_current_in = np.zeros(len(self.V_m))
-        self.spike_current_ex = np.zeros(len(self.V_m))
+        self.spike_current_in = np.zeros(len(self.V_m), dtype=self.network.get_state_dtype())
+        self.spike_current_ex = np.zeros(len(self.V_m), dtype=self.network.get_state_dtype())
         self.I_syn_in = 0.
         self.I_syn_ex = 0.
 
@@ -79,29 +84,138 @@ class lif_neuron_euler(Neuron):
         if self.refractory_steps > 0:
             # refractory ==> save reset voltage to V_m in order to
             # plot it later and decrease number of refractory timesteps
-            self.V_m[self.network.get_timestep()] = self.V_reset
+            self.V = self.V_reset
             self.refractory_steps -= 1
         else:
             # not refractory ==> evolve membrane voltage
-            dv = self.dt * (self.input_current[self.network.get_timestep() - 1] /
-                            self.C_m - (self.V_m[self.network.get_timestep() - 1] - self.E_L)/self.tau_m)
+            dv = self.dt * (self.I_prev / self.C_m - (self.V - self.E_L)/self.tau_m)
             # lot more exact: something between explicit and implicit euler method
-            # dv = self.dt * (cur_current /
-            #                self.C_m - (self.V_m[self.network.get_timestep() - 1] - self.E_L)/self.tau_m)
-            self.V_m[self.network.get_timestep(
-            )] = self.V_m[self.network.get_timestep()-1] + dv
+            # dv = self.dt * (cur_current / self.C_m - (self.V - self.E_L)/self.tau_m)
+            self.V = self.V + dv
+        self.I_prev = cur_current
 
         # check if membrane voltage has reached threshold
-        if self.V_m[self.network.get_timestep()] > self.V_th:
+        if self.V > self.V_th:
             self.refractory_steps = int(round(self.t_ref / self.dt, 0))
-            self.V_m[self.network.get_timestep()] = self.V_reset
+            self.V = self.V_reset
             self.spike()
 
+        # add membrane voltage to voltage trace
+        self.V_m[self.network.get_timestep()] = self.V
+
+
+def derivatives(V, I_ex, I_in, I_e, C_m, tau_m, E_L, tau_ex, tau_in):
+    """ Return time derivatives of membrane voltage and synaptic currents. """
+    return (I_e + I_ex + I_in) / C_m - (V - E_L) / tau_m, - I_ex / tau_ex, - I_in / tau_in
+
+
+def adaptive_euler_step(V, I_ex, I_in, h, dt, I_e, C_m, tau_m, E_L, tau_ex, tau_in, V_th, tolerance, max_substeps):
+    """ Integrate membrane voltage and synaptic currents of several neurons over one timestep dt with
+    adaptive Euler substeps. The error of every substep is estimated by step doubling (one Euler step of length h
+    against two of length h/2); substeps are accepted if the voltage error is below tolerance and both
+    solutions agree about the threshold. The accepted state is the extrapolation 2 * fine - coarse,
+    which is the explicit midpoint rule. The substep length of every neuron is adapted on its own, so it
+    only shrinks near threshold crossings or during bursts of input and grows back to dt otherwise.
+    V, I_ex, I_in, h: Arrays with state and current substep length of the neurons, updated in place
+    Parameters: Scalars or arrays matching V
+    Returns array with the number of accepted substeps of every neuron.
+    """
+    h_min = dt / max_substeps
+    t = np.zeros(len(V))
+    num_substeps = np.zeros(len(V), dtype=np.int64)
+    # all neurons take part in the first substep, afterwards only those that have not reached the end of the timestep
+    active = slice(None)
+    while True:
+        params = [p[active] if np.ndim(p) > 0 else p for p in (I_e, C_m, tau_m, E_L, tau_ex, tau_in, V_th)]
+        V_0, I_ex_0, I_in_0 = V[active], I_ex[active], I_in[active]
+        step = np.minimum(h[active], dt - t[active])
+        half_step = step / 2
+
+        dV, dI_ex, dI_in = derivatives(V_0, I_ex_0, I_in_0, *params[:6])
+        V_coarse = V_0 + step * dV
+        V_half, I_ex_half, I_in_half = V_0 + half_step * dV, I_ex_0 + half_step * dI_ex, I_in_0 + half_step * dI_in
+        dV_half, dI_ex_half, dI_in_half = derivatives(V_half, I_ex_half, I_in_half, *params[:6])
+        V_fine = V_half + half_step * dV_half
+
+        error = np.abs(V_fine - V_coarse)
+        crossing = (V_fine > params[6]) != (V_coarse > params[6])
+        accept = ((error <= tolerance) & ~crossing) | (step <= h_min * (1 + 1e-9))
+        factor = np.clip(0.9 * np.sqrt(tolerance / np.maximum(error, 1e-300)), 0.2, 2.)
+        factor = np.where(crossing & ~accept, np.minimum(factor, 0.5), factor)
+        h[active] = np.clip(step * factor, h_min, dt)
+
+        # rejected substeps leave the state unchanged
+        step = np.where(accept, step, 0.)
+        V[active] = V_0 + step * dV_half
+        I_ex[active] = I_ex_0 + step * dI_ex_half
+        I_in[active] = I_in_0 + step * dI_in_half
+        t[active] += step
+        num_substeps[active] += accept
+
+        remaining = t[active] < dt * (1 - 1e-12)
+        active = np.flatnonzero(remaining) if isinstance(active, slice) else active[remaining]
+        if len(active) == 0:
+            return num_substeps
+
+
+class lif_neuron_euler_adaptive(lif_neuron_euler):
+    """ Implementation of an integrate and fire neuron with exponentially shaped postsynaptic current
+    with adaptive Euler substeps inside every timestep (see adaptive_euler_step). Incoming spikes are added
+    at the start of the timestep and the threshold is checked at its end like in lif_neuron_matrix. """
+
+    __slots__ = ("tolerance", "max_substeps", "h", "num_substeps")
+
+    def __init__(self, network, params=None):
+        """ Initialize lif_psc_exp_euler_adaptive neuron.
+        network: Network instance the neuron belongs to
+        params: Dictionary specifying the parameters of lif_neuron_euler and:
+            -tolerance (maximum voltage error of a substep)[0.001 mV]
+            -max_substeps (substeps are at least dt / max_substeps long)[64]
+        """
+        super().__init__(network, params)
+        self.model_name = "lif_psc_exp_euler_adaptive"
+        self.tolerance = self.params.get("tolerance", 0.001) if self.params is not None else 0.001
+        self.max_substeps = self.params.get("max_substeps", 64) if self.params is not None else 64
+        self.h = np.array([self.dt])
+        self.num_substeps = 0
+
+    def update_step(self):
+        """ Update the neuron for one timestep. """
+        # get incoming spike currents
+        self.I_syn_ex += self.spike_current_ex[self.network.get_timestep()]
+        self.I_syn_in += self.spike_current_in[self.network.get_timestep()]
+
+        # evolve membrane voltage and synaptic currents with adaptive substeps
+        V = np.array([self.V], dtype=float)
+        I_ex = np.array([self.I_syn_ex], dtype=float)
+        I_in = np.array([self.I_syn_in], dtype=float)
+        self.num_substeps += int(adaptive_euler_step(V, I_ex, I_in, self.h, self.dt, self.I_E, self.C_m, self.tau_m, self.E_L,
+                                                     self.tau_ex, self.tau_in, self.V_th, self.tolerance, self.max_substeps)[0])
+        self.I_syn_ex = float(I_ex[0])
+        self.I_syn_in = float(I_in[0])
+
+        # check if neuron is refractory
+        if self.refractory_steps > 0:
+            self.V = self.V_reset
+            self.refractory_steps -= 1
+        else:
+            self.V = float(V[0])
+        self.input_current[self.network.get_timestep()] = self.I_E + self.I_syn_in + self.I_syn_ex
+
+        # check if membrane voltage has reached threshold
+        if self.V > self.V_th:
+            self.refractory_steps = int(round(self.t_ref / self.dt, 0))
+            self.V = self.V_reset
+            self.spike()
+        self.V_m[self.network.get_timestep()] = self.V
+
 
 class lif_neuron_matrix(Neuron):
     """implementation of an integrate and fire neuron
     with exponentially shaped postsynaptic current"""
 
+    __slots__ = ("V_th", "V_reset", "tau_m", "tau_ex", "tau_in", "V_init", "E_L", "I_e", "C_m", "V_m_rel_to_E_L", "I_syn_ex", "I_syn_in", "spike_current_in", "spike_current_ex", "P_11_ex", "P_11_in", "P_22", "P_20", "P_21_ex", "P_21_in")
+
     def __init__(self, network,  params=None):
         """ Initialize lif_psc_exp_exact neuron. 
         network: Network instance the neuron belongs to
@@ -140,8 +254,8 @@ class lif_neuron_matrix(Neuron):
         # initialize synaptic current and spike buffer
         self.I_syn_ex = 0.
         self.I_syn_in = 0.
-        self.spike_current_in = np.zeros(len(self.V_m))
-        self.spike_current_ex = np.zeros(len(self.V_m))
+        self.spike_current_in = np.zeros(len(self.V_m), dtype=self.network.get_state_dtype())
+        self.spike_current_ex = np.zeros(len(self.V_m), dtype=self.network.get_state_dtype())
 
         # init values for matrix
         self.P_11_ex = np.exp(-self.dt/self.tau_ex)
@@ -188,7 +302,7 @@ class lif_neuron_matrix(Neuron):
         # save membrane voltage to voltage history array in order to plot later
         self.V_m[self.network.get_timestep()] = self.V_m_rel_to_E_L + self.E_L
 
-        if self.V_m[self.network.get_timestep()] >= self.V_th:
+        if self.V_m_rel_to_E_L + self.E_L >= self.V_th:
             # spike ==> start refractory period
             self.refractory_steps = int(round(self.t_ref/self.dt, 0))
             self.V_m[self.network.get_timestep()] = self.V_reset
@@ -201,3 +315,359 @@ class lif_neuron_matrix(Neuron):
         # append current to current trace
         self.input_current[self.network.get_timestep(
         )] = self.I_syn_ex + self.I_syn_in + self.I_e
+
+
+class lif_neuron_matrix_ps(Neuron):
+    """ Implementation of an integrate and fire neuron with exponentially shaped postsynaptic current
+    and precise spike timing (like NEST's iaf_psc_exp_ps). The state is propagated exactly between
+    incoming spikes inside a timestep, threshold crossings are located with the Illinois variant of
+    regula falsi and spikes are emitted with their offset before the end of the timestep. Incoming spikes keep the offset of their
+    source, so spike times are not bound to the dt grid. """
+
+    __slots__ = ("V_th", "V_reset", "tau_m", "tau_ex", "tau_in", "V_init", "E_L", "I_e", "C_m", "V_m_rel_to_E_L", "I_syn_ex", "I_syn_in",
+                 "incoming_spikes", "refractory_time", "spike_times", "step_propagators")
+
+    def __init__(self, network, params=None):
+        """ Initialize lif_psc_exp_ps neuron.
+        network: Network instance the neuron belongs to
+        params: Dictionary specifying the parameters of lif_neuron_matrix
+        """
+
+        # call super constructor
+        super().__init__(network, "lif_psc_exp_ps", params, default_params={'V_th': -55.0, 'V_reset': -70.0, 'tau_m': 10.0, 'C_m': 250.0, 'tau_ex': 2.0, 'I_e': 0.,
+                                                                            'tau_in': 2.0, 'V_init': -70.0, 'E_L': -70.0, 't_ref': 2.0})
+
+        # set all necessarey parameters
+        self.V_th = self.get_param("V_th")
+        self.V_reset = self.get_param("V_reset")
+        self.tau_m = self.get_param("tau_m")
+        self.tau_ex = self.get_param("tau_ex")
+        self.tau_in = self.get_param("tau_in")
+        self.V_init = self.get_param("V_init")
+        self.E_L = self.get_param("E_L")
+        self.I_e = self.get_param("I_e")
+        self.C_m = self.get_param("C_m")
+
+        # add initial voltage to voltage trace
+        self.V_m[0] = self.V_init
+        self.V_m_rel_to_E_L = self.V_init - self.E_L
+
+        # synaptic currents, incoming spikes as lists of (offset, weight) by timestep
+        # and remaining refractory time in ms
+        self.I_syn_ex = 0.
+        self.I_syn_in = 0.
+        self.incoming_spikes = {}
+        self.refractory_time = 0.
+        self.spike_times = []
+        self.step_propagators = None
+
+    def handle_incoming_spike(self, weight, delay):
+        """ Neuron handles incoming spike and adjusts postsynaptic current depending on the weight.
+        The spike arrives delay after the precise time of the presynaptic spike (see Network.get_spike_offset).
+        weight: Current weight of the synapse the action potential comes from
+        delay: Delay of the synapse
+        """
+        index = self.network.get_timestep() + int(round(delay / self.dt, 0))
+        offset = self.network.get_spike_offset()
+        if index == self.network.get_timestep():
+            # without delay the spike arrives at the start of the next timestep as for the grid based models
+            index, offset = index + 1, self.dt
+        # check if spike arrival is during simulation duration
+        if index < len(self.V_m):
+            self.incoming_spikes.setdefault(index, []).append((offset, weight))
+
+    def get_propagators(self, h):
+        """ Return propagators P_22, P_21_ex, P_21_in, P_20, P_11_ex and P_11_in of the exact solution for time h.
+        The propagators of a whole timestep are computed only once. """
+        if h == self.dt and self.step_propagators is not None:
+            return self.step_propagators
+        P_11_ex = np.exp(-h / self.tau_ex)
+        P_11_in = np.exp(-h / self.tau_in)
+        P_22 = np.exp(-h / self.tau_m)
+        P_21_ex = self.tau_m*self.tau_ex / (self.C_m*(self.tau_ex-self.tau_m)) * (P_11_ex - P_22)
+        P_21_in = self.tau_m*self.tau_in / (self.C_m*(self.tau_in-self.tau_m)) * (P_11_in - P_22)
+        P_20 = self.tau_m / self.C_m * (1. - P_22)
+        propagators = (P_22, P_21_ex, P_21_in, P_20, P_11_ex, P_11_in)
+        if h == self.dt:
+            self.step_propagators = propagators
+        return propagators
+
+    def propagate_V(self, h):
+        """ Return membrane voltage relative to E_L after time h without spikes. """
+        P_22, P_21_ex, P_21_in, P_20 = self.get_propagators(h)[:4]
+        return self.V_m_rel_to_E_L * P_22 + P_21_ex * self.I_syn_ex + P_21_in * self.I_syn_in + P_20 * self.I_e
+
+    def propagate_I_syn(self, h):
+        """ Let synaptic currents decay for time h. """
+        P_11_ex, P_11_in = self.get_propagators(h)[4:]
+        self.I_syn_ex *= P_11_ex
+        self.I_syn_in *= P_11_in
+
+    def find_threshold_crossing(self, h):
+        """ Return time of the threshold crossing inside (0, h] located with the Illinois variant of regula falsi,
+        V_m has to be below threshold at 0 and above at h. """
+        V_th_rel_to_E_L = self.V_th - self.E_L
+        lo, hi = 0., h
+        f_lo, f_hi = self.V_m_rel_to_E_L - V_th_rel_to_E_L, self.propagate_V(h) - V_th_rel_to_E_L
+        side = 0
+        while hi - lo > 1e-12 * self.dt:
+            t = (lo * f_hi - hi * f_lo) / (f_hi - f_lo)
+            f = self.propagate_V(t) - V_th_rel_to_E_L
+            if f >= 0.:
+                hi, f_hi = t, f
+                if side == -1:
+                    f_lo /= 2.
+                side = -1
+            else:
+                lo, f_lo = t, f
+                if side == 1:
+                    f_hi /= 2.
+                side = 1
+            if abs(f) < 1e-12:
+                break
+        return hi
+
+    def evolve(self, start, end):
+        """ Evolve the neuron from time start to time end since the start of the current timestep
+        and emit the spikes of all threshold crossings in between. """
+        while start < end:
+            if self.refractory_time > 0.:
+                # refractory ==> clamp V_m to V_reset while the synaptic currents decay
+                h = min(self.refractory_time, end - start)
+                self.propagate_I_syn(h)
+                self.V_m_rel_to_E_L = self.V_reset - self.E_L
+                self.refractory_time = self.refractory_time - h if self.refractory_time - h > 1e-12 * self.dt else 0.
+                start += h
+                continue
+            V_m_rel_to_E_L = self.propagate_V(end - start)
+            if V_m_rel_to_E_L >= self.V_th - self.E_L:
+                # spike ==> evolve to the threshold crossing, reset and start refractory period
+                h = self.find_threshold_crossing(end - start)
+                self.propagate_I_syn(h)
+                start += h
+                self.V_m_rel_to_E_L = self.V_reset - self.E_L
+                self.refractory_time = self.t_ref
+                offset = self.dt - start
+                self.spike_times.append(self.network.get_timestep() * self.dt - offset)
+                self.spike(offset)
+            else:
+                self.V_m_rel_to_E_L = V_m_rel_to_E_L
+                self.propagate_I_syn(end - start)
+                start = end
+
+    def update_step(self):
+        """ Update the neuron for one timestep. """
+        # evolve to every incoming spike in order of arrival and add it to the synaptic currents
+        start = 0.
+        for offset, weight in sorted(self.incoming_spikes.pop(self.network.get_timestep(), ()), key=lambda spike: -spike[0]):
+            self.evolve(start, self.dt - offset)
+            start = self.dt - offset
+            if weight > 0:
+                self.I_syn_ex += weight
+            else:
+                self.I_syn_in += weight
+        self.evolve(start, self.dt)
+
+        # save membrane voltage and input current at the end of the timestep
+        self.V_m[self.network.get_timestep()] = self.V_m_rel_to_E_L + self.E_L
+        self.input_current[self.network.get_timestep()] = self.I_syn_ex + self.I_syn_in + self.I_e
+
+    def get_spike_times(self):
+        """ Return precise times of all spikes in ms. """
+        return np.array(self.spike_times)
+
+
+class lif_population_euler(Population):
+    """ Array-backed population of lif_psc_exp_euler neurons. Every neuron evolves
+    exactly like a lif_neuron_euler object with the same parameters. """
+
+    def __init__(self, network, size, params=None, name=None, record=None):
+        """ Initialize population of lif_psc_exp_euler neurons.
+        network: Network instance the population belongs to
+        size: Number of neurons
+        params: Dictionary with the parameters of lif_neuron_euler, each either a scalar or an array of length size
+        name: Unique name of the population
+        record: Iterable of state variables to record ("V_m", "input_current")
+        """
+        super().__init__(network, "lif_psc_exp_euler", size, params, default_params={'V_th': -55.0, 'V_reset': -70.0, 'tau_m': 10.0, 'C_m': 250.0, 'I_e': 0., 'V_init': -70.0,
+                                                                                     'E_L': -70.0, 't_ref': 2.0, 'tau_in': 2.0, 'tau_ex': 2.0}, name=name, record=record)
+
+        # set all necessarey parameters
+        self.V_th = self.get_param("V_th")
+        self.V_reset = self.get_param("V_reset")
+        self.tau_m = self.get_param("tau_m")
+        self.C_m = self.get_param("C_m")
+        self.V_init = self.get_param("V_init")
+        self.E_L = self.get_param("E_L")
+        self.I_E = self.get_param("I_e")
+        self.tau_in = self.get_param("tau_in")
+        self.tau_ex = self.get_param("tau_ex")
+
+        # current state and state of the previous timestep
+        self.V = self.V_init.copy()
+        self.I_prev = np.zeros(self.size, dtype=self.dtype)
+        self.I_syn_in = np.zeros(self.size, dtype=self.dtype)
+        self.I_syn_ex = np.zeros(self.size, dtype=self.dtype)
+        if self.V_m is not None:
+            self.V_m[0] = self.V_init
+
+    def get_external_current(self):
+        """ Return array with the external current I_e of the local neurons. """
+        return self.I_E
+
+    def update_kernel(self, sl, spikes_ex, spikes_in):
+        """ Update the neurons in slice sl for one timestep and return the indices of the spiking neurons.
+        spikes_ex, spikes_in: Incoming excitatory and inhibitory spikes of the neurons in sl
+        """
+        I_syn_in = self.I_syn_in[sl]
+        I_syn_ex = self.I_syn_ex[sl]
+        refractory_steps = self.refractory_steps[sl]
+        V_reset = self.V_reset[sl]
+
+        # update synaptic currents correpsonding to the euler method
+        I_syn_in += spikes_in + self.dt * (- I_syn_in / self.tau_in[sl])
+        I_syn_ex += spikes_ex + self.dt * (- I_syn_ex / self.tau_ex[sl])
+        cur_current = self.I_E[sl] + I_syn_in + I_syn_ex
+
+        # evolve membrane voltage of all non-refractory neurons
+        refractory = refractory_steps > 0
+        dv = self.dt * (self.I_prev[sl] / self.C_m[sl] - (self.V[sl] - self.E_L[sl])/self.tau_m[sl])
+        V = np.where(refractory, V_reset, self.V[sl] + dv)
+        refractory_steps[refractory] -= 1
+        self.I_prev[sl] = cur_current
+
+        # check if membrane voltage has reached threshold
+        spiked = np.flatnonzero(V > self.V_th[sl])
+        refractory_steps[spiked] = self.t_ref_steps[sl][spiked]
+        V[spiked] = V_reset[spiked]
+        self.V[sl] = V
+
+        self.record_state(sl, V, cur_current)
+        return spiked + sl.start
+
+
+class lif_population_matrix(Population):
+    """ Array-backed population of lif_psc_exp_exact neurons. Every neuron evolves
+    exactly like a lif_neuron_matrix object with the same parameters. """
+
+    def __init__(self, network, size, params=None, name=None, record=None):
+        """ Initialize population of lif_psc_exp_exact neurons.
+        network: Network instance the population belongs to
+        size: Number of neurons
+        params: Dictionary with the parameters of lif_neuron_matrix, each either a scalar or an array of length size
+        name: Unique name of the population
+        record: Iterable of state variables to record ("V_m", "input_current")
+        """
+        super().__init__(network, "lif_psc_exp_exact", size, params, default_params={'V_th': -55.0, 'V_reset': -70.0, 'tau_m': 10.0, 'C_m': 250.0, 'tau_ex': 2.0, 'I_e': 0.,
+                                                                                     'tau_in': 2.0, 'V_init': -70.0, 'E_L': -70.0, 't_ref': 2.0}, name=name, record=record)
+
+        # set all necessarey parameters
+        self.V_th = self.get_param("V_th")
+        self.V_reset = self.get_param("V_reset")
+        self.tau_m = self.get_param("tau_m")
+        self.tau_ex = self.get_param("tau_ex")
+        self.tau_in = self.get_param("tau_in")
+        self.V_init = self.get_param("V_init")
+        self.E_L = self.get_param("E_L")
+        self.I_e = self.get_param("I_e")
+        self.C_m = self.get_param("C_m")
+
+        # initial state
+        self.V_m_rel_to_E_L = self.V_init - self.E_L
+        self.I_syn_ex = np.zeros(self.size, dtype=self.dtype)
+        self.I_syn_in = np.zeros(self.size, dtype=self.dtype)
+        if self.V_m is not None:
+            self.V_m[0] = self.V_init
+
+        # init values for matrix
+        self.P_11_ex = np.exp(-self.dt/self.tau_ex)
+        self.P_11_in = np.exp(-self.dt/self.tau_in)
+        self.P_22 = np.exp(-self.dt / self.tau_m)
+        self.P_20 = self.tau_m / self.C_m * (1. - self.P_22)
+        self.P_21_ex = self.tau_m*self.tau_ex / \
+            (self.C_m*(self.tau_ex-self.tau_m)) * (self.P_11_ex-self.P_22)
+        self.P_21_in = self.tau_m*self.tau_in / \
+            (self.C_m*(self.tau_in-self.tau_m)) * (self.P_11_in-self.P_22)
+
+    def get_external_current(self):
+        """ Return array with the external current I_e of the local neurons. """
+        return self.I_e
+
+    def update_kernel(self, sl, spikes_ex, spikes_in):
+        """ Update the neurons in slice sl for one timestep and return the indices of the spiking neurons.
+        spikes_ex, spikes_in: Incoming excitatory and inhibitory spikes of the neurons in sl
+        """
+        I_syn_ex = self.I_syn_ex[sl]
+        I_syn_in = self.I_syn_in[sl]
+        refractory_steps = self.refractory_steps[sl]
+        I_syn_ex += spikes_ex
+        I_syn_in += spikes_in
+
+        # evolve V_m of all non-refractory neurons, set refractory ones to V_reset
+        refractory = refractory_steps > 0
+        V_m_rel_to_E_L = np.where(refractory, self.V_reset[sl] - self.E_L[sl], self.V_m_rel_to_E_L[sl] * self.P_22[sl] + self.P_21_ex[sl] *
+                                  I_syn_ex + self.P_21_in[sl] * I_syn_in + self.P_20[sl] * self.I_e[sl])
+        self.V_m_rel_to_E_L[sl] = V_m_rel_to_E_L
+        refractory_steps[refractory] -= 1
+
+        V = V_m_rel_to_E_L + self.E_L[sl]
+        spiked = np.flatnonzero(V >= self.V_th[sl])
+        # spike ==> start refractory period
+        refractory_steps[spiked] = self.t_ref_steps[sl][spiked]
+        V[spiked] = self.V_reset[sl][spiked]
+
+        # evolve synaptic currents
+        I_syn_ex *= self.P_11_ex[sl]
+        I_syn_in *= self.P_11_in[sl]
+
+        self.record_state(sl, V, I_syn_ex + I_syn_in + self.I_e[sl])
+        return spiked + sl.start
+
+
+class lif_population_euler_adaptive(lif_population_euler):
+    """ Array-backed population of lif_psc_exp_euler_adaptive neurons. Every neuron evolves
+    exactly like a lif_neuron_euler_adaptive object with the same parameters. """
+
+    def __init__(self, network, size, params=None, name=None, record=None):
+        """ Initialize population of lif_psc_exp_euler_adaptive neurons.
+        network: Network instance the population belongs to
+        size: Number of neurons
+        params: Dictionary with the parameters of lif_neuron_euler_adaptive, each either a scalar or an array of length size
+        name: Unique name of the population
+        record: Iterable of state variables to record ("V_m", "input_current")
+        """
+        super().__init__(network, size, params, name=name, record=record)
+        self.model_name = "lif_psc_exp_euler_adaptive"
+        self.tolerance = self.params.get("tolerance", 0.001) if self.params is not None else 0.001
+        self.max_substeps = self.params.get("max_substeps", 64) if self.params is not None else 64
+        self.h = np.full(self.size, self.dt)
+        self.num_substeps = np.zeros(self.size, dtype=np.int64)
+
+    def update_kernel(self, sl, spikes_ex, spikes_in):
+        """ Update the neurons in slice sl for one timestep and return the indices of the spiking neurons.
+        spikes_ex, spikes_in: Incoming excitatory and inhibitory spikes of the neurons in sl
+        """
+        I_syn_in = self.I_syn_in[sl]
+        I_syn_ex = self.I_syn_ex[sl]
+        refractory_steps = self.refractory_steps[sl]
+        V_reset = self.V_reset[sl]
+        I_syn_ex += spikes_ex
+        I_syn_in += spikes_in
+
+        # evolve membrane voltage and synaptic currents with adaptive substeps, the views are updated in place
+        V = self.V[sl]
+        self.num_substeps[sl] += adaptive_euler_step(V, I_syn_ex, I_syn_in, self.h[sl], self.dt, self.I_E[sl], self.C_m[sl], self.tau_m[sl],
+                                                     self.E_L[sl], self.tau_ex[sl], self.tau_in[sl], self.V_th[sl], self.tolerance, self.max_substeps)
+
+        # set refractory neurons to V_reset
+        refractory = refractory_steps > 0
+        V[refractory] = V_reset[refractory]
+        refractory_steps[refractory] -= 1
+
+        # check if membrane voltage has reached threshold
+        spiked = np.flatnonzero(V > self.V_th[sl])
+        refractory_steps[spiked] = self.t_ref_steps[sl][spiked]
+        V[spiked] = V_reset[spiked]
+
+        self.record_state(sl, V, self.I_E[sl] + I_syn_in + I_syn_ex)
+        return spiked + sl.start
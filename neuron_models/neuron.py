@@ -1,11 +1,12 @@
 import numpy as np
-import matplotlib.pyplot as plt
 from abc import ABC as AbstractBaseClass, abstractmethod
 
 
 class Neuron(AbstractBaseClass):
     """ Abstract base class for neuron models. """
 
+    __slots__ = ("params", "default_params", "t_ref", "network", "id", "dt", "t_sim", "refractory_steps", "V_m", "input_current", "model_name")
+
     def get_param(self, key):
         """ Return parameter with given key either from params
         or from default_params if not specified in params. """
@@ -35,8 +36,8 @@ class Neuron(AbstractBaseClass):
         self.refractory_steps = 0
 
         t_len = int(self.t_sim/self.dt)+1
-        self.V_m = np.zeros(t_len)
-        self.input_current = np.zeros(t_len)
+        self.V_m = np.zeros(t_len, dtype=self.network.get_storage_dtype())
+        self.input_current = np.zeros(t_len, dtype=self.network.get_storage_dtype())
 
         self.model_name = model_name
 
@@ -45,32 +46,16 @@ class Neuron(AbstractBaseClass):
         plot_input: Boolean to specify whether the input current should be plotted in the same plot
         title: Title of the plot; If None: Title will be Simulation of <model_name> 
         """
-        fig, ax = plt.subplots()
-        if title is None:
-            fig.suptitle("Simulation of "+self.model_name)
-        else:
-            fig.suptitle(title)
-
-        ax.set_xlabel("t [ms]", fontsize=14)
-        if plot_input:
-            ax2 = ax.twinx()
-            ax2.plot(np.arange(self.dt, self.t_sim + (self.dt/2.), self.dt),
-                     self.input_current[1:], color="blue", linewidth=0.6, linestyle=":")
-            ax2.set_ylabel("I [pA]", color="blue", fontsize=14)
-
-        ax.plot(np.arange(0, self.t_sim+(self.dt/2.), self.dt),
-                self.V_m, color="red", linewidth=1)
-        ax.set_ylabel("V_m [mV]", color="red", fontsize=14)
-        V_th = self.get_param("V_th")
-        V_reset = self.get_param("V_reset")
-        if V_th is not None and V_reset is not None:
-            ax.set_ylim((V_reset-1, V_th+1))
+        # matplotlib is loaded lazily with the plotting module
+        from network.plotting import plot_results
+        plot_results(self, plot_input, title)
 
-        plt.show()
-
-    def spike(self):
-        """ Method to be called by subclasses in case of an action potential. """
-        self.network.handle_spike(self)
+    def spike(self, offset=0.):
+        """ Method to be called by subclasses in case of an action potential.
+        offset: Time of the spike before the end of the current timestep for precise spike timing [0.0 ms]
+        """
+        self.network.count_spikes(1)
+        self.network.handle_spike(self, offset)
 
     @abstractmethod
     def handle_incoming_spike(self, weight, delay):
@@ -1,10 +1,13 @@
 from neuron_models.neuron import Neuron
+from neuron_models.population import Population
 import numpy as np
 
 class pif_neuron(Neuron):
     """ implementation of a perfect integrate and fire neuron with
     exponentially shaped postsynaptical current. """
 
+    __slots__ = ("V_th", "V_reset", "C_m", "V_init", "E_L", "I_E", "tau_in", "tau_ex", "spike_current_in", "spike_current_ex", "I_syn_in", "I_syn_ex", "V")
+
     def __init__(self, network, params=None):
         """ Initialize pif_psc_exp neuron. 
         network: Network instance the neuron belongs to
@@ -34,12 +37,13 @@ class pif_neuron(Neuron):
         self.tau_in = self.get_param("tau_in")
         self.tau_ex = self.get_param("tau_ex")
 
-        # add initial voltage to voltage trace
+        # membrane voltage, V_m only records it
+        self.V = self.V_init
         self.V_m[0] = self.V_init
 
         # initialize synaptic current and spike buffer
-        self.spike_current_in = np.zeros(len(self.V_m))
-        self.spike_current_ex = np.zeros(len(self.V_m))
+        self.spike_current_in = np.zeros(len(self.V_m), dtype=self.network.get_state_dtype())
+        self.spike_current_ex = np.zeros(len(self.V_m), dtype=self.network.get_state_dtype())
         self.I_syn_in = 0.
         self.I_syn_ex = 0.
 
@@ -75,14 +79,82 @@ class pif_neuron(Neuron):
         # check if neuron is refractory
         if self.refractory_steps > 0:
             # refractory ==> set membrane voltage to reset voltage and decrease number of refractory timesteps
-            self.V_m[self.network.get_timestep()] = self.V_reset
+            self.V = self.V_reset
             self.refractory_steps -= 1
         else:
             # not refractory ==> evolve membrane voltage
-            self.V_m[self.network.get_timestep()] = self.V_m[self.network.get_timestep()-1] + self.dt * cur_current / self.C_m
+            self.V = self.V + self.dt * cur_current / self.C_m
 
         # check if membrane voltage has reached threshold
-        if self.V_m[self.network.get_timestep()] > self.V_th:
+        if self.V > self.V_th:
             self.refractory_steps = int(round(self.t_ref / self.dt, 0))
-            self.V_m[self.network.get_timestep()] = self.V_reset
+            self.V = self.V_reset
             self.spike()
+
+        # add membrane voltage to voltage trace
+        self.V_m[self.network.get_timestep()] = self.V
+
+
+class pif_population(Population):
+    """ Array-backed population of pif_psc_exp neurons. Every neuron evolves
+    exactly like a pif_neuron object with the same parameters. """
+
+    def __init__(self, network, size, params=None, name=None, record=None):
+        """ Initialize population of pif_psc_exp neurons.
+        network: Network instance the population belongs to
+        size: Number of neurons
+        params: Dictionary with the parameters of pif_neuron, each either a scalar or an array of length size
+        name: Unique name of the population
+        record: Iterable of state variables to record ("V_m", "input_current")
+        """
+        super().__init__(network, "pif_psc_exp", size, params, default_params={'V_th': -55.0, 'V_reset': -70.0, 'C_m': 250.0, 'I_e': 0., 'V_init': -70.0,
+                                                                               'E_L': -70.0, 't_ref': 2.0, 'tau_in': 2.0, 'tau_ex': 2.0}, name=name, record=record)
+
+        # set all necessarey parameters
+        self.V_th = self.get_param("V_th")
+        self.V_reset = self.get_param("V_reset")
+        self.C_m = self.get_param("C_m")
+        self.V_init = self.get_param("V_init")
+        self.E_L = self.get_param("E_L")
+        self.I_E = self.get_param("I_e")
+        self.tau_in = self.get_param("tau_in")
+        self.tau_ex = self.get_param("tau_ex")
+
+        # initial state
+        self.V = self.V_init.copy()
+        self.I_syn_in = np.zeros(self.size, dtype=self.dtype)
+        self.I_syn_ex = np.zeros(self.size, dtype=self.dtype)
+        if self.V_m is not None:
+            self.V_m[0] = self.V_init
+
+    def get_external_current(self):
+        """ Return array with the external current I_e of the local neurons. """
+        return self.I_E
+
+    def update_kernel(self, sl, spikes_ex, spikes_in):
+        """ Update the neurons in slice sl for one timestep and return the indices of the spiking neurons.
+        spikes_ex, spikes_in: Incoming excitatory and inhibitory spikes of the neurons in sl
+        """
+        I_syn_in = self.I_syn_in[sl]
+        I_syn_ex = self.I_syn_ex[sl]
+        refractory_steps = self.refractory_steps[sl]
+        V_reset = self.V_reset[sl]
+
+        # update synaptic currents corresponding to the euler method
+        I_syn_in += spikes_in + self.dt * (- I_syn_in / self.tau_in[sl])
+        I_syn_ex += spikes_ex + self.dt * (- I_syn_ex / self.tau_ex[sl])
+        cur_current = self.I_E[sl] + I_syn_in + I_syn_ex
+
+        # evolve membrane voltage of all non-refractory neurons
+        refractory = refractory_steps > 0
+        V = np.where(refractory, V_reset, self.V[sl] + self.dt * cur_current / self.C_m[sl])
+        refractory_steps[refractory] -= 1
+
+        # check if membrane voltage has reached threshold
+        spiked = np.flatnonzero(V > self.V_th[sl])
+        refractory_steps[spiked] = self.t_ref_steps[sl][spiked]
+        V[spiked] = V_reset[spiked]
+        self.V[sl] = V
+
+        self.record_state(sl, V, cur_current)
+        return spiked + sl.start
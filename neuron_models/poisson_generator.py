@@ -0,0 +1,35 @@
+from neuron_models.population import Population
+import numpy as np
+
+
+class poisson_population(Population):
+    """ Array-backed population of independent Poisson spike sources to provide stochastic input.
+    In every timestep each neuron spikes with probability rate * dt, at most once per step.
+    Random numbers come from a block stream of the network (see network.rng), so the spike trains
+    only depend on the seed and not on the number of threads or processes. Incoming spikes are ignored. """
+
+    def __init__(self, network, size, params=None, name=None, record=None):
+        """ Initialize population of Poisson generators.
+        network: Network instance the population belongs to
+        size: Number of generators
+        params: Dictionary with the firing rate "rate" in Hz [10.0 Hz], either a scalar or an array of length size
+        name: Unique name of the population
+        record: Not used, generators have no state to record
+        """
+        super().__init__(network, "poisson_generator", size, params, default_params={'rate': 10.0, 't_ref': 0.}, name=name)
+
+        self.rate = self.get_param("rate")
+        self.spike_probability = self.rate * self.dt / 1000.
+        self.stream = self.network.get_random_streams().block_stream("population", self.name, "spikes")
+        self.uniforms = np.zeros(self.size)
+
+    def update_step(self):
+        """ Draw the random numbers of all local generators, then update as usual. The draw happens
+        in the calling thread so that it does not depend on the chunks of the thread pool. """
+        self.uniforms = self.stream.draw(self.offset, self.offset + self.size, self.global_size,
+                                         lambda generator, n: generator.random(n))
+        super().update_step()
+
+    def update_kernel(self, sl, spikes_ex, spikes_in):
+        """ Return the indices of the generators in slice sl that spike in this timestep. """
+        return np.flatnonzero(self.uniforms[sl] < self.spike_probability[sl]) + sl.start
@@ -0,0 +1,227 @@
+import numpy as np
+from abc import ABC as AbstractBaseClass, abstractmethod
+
+# populations are only split into chunks for the thread pool if every chunk has at least this many neurons
+MIN_CHUNK_SIZE = 4096
+
+
+class PopulationNeuron:
+    """ Lightweight view on a single neuron of a population. It provides the part of the
+    neuron interface the synapse objects rely on, so that object synapses can be
+    connected to array-backed populations. """
+
+    __slots__ = ("population", "index", "id")
+
+    def __init__(self, population, index):
+        """ Initialize view.
+        population: Population the neuron belongs to
+        index: Index of the neuron inside the population
+        """
+        self.population = population
+        self.index = index
+        self.id = population.first_id + index
+
+    @property
+    def V_m(self):
+        """ Recorded membrane voltage trace of the neuron. """
+        return self.population.V_m[:, self.index]
+
+    @property
+    def input_current(self):
+        """ Recorded input current trace of the neuron. """
+        return self.population.input_current[:, self.index]
+
+    def handle_incoming_spike(self, weight, delay):
+        """ Forward incoming spike to the input buffers of the population. """
+        self.population.add_input(np.array([self.index]), int(round(delay / self.population.dt, 0)), np.array([weight]))
+
+
+class Population(AbstractBaseClass):
+    """ Abstract base class for array-backed neuron populations. All neurons of a
+    population share one model and keep their state in NumPy arrays, so one
+    update step is a handful of vectorized operations instead of one method call per neuron. """
+
+    def get_param(self, key):
+        """ Return parameter with given key as array of length size either from params
+        or from default_params if not specified in params. """
+        if self.params is not None and key in self.params:
+            value = self.params[key]
+        elif self.default_params is not None and key in self.default_params:
+            value = self.default_params[key]
+        else:
+            return None
+        # per neuron values are given for the whole population, keep the local part
+        value = np.broadcast_to(np.asarray(value, dtype=self.dtype), (self.global_size,))
+        return value[self.offset:self.offset + self.size].copy()
+
+    def __init__(self, network, model_name, size, params, default_params=None, name=None, record=None):
+        """ Initialize common parameters of populations.
+        network: Network instance the population belongs to
+        model_name: Model name of the corresponding single neuron model
+        size: Number of neurons in the population
+        params: Parameters specified for the neuron model, either scalars or arrays of length size
+        default_params: Parameters the population uses if no parameters are specified in params
+        name: Unique name of the population; If None: population_<index>
+        record: Iterable of state variables to record for every timestep ("V_m", "input_current")
+        """
+        # in distributed simulations only the local part [offset, offset + size) is stored on this process
+        self.global_size = int(size)
+        self.offset, end = network.get_local_range(self.global_size)
+        self.size = end - self.offset
+        self.params = params
+        self.default_params = default_params
+        self.model_name = model_name
+        self.record = set(record) if record is not None else set()
+
+        self.network = network
+        self.name = name
+        network.register_population(self)
+
+        # state and parameters use the state precision, recordings and input buffers the storage precision
+        self.dtype = self.network.get_state_dtype()
+        self.storage_dtype = self.network.get_storage_dtype()
+
+        self.dt = self.network.get_resolution()
+        self.t_sim = self.network.get_simulation_duration()
+
+        self.t_ref = self.get_param("t_ref")
+        self.refractory_steps = np.zeros(self.size, dtype=np.int64)
+        self.t_ref_steps = np.round(self.t_ref / self.dt).astype(np.int64)
+
+        # traces are only allocated if requested, spikes are always recorded
+        t_len = int(self.t_sim/self.dt)+1
+        self.V_m = np.zeros((t_len, self.size), dtype=self.storage_dtype) if "V_m" in self.record else None
+        self.input_current = np.zeros((t_len, self.size), dtype=self.storage_dtype) if "input_current" in self.record else None
+        self.spike_steps = []
+        self.spike_indices = []
+        self.reducers = []
+
+        # ring buffers for incoming excitatory (channel 0) and inhibitory (channel 1) spikes in one array,
+        # grown on demand to the largest delay
+        self.set_input_buffer(np.zeros((2, 2, self.size), dtype=self.storage_dtype))
+
+    def add_reducer(self, reducer):
+        """ Attach an online reducer (see network.reducers) to the population and return it. """
+        reducer.attach(self)
+        self.reducers.append(reducer)
+        return reducer
+
+    def get_neuron(self, index):
+        """ Return view on the neuron with the given index inside the population. """
+        return PopulationNeuron(self, index)
+
+    def get_ids(self):
+        """ Return global neuron ids of all neurons in the population. """
+        return np.arange(self.first_id, self.first_id + self.size)
+
+    def set_input_buffer(self, spike_input):
+        """ Set ring buffer of incoming spikes with the views spike_current_ex and spike_current_in on its channels. """
+        self.spike_input = spike_input
+        self.spike_current_ex = spike_input[0]
+        self.spike_current_in = spike_input[1]
+
+    def ensure_delay_capacity(self, delay_steps):
+        """ Grow the input ring buffers so that spikes with the given delay in steps can be stored. """
+        ring_len = self.spike_input.shape[1]
+        if delay_steps + 2 <= ring_len:
+            return
+        new_len = max(delay_steps + 2, 2 * ring_len)
+        t = self.network.get_timestep()
+        # move pending entries to their slots in the larger ring
+        slots = (t + np.arange(ring_len)) % ring_len
+        new_slots = (t + np.arange(ring_len)) % new_len
+        spike_input = np.zeros((2, new_len, self.size), dtype=self.spike_input.dtype)
+        spike_input[:, new_slots] = self.spike_input[:, slots]
+        self.set_input_buffer(spike_input)
+
+    def add_input(self, targets, delay_steps, weights, channels=None):
+        """ Store incoming spikes in the input buffers with a single np.add.at.
+        targets: Array of indices of the target neurons inside the population
+        delay_steps: Delay in steps, either scalar or array matching targets
+        weights: Array of weights of the spikes
+        channels: Array with 0 for excitatory and 1 for inhibitory spikes; If None: derived from the sign of the weights
+        """
+        if len(targets) == 0:
+            return
+        self.ensure_delay_capacity(int(np.max(delay_steps)))
+        slots = (1 + self.network.get_timestep() + delay_steps) % self.spike_input.shape[1]
+        slots = np.broadcast_to(slots, targets.shape)
+        if channels is None:
+            channels = (weights <= 0).astype(np.intp)
+        np.add.at(self.spike_input, (channels, slots, targets), weights)
+
+    def pop_input(self):
+        """ Return excitatory and inhibitory input of the current timestep and clear the slot. """
+        slot = self.network.get_timestep() % self.spike_input.shape[1]
+        spikes_ex, spikes_in = self.spike_input[:, slot].copy()
+        self.spike_input[:, slot] = 0.
+        return spikes_ex, spikes_in
+
+    def spike(self, indices):
+        """ Method to be called by subclasses with the indices of all neurons that spiked in this step. """
+        if len(indices) == 0:
+            return
+        self.spike_steps.append(np.full(len(indices), self.network.get_timestep()))
+        self.spike_indices.append(indices)
+        for reducer in self.reducers:
+            reducer.record_spikes(self.network.get_timestep(), indices)
+        self.network.count_spikes(len(indices))
+        self.network.handle_population_spikes(self, indices)
+
+    def get_external_current(self):
+        """ Return array with the external current I_e of the local neurons in pA, which is read in every
+        timestep and may be changed in place between timesteps, or None for models without external current. """
+        return None
+
+    def set_external_current(self, current, indices=None):
+        """ Set external current I_e of the neurons with the given indices (local indices; If None: all neurons) in pA. """
+        I_e = self.get_external_current()
+        if I_e is None:
+            raise ValueError("Population model '" + self.model_name + "' has no external current.")
+        if indices is None:
+            I_e[:] = current
+        else:
+            I_e[indices] = current
+
+    def get_spikes(self):
+        """ Return timesteps and neuron indices of all recorded spikes as two arrays. """
+        if len(self.spike_steps) == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return np.concatenate(self.spike_steps), np.concatenate(self.spike_indices)
+
+    def record_state(self, sl, V_m, input_current):
+        """ Save state of the neurons in slice sl of the current timestep to the recorded traces, if requested,
+        and pass it to the reducers. """
+        t = self.network.get_timestep()
+        if self.V_m is not None:
+            self.V_m[t, sl] = V_m
+        if self.input_current is not None:
+            self.input_current[t, sl] = input_current
+        for reducer in self.reducers:
+            reducer.record_state(sl, V_m, input_current)
+
+    def get_chunks(self, n_threads):
+        """ Return list of slices splitting the population into at most n_threads chunks. """
+        n_chunks = max(1, min(n_threads, self.size // MIN_CHUNK_SIZE))
+        bounds = [self.size * i // n_chunks for i in range(n_chunks + 1)]
+        return [slice(bounds[i], bounds[i + 1]) for i in range(n_chunks)]
+
+    def update_step(self):
+        """ Update all neurons of the population for one time step. If the network runs a thread pool,
+        the update kernels of the chunks run in parallel; NumPy releases the GIL inside the array operations. """
+        spikes_ex, spikes_in = self.pop_input()
+        pool = self.network.get_thread_pool()
+        chunks = self.get_chunks(self.network.get_num_threads()) if pool is not None else [slice(0, self.size)]
+        if len(chunks) == 1:
+            spiked = self.update_kernel(chunks[0], spikes_ex, spikes_in)
+        else:
+            futures = [pool.submit(self.update_kernel, sl, spikes_ex[sl], spikes_in[sl]) for sl in chunks]
+            spiked = np.concatenate([future.result() for future in futures])
+        self.spike(spiked)
+
+    @abstractmethod
+    def update_kernel(self, sl, spikes_ex, spikes_in):
+        """ Abstract method to update the neurons in slice sl for one time step and return the indices of 
+        the spiking neurons. Kernels of disjoint slices may run in parallel threads.
+        Needs to be implemented by subclasses. """
+        pass
@@ -0,0 +1,120 @@
+import numpy as np
+from abc import ABC as AbstractBaseClass, abstractmethod
+
+from neuron_models.population import Population
+
+
+class PopulationModel(AbstractBaseClass):
+    """ Abstract base class for neuron models plugged into GenericPopulation. A model only declares
+    its parameters and state variables and implements the vectorized update of the subthreshold dynamics;
+    input buffers, recording, refractory bookkeeping and spike emission are handled by GenericPopulation.
+    Subclasses set the following class attributes:
+        -model_name (name of the model, also used in network specifications)
+        -default_params (dictionary with the default value of every parameter)
+        -state_variables (dictionary mapping the state variables to their initial value,
+         either a number or the name of the parameter holding it)
+        -voltage (name of the state variable holding the membrane voltage)["V_m"]
+    """
+
+    model_name = None
+    default_params = {}
+    state_variables = {}
+    voltage = "V_m"
+
+    @abstractmethod
+    def update(self, state, params, spikes_ex, spikes_in, dt):
+        """ Abstract method to evolve the state of a slice of neurons for one timestep and return their input current.
+        state: Dictionary with views on the state arrays of the slice, to be updated in place
+        params: Dictionary with the parameter arrays of the slice
+        spikes_ex, spikes_in: Arrays with the excitatory and inhibitory spike input of the timestep
+        dt: Simulation resolution in ms
+        Needs to be implemented by subclasses. """
+        pass
+
+    def threshold(self, state, params):
+        """ Return boolean array of the neurons that spike in this timestep.
+        By default neurons spike if the membrane voltage has reached V_th. """
+        return state[self.voltage] >= params["V_th"]
+
+    def reset(self, state, params, spiked):
+        """ Reset the state of the neurons with the given indices after a spike.
+        By default the membrane voltage is set to V_reset. """
+        state[self.voltage][spiked] = params["V_reset"][spiked]
+
+    def hold(self, state, params, refractory):
+        """ Clamp the state of the neurons in the boolean array refractory during their refractory period.
+        By default the membrane voltage is held at V_reset. """
+        state[self.voltage][refractory] = params["V_reset"][refractory]
+
+
+class GenericPopulation(Population):
+    """ Array-backed population of a neuron model given as PopulationModel. In every timestep the model
+    updates the state, then neurons within their refractory period are held and all others are checked
+    against the threshold. Spiking neurons are reset and become refractory for t_ref. """
+
+    def __init__(self, network, size, params=None, name=None, record=None, model=None):
+        """ Initialize population of a PopulationModel.
+        network: Network instance the population belongs to
+        size: Number of neurons
+        params: Dictionary with the parameters of the model, each either a scalar or an array of length size
+        name: Unique name of the population
+        record: Iterable of state variables to record, "V_m" (the voltage of the model),
+            "input_current" or any other state variable of the model
+        model: PopulationModel instance
+        """
+        self.model = model
+        default_params = dict({"t_ref": 0.}, **model.default_params)
+        super().__init__(network, model.model_name, size, params, default_params=default_params, name=name, record=record)
+
+        # parameters given to the population but unknown to the model are kept as well
+        keys = set(default_params) | (set(params) if params is not None else set())
+        self.param_arrays = {key: self.get_param(key) for key in keys}
+
+        # initial state from numbers or from parameters
+        self.state = {}
+        for var, init in model.state_variables.items():
+            if isinstance(init, str):
+                self.state[var] = self.param_arrays[init].copy()
+            else:
+                self.state[var] = np.full(self.size, init, dtype=self.dtype)
+        if self.V_m is not None:
+            self.V_m[0] = self.state[model.voltage]
+
+        # traces of further state variables
+        t_len = len(self.V_m) if self.V_m is not None else int(self.t_sim/self.dt)+1
+        self.state_traces = {var: np.zeros((t_len, self.size), dtype=self.storage_dtype)
+                             for var in model.state_variables if var in self.record and var != model.voltage}
+        for var, trace in self.state_traces.items():
+            trace[0] = self.state[var]
+
+    def update_kernel(self, sl, spikes_ex, spikes_in):
+        """ Update the neurons in slice sl for one timestep and return the indices of the spiking neurons.
+        spikes_ex, spikes_in: Incoming excitatory and inhibitory spikes of the neurons in sl
+        """
+        state = {var: values[sl] for var, values in self.state.items()}
+        params = {key: values[sl] for key, values in self.param_arrays.items()}
+        refractory_steps = self.refractory_steps[sl]
+
+        input_current = self.model.update(state, params, spikes_ex, spikes_in, self.dt)
+
+        # hold refractory neurons, check the others against threshold
+        refractory = refractory_steps > 0
+        self.model.hold(state, params, refractory)
+        refractory_steps[refractory] -= 1
+        spiked = np.flatnonzero(self.model.threshold(state, params) & ~refractory)
+        refractory_steps[spiked] = self.t_ref_steps[sl][spiked]
+        self.model.reset(state, params, spiked)
+
+        t = self.network.get_timestep()
+        for var, trace in self.state_traces.items():
+            trace[t, sl] = state[var]
+        self.record_state(sl, state[self.model.voltage], input_current)
+        return spiked + sl.start
+
+    def get_external_current(self):
+        """ Return array with the external current I_e of the local neurons or None if the model has no parameter I_e. """
+        return self.param_arrays.get("I_e")
+
+    def get_state(self, var):
+        """ Return current values of the state variable var of all neurons. """
+        return self.state[var]
@@ -0,0 +1,184 @@
+import os
+import numpy as np
+
+from synapse_models.projection import Projection
+
+
+class MappedStaticProjection(Projection):
+    """ Static projection whose connectivity lives in memory-mapped files on disk, so the number of synapses
+    is only limited by disk space. Synapses are stored sorted by source neuron (compressed sparse rows):
+    only the row pointers are kept in memory, targets, weights and delays in steps are read from the files
+    when the source neurons spike. Spikes are delivered in blocks of at most block_size synapses of
+    consecutive spiking sources, rows longer than block_size are split, which bounds the memory used per step. Files are written once with
+    an external counting sort from connection blocks of any order and can be reopened by later networks
+    with the same populations. Structural plasticity is not supported. """
+
+    # structural plasticity skips the projection instead of reading all its synapses
+    supports_structural_plasticity = False
+
+    def __init__(self, network, source, target, directory, blocks=None, block_size=2 ** 20):
+        """ Initialize memory-mapped projection.
+        network: Network instance the projection belongs to
+        source: Source population
+        target: Target population
+        directory: Directory of the files of the projection
+        blocks: Iterable of (sources, targets, weights, delays) connection blocks to write into the directory, with sources
+            inside the whole source population, targets inside the local part of the target population and delays in ms;
+            If None: the files already in the directory are opened
+        block_size: Maximal number of synapses read from disk at once during spike delivery [2 ** 20]
+        """
+        # synapse arrays live on disk, so the in-memory initialization of Projection is not used
+        self.network = network
+        self.source = source
+        self.target = target
+        self.model_name = "static_synapse"
+        self.directory = directory
+        self.block_size = block_size
+        self.num_removed = 0
+
+        if blocks is not None:
+            self.write(blocks)
+        self.open()
+        self.first_index = int(self.network.allocate_synapse_indices(len(self))[0]) if len(self) > 0 else self.network.num_synapses
+        if len(self) > 0:
+            self.target.ensure_delay_capacity(int(self.delay_steps.max()))
+        self.network.register_projection(self)
+
+    def get_path(self, name):
+        """ Return path of the file with the given array name. """
+        return os.path.join(self.directory, name + ".npy")
+
+    def write(self, blocks):
+        """ Write connection blocks to the files of the projection. Blocks are first appended to temporary files
+        in the given order, then scattered into their rows chunk by chunk, keeping the order of the synapses of one source. """
+        os.makedirs(self.directory, exist_ok=True)
+        # source indices of earlier contents of the directory
+        if os.path.exists(self.get_path("sources")):
+            os.remove(self.get_path("sources"))
+        dtype = self.network.get_storage_dtype()
+        target_dtype = np.int32 if self.target.size < 2 ** 31 else np.int64
+        names = ("sources", "targets", "weights", "delay_steps")
+        dtypes = (np.int64, target_dtype, dtype, np.int32)
+        counts = np.zeros(self.source.global_size, dtype=np.int64)
+        temporary = {name: open(self.get_path(name) + ".tmp", "wb") for name in names}
+        try:
+            for sources, targets, weights, delays in blocks:
+                sources = np.asarray(sources, dtype=np.int64)
+                delay_steps = np.round(np.broadcast_to(delays, sources.shape) / self.network.get_resolution())
+                for name, values, dt in zip(names, (sources, targets, np.broadcast_to(weights, sources.shape), delay_steps), dtypes):
+                    temporary[name].write(np.ascontiguousarray(values, dtype=dt).tobytes())
+                counts += np.bincount(sources, minlength=self.source.global_size)
+        finally:
+            for f in temporary.values():
+                f.close()
+
+        indptr = np.concatenate(([0], np.cumsum(counts)))
+        np.save(self.get_path("indptr"), indptr)
+        n = int(indptr[-1])
+        unsorted = {name: np.memmap(self.get_path(name) + ".tmp", dtype=dt, mode="r", shape=(n,)) if n > 0 else np.zeros(0, dt)
+                    for name, dt in zip(names, dtypes)}
+        rows = {name: np.lib.format.open_memmap(self.get_path(name), mode="w+", dtype=dt, shape=(n,))
+                for name, dt in zip(names[1:], dtypes[1:])}
+        # next free position in the row of every source
+        cursor = indptr[:-1].copy()
+        for start in range(0, n, self.block_size):
+            sources = np.asarray(unsorted["sources"][start:start + self.block_size])
+            order = np.argsort(sources, kind="stable")
+            sorted_sources = sources[order]
+            rank = np.arange(len(sources)) - np.searchsorted(sorted_sources, sorted_sources)
+            positions = cursor[sorted_sources] + rank
+            for name in names[1:]:
+                rows[name][positions] = np.asarray(unsorted[name][start:start + self.block_size])[order]
+            cursor += np.bincount(sources, minlength=self.source.global_size)
+        for values in rows.values():
+            values.flush()
+        del unsorted, rows
+        for name in names:
+            os.remove(self.get_path(name) + ".tmp")
+
+    def open(self):
+        """ Open the files of the projection. """
+        self.indptr = np.load(self.get_path("indptr"))
+        if len(self.indptr) != self.source.global_size + 1:
+            raise ValueError("Memory-mapped projection in '" + self.directory + "' does not match the size of the source population.")
+        # static synapses are only read, so the files on disk cannot be changed by accident
+        self.targets = np.load(self.get_path("targets"), mmap_mode="r")
+        self.weights = np.load(self.get_path("weights"), mmap_mode="r")
+        self.delay_steps = np.load(self.get_path("delay_steps"), mmap_mode="r")
+        # source indices of all synapses, written to disk at the first access
+        self.source_indices = None
+
+    def __len__(self):
+        """ Return number of synapses in the projection. """
+        return int(self.indptr[-1])
+
+    @property
+    def synapse_indices(self):
+        """ Synapse indices of all synapses, the contiguous range [first_index, first_index + len(self)) in row order.
+        Expensive: every access allocates an array with one entry per synapse. """
+        return np.arange(self.first_index, self.first_index + len(self))
+
+    @property
+    def alive(self):
+        """ Synapses are never removed from memory-mapped projections, a read-only view without memory per synapse. """
+        return np.broadcast_to(True, (len(self),))
+
+    @property
+    def sources(self):
+        """ Source neuron indices of all synapses, memory-mapped from a file that is written block by block
+        from the row pointers at the first access. """
+        if len(self) == 0:
+            return np.zeros(0, dtype=np.int64)
+        if self.source_indices is None:
+            path = self.get_path("sources")
+            if not os.path.exists(path):
+                n = len(self)
+                sources = np.lib.format.open_memmap(path + ".part", mode="w+", dtype=np.int64, shape=(n,))
+                for start in range(0, n, self.block_size):
+                    positions = np.arange(start, min(start + self.block_size, n))
+                    sources[start:start + len(positions)] = np.searchsorted(self.indptr, positions, side="right") - 1
+                sources.flush()
+                del sources
+                os.replace(path + ".part", path)
+            self.source_indices = np.load(path, mmap_mode="r")
+        return self.source_indices
+
+    @property
+    def delays(self):
+        """ Delays of all synapses in ms.
+        Expensive: every access allocates an array with one entry per synapse. """
+        return self.delay_steps * self.network.get_resolution()
+
+    def remove_synapses(self, mask):
+        """ Removing synapses is not supported. """
+        if np.any(mask):
+            raise ValueError("Structural plasticity is not supported for memory-mapped projections.")
+        return 0
+
+    def add_synapses(self, sources, targets, weights, delays):
+        """ Adding synapses is not supported. """
+        raise ValueError("Structural plasticity is not supported for memory-mapped projections.")
+
+    def handle_presynaptic_spikes(self, indices):
+        """ Send spikes of all synapses whose source neuron spiked to the target population, reading blocks of
+        at most block_size synapses from disk: the rows of the spiking sources one after another, cut every block_size synapses. """
+        starts = self.indptr[indices]
+        counts = self.indptr[indices + 1] - starts
+        ends = np.cumsum(counts)
+        if len(ends) == 0 or ends[-1] == 0:
+            return
+        for lo in range(0, int(ends[-1]), self.block_size):
+            hi = min(lo + self.block_size, int(ends[-1]))
+            # spiking sources with synapses in [lo, hi), the first and last one possibly only partly
+            first = np.searchsorted(ends, lo, side="right")
+            last = np.searchsorted(ends, hi - 1, side="right") + 1
+            block_starts = starts[first:last].copy()
+            block_counts = counts[first:last].copy()
+            skipped = lo - (ends[first] - counts[first])
+            block_starts[0] += skipped
+            block_counts[0] -= skipped
+            block_counts[-1] -= ends[last - 1] - hi
+            block_ends = np.cumsum(block_counts)
+            syn = np.arange(block_ends[-1]) + np.repeat(block_starts - block_ends + block_counts, block_counts)
+            weights = self.weights[syn]
+            self.target.add_input(self.targets[syn], self.delay_steps[syn], weights, (weights <= 0).astype(np.intp))
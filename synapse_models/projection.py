@@ -0,0 +1,171 @@
+import os
+from abc import ABC as AbstractBaseClass, abstractmethod
+import numpy as np
+
+
+class Projection(AbstractBaseClass):
+    """ Abstract base class for array-backed projections, i.e. sets of synapses
+    of one model between a source and a target population. Synapses can be removed and added
+    during the simulation (structural plasticity): removed synapses are disabled at once and
+    their entries are dropped by a compaction as soon as more than compaction_threshold of all
+    entries are removed, so the cost of removal is amortized over many synapses. """
+
+    # arrays with one entry per synapse, kept aligned by sorting, compaction and growth
+    synapse_arrays = ("sources", "targets", "weights", "delays", "delay_steps", "synapse_indices", "alive")
+    # fraction of removed entries that triggers a compaction
+    compaction_threshold = 0.25
+    # whether structural plasticity may remove synapses from and add synapses to the projection
+    supports_structural_plasticity = True
+    # lookup structures built by rebuild, saved and loaded together with the synapse arrays
+    lookup_arrays = ()
+    # shortest delay in timesteps the projection supports
+    min_delay_steps = 0
+
+    def __init__(self, network, source, target, sources, targets, weights, delays, model_name):
+        """ Initialize common properties of projections.
+        network: Network instance the projection belongs to
+        source: Source population
+        target: Target population
+        sources: Array of source neuron indices inside the whole source population
+        targets: Array of target neuron indices inside the (local part of the) target population
+        weights: Initial weights, either a scalar or an array matching sources
+        delays: Delays in ms, either a scalar or an array matching sources
+        model_name: Model name of the corresponding single synapse model
+        """
+        self.network = network
+        self.source = source
+        self.target = target
+        self.model_name = model_name
+
+        for attr, values in self.init_synapse_arrays(sources, targets, weights, delays).items():
+            setattr(self, attr, values)
+        self.num_removed = 0
+
+        self.network.register_projection(self)
+        self.rebuild()
+
+    def init_synapse_arrays(self, sources, targets, weights, delays):
+        """ Return dictionary with the values of all synapse arrays of new synapses, which get new synapse indices
+        from the network. Subclasses with further synapse arrays extend the dictionary. """
+        sources = np.asarray(sources, dtype=np.int64)
+        delays = np.broadcast_to(np.asarray(delays, dtype=float), sources.shape).copy()
+        delay_steps = np.round(delays / self.network.get_resolution()).astype(np.int64)
+        if len(delay_steps) > 0:
+            self.target.ensure_delay_capacity(int(delay_steps.max()))
+        return {"sources": sources, "targets": np.asarray(targets, dtype=np.int64),
+                "weights": np.broadcast_to(np.asarray(weights, dtype=self.network.get_storage_dtype()), sources.shape).copy(),
+                "delays": delays, "delay_steps": delay_steps,
+                "synapse_indices": self.network.allocate_synapse_indices(len(sources)),
+                "alive": np.ones(len(sources), dtype=bool)}
+
+    def rebuild(self):
+        """ Rebuild lookup structures after the synapse arrays changed. Nothing to do by default. """
+        pass
+
+    def save(self, directory):
+        """ Save the synapse arrays and lookup structures as .npy files in directory, synapse indices relative to the first one. """
+        for name in self.synapse_arrays + self.lookup_arrays:
+            values = getattr(self, name)
+            if name == "synapse_indices" and len(values) > 0:
+                values = values - values.min()
+            np.save(os.path.join(directory, name + ".npy"), values)
+
+    def load(self, directory):
+        """ Replace the synapses of the empty projection by the ones saved in directory, which get new synapse indices.
+        The arrays are adopted memory-mapped copy-on-write: they are read from disk on demand and changes only stay in memory. """
+        if len(self) > 0:
+            raise ValueError("Synapses can only be loaded into an empty projection.")
+        for name in self.synapse_arrays + self.lookup_arrays:
+            setattr(self, name, np.load(os.path.join(directory, name + ".npy"), mmap_mode="c"))
+        n = len(self.sources)
+        if n > 0:
+            first = int(self.network.allocate_synapse_indices(n)[0])
+            if first != 0:
+                self.synapse_indices = self.synapse_indices + first
+            self.target.ensure_delay_capacity(int(self.delay_steps.max()))
+
+    def remove_synapses(self, mask):
+        """ Remove the synapses selected by the boolean array mask and return their number. Removed synapses
+        stop transmitting at once and are recorded by the network with their removal timestep. """
+        mask = mask & self.alive
+        n = int(np.count_nonzero(mask))
+        if n == 0:
+            return 0
+        self.network.record_removed_synapses(self.synapse_indices[mask], self.get_source_ids()[mask], self.get_target_ids()[mask],
+                                             self.get_initial_weights()[mask], self.delays[mask], self.model_name)
+        self.alive[mask] = False
+        self.disable_synapses(mask)
+        self.num_removed += n
+        if self.num_removed > self.compaction_threshold * len(self):
+            self.compact()
+        return n
+
+    def disable_synapses(self, mask):
+        """ Stop transmission of the removed synapses selected by mask until the next compaction.
+        By default their weights are set to 0. """
+        self.weights[mask] = 0.
+
+    def compact(self):
+        """ Drop the entries of removed synapses. """
+        alive = self.alive
+        for attr in self.synapse_arrays:
+            setattr(self, attr, getattr(self, attr)[alive])
+        self.num_removed = 0
+        self.rebuild()
+
+    def add_synapses(self, sources, targets, weights, delays):
+        """ Add synapses to the projection, dropping the entries of removed synapses at the same time.
+        sources: Array of source neuron indices inside the whole source population
+        targets: Array of target neuron indices inside the (local part of the) target population
+        weights, delays: Scalars or arrays matching sources
+        """
+        new = self.init_synapse_arrays(sources, targets, weights, delays)
+        alive = self.alive
+        for attr in self.synapse_arrays:
+            setattr(self, attr, np.concatenate((getattr(self, attr)[alive], new[attr])))
+        self.num_removed = 0
+        self.rebuild()
+
+    def has_params(self, params):
+        """ Return whether the synapses of the projection have the given synapse model parameters.
+        Projections without parameters only match None. """
+        return params is None
+
+    def get_num_synapses(self):
+        """ Return number of synapses in the projection that have not been removed. """
+        return len(self) - self.num_removed
+
+    def __len__(self):
+        """ Return number of synapse entries in the projection, including removed synapses not compacted yet. """
+        return len(self.sources)
+
+    def get_weights(self):
+        """ Return weights of all synapses. """
+        return self.weights
+
+    def get_initial_weights(self):
+        """ Return weights of all synapses at the start of the simulation. """
+        return self.weights
+
+    def get_delays(self):
+        """ Return delays of all synapses. """
+        return self.delays
+
+    def get_source_ids(self):
+        """ Return global ids of the source neurons of all synapses. """
+        return self.sources + self.source.first_id - self.source.offset
+
+    def get_target_ids(self):
+        """ Return global ids of the target neurons of all synapses. """
+        return self.targets + self.target.first_id
+
+    @abstractmethod
+    def handle_presynaptic_spikes(self, indices):
+        """ Abstract method to handle action potentials of the source neurons with the given indices.
+        Needs to be implemented by the subclasses. """
+        pass
+
+    def handle_postsynaptic_spikes(self, indices):
+        """ Handle action potentials of the target neurons with the given indices.
+        Ignored by default. """
+        pass
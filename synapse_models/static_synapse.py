@@ -1,8 +1,12 @@
 from synapse_models.synapse import Synapse
+from synapse_models.projection import Projection
+import numpy as np
 
 
 class StaticSynapse(Synapse):
     """ Implementiation of a static synapse. """
+
+    __slots__ = ()
     
     def __init__(self, network, source, target, weight, delay):
         """ Initialize static synapse. """
@@ -14,4 +18,49 @@ class StaticSynapse(Synapse):
 
     def handle_postsynaptic_spike(self):
         """ Postsynaptic spike is ignored. """
-        pass
\ No newline at end of file
+        pass
+
+
+class StaticProjection(Projection):
+    """ Array-backed projection of static synapses. Synapses are stored grouped by source neuron
+    (compressed sparse rows), so the synapses of the spiking neurons are found without searching and
+    all their spikes are added to the input buffers of the target with a single np.add.at. """
+
+    lookup_arrays = ("indptr", "channels")
+
+    def __init__(self, network, source, target, sources, targets, weights, delays, params=None):
+        """ Initialize static projection.
+        network: Network instance the projection belongs to
+        source: Source population
+        target: Target population
+        sources: Array of source neuron indices inside the whole source population
+        targets: Array of target neuron indices inside the (local part of the) target population
+        weights: Weights, either a scalar or an array matching sources
+        delays: Delays in ms, either a scalar or an array matching sources
+        params: Must be None or empty, static synapses have no parameters [None]
+        """
+        if params:
+            raise ValueError("static_synapse has no parameters.")
+        super().__init__(network, source, target, sources, targets, weights, delays, "static_synapse")
+
+    def rebuild(self):
+        """ Order synapses by source neuron, keeping the order of the synapses of one source, and build the row pointers:
+        the synapses of source neuron i are [indptr[i], indptr[i + 1]). """
+        order = np.argsort(self.sources, kind="stable")
+        for attr in self.synapse_arrays:
+            setattr(self, attr, getattr(self, attr)[order])
+        self.indptr = np.searchsorted(self.sources, np.arange(self.source.global_size + 1))
+        # input channel of every synapse, 0 for excitatory and 1 for inhibitory
+        self.channels = (self.weights <= 0).astype(np.intp)
+
+    def handle_presynaptic_spikes(self, indices):
+        """ Send spikes of all synapses whose source neuron spiked to the target population. """
+        if len(indices) == 1:
+            # synapses of a single source are a contiguous range
+            syn = slice(self.indptr[indices[0]], self.indptr[indices[0] + 1])
+        else:
+            starts = self.indptr[indices]
+            counts = self.indptr[indices + 1] - starts
+            ends = np.cumsum(counts)
+            syn = np.arange(ends[-1] if len(ends) > 0 else 0) + np.repeat(starts - ends + counts, counts)
+        self.target.add_input(self.targets[syn], self.delay_steps[syn], self.weights[syn], self.channels[syn])
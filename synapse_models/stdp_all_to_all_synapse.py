@@ -8,6 +8,8 @@ class PostsynapticSpikeData:
     and the trace value at the specific time
     """
 
+    __slots__ = ("ts", "potentiation_was_performed", "trace")
+
     def __init__(self, ts, post_syn_trace):
         """ Initialize data 
         ts: Timestep of the postsynaptic spike 
@@ -36,6 +38,8 @@ class PostsynapticSpikeData:
 class STDPAllToAllSynapse(Synapse):
     """ class for STDP synapse with all-to-all pairing scheme """
 
+    __slots__ = ("last_presynaptic_spike_timestep", "last_postsynaptic_spike_timestep", "postsynaptic_spikedata", "lambda_val", "tau_plus", "tau_minus", "alpha", "mu_plus", "mu_minus", "w_max", "post_syn_trace", "pre_syn_trace", "eps_time")
+
     def __init__(self, network, source, target, init_weight, delay, params=None):
         """ Initialize stdp_all_to_all_synapse 
         network: Network instance the synapse belongs to
@@ -85,10 +89,10 @@ class STDPAllToAllSynapse(Synapse):
         """ Handling of the presynaptic spike. """  
 
         # get current weight, delay of synapse in steps, 
-        # current timestep and timestep of last presynaptic spike
+        # time of the spike in timesteps (off-grid for precise spike timing) and of last presynaptic spike
         weight_start = self.weight 
         delay_steps = self.delay_steps
-        t_pre = self.network.get_timestep()
+        t_pre = self.network.get_precise_timestep()
         t_pre_last = self.last_presynaptic_spike_timestep
 
         ### POTENTIATION ############################################
@@ -133,7 +137,7 @@ class STDPAllToAllSynapse(Synapse):
             self.target_id).handle_incoming_spike(self.weight, self.delay)
 
         # update last spike
-        self.last_presynaptic_spike_timestep = self.network.get_timestep()
+        self.last_presynaptic_spike_timestep = self.network.get_precise_timestep()
 
         #update trace variable
         self.pre_syn_trace = self.pre_syn_trace * \
@@ -149,7 +153,7 @@ class STDPAllToAllSynapse(Synapse):
         """ Handling of the postsynaptic spike. """
 
         # get current timestep and update postsynaptic trace variable
-        ts = self.network.get_timestep()
+        ts = self.network.get_precise_timestep()
         self.post_syn_trace = self.post_syn_trace * \
             np.exp(self.network.get_resolution()*(self.last_postsynaptic_spike_timestep - ts)/self.tau_minus) + 1.
         
@@ -166,7 +170,7 @@ class STDPAllToAllSynapse(Synapse):
         that are no longer needed. """
         
         # get current timestep
-        t = self.network.get_timestep()
+        t = self.network.get_precise_timestep()
         # get all spikes before now - delay and grab last one
         filtered_spikes = [
             x for x in self.postsynaptic_spikedata if x.get_timestep() < t - self.delay_steps]
@@ -1,34 +1,23 @@
 from synapse_models.synapse import Synapse
+from synapse_models.projection import Projection
+from synapse_models.static_synapse import StaticProjection
 import numpy as np
 
-
-class PostsynapticSpikeData:
-    """ Small wrapper class for postsynaptic spike
-    containing the timestep and a boolean to indicate, whether
-    this postsynaptic spike has already had an impact on the weight. """
-
-    def __init__(self, ts):
-        """ Initialize data 
-        ts: Timestep of the postsynaptic spike
-        """
-        self.ts = ts
-        self.potentiation_was_performed = False
-
-    def is_potentiation_performed(self):
-        """ Return if potentiation with this postsynaptic spike has already been performed. """
-        return self.potentiation_was_performed
-
-    def set_potentiation_performed(self):
-        """ Mark potentation as performed """
-        self.potentiation_was_performed = True
-
-    def get_timestep(self):
-        """ Get timestep of the postsynaptic spike. """
-        return self.ts
+# default parameters of the synapse object and the projection
+DEFAULT_PARAMS = {"lambda": 0.01, "tau_plus": 20., "tau_minus": 20., "alpha": 1.0,
+                  "mu_plus": 1., "mu_minus": 1., "w_max": 1200.}
 
 
 class STDP_NN_SymmSnyapse(Synapse):
-    """ Class for STDP synapse with nearest neighbour pairing scheme. """
+    """ Class for STDP synapse with nearest neighbour pairing scheme. 
+    The synapse keeps a fixed-size state instead of the postsynaptic spike history:
+    a postsynaptic spike at ts reaches the synapse at ts + delay. Until then it waits in a small
+    buffer covering the delay window. Afterwards it is paired immediately with the last presynaptic 
+    spike for potentiation and only its timestep is kept for the depression at the next presynaptic spike. """
+
+    __slots__ = ("last_presynaptic_spike_timestep", "postsynaptic_spikes_in_delay_window", "last_postsynaptic_spike_timestep",
+                 "prev_postsynaptic_spike_timestep", "potentiated_weight", "lambda_val", "tau_plus", "tau_minus", "alpha", "mu_plus",
+                 "mu_minus", "w_max", "eps_time")
 
     def __init__(self, network, source, target, init_weight, delay, params=None):
         """ Initialize stdp_nn_synapse 
@@ -49,12 +38,18 @@ class STDP_NN_SymmSnyapse(Synapse):
 
         super().__init__(network, source, target, init_weight, delay)
 
-        std_params = {"lambda": 0.01, "tau_plus": 20., "tau_minus": 20., "alpha": 1.0,
-                      "mu_plus": 1., "mu_minus": 1., "w_max": 1200.}
+        std_params = dict(DEFAULT_PARAMS)
 
         self.last_presynaptic_spike_timestep = 0
 
-        self.postsynaptic_spikedata = []
+        # postsynaptic spikes that have not yet reached the synapse, at most delay / t_ref entries
+        self.postsynaptic_spikes_in_delay_window = []
+        # last two postsynaptic spikes that have reached the synapse, -1 if there is none
+        self.last_postsynaptic_spike_timestep = -1
+        self.prev_postsynaptic_spike_timestep = -1
+        # weight including the potentiation of all postsynaptic spikes that have reached
+        # the synapse, it becomes the weight of the synapse at the next presynaptic spike
+        self.potentiated_weight = self.weight
 
         if params is not None:
             std_params.update(params)
@@ -74,55 +69,45 @@ class STDP_NN_SymmSnyapse(Synapse):
     def handle_presynaptic_spike(self):
         """ Handling of the presynaptic spike. """  
 
-        # get current weight, delay of synapse in steps, 
-        # current timestep and timestep of last presynaptic spike
+        # get current weight, delay of synapse in steps and time of the spike in timesteps (off-grid for precise spike timing)
         weight_start = self.weight 
         delay_steps = self.delay_steps
-        t_pre = self.network.get_timestep()
-        t_pre_last = self.last_presynaptic_spike_timestep
+        t_pre = self.network.get_precise_timestep()
 
         ### POTENTIATION ############################################
-        # perform all postsynaptic weight potentiations
-        for post_data in self.postsynaptic_spikedata:
-            t_post = post_data.get_timestep()
-            # check if spike is in range to have an impact on the weight
-            if t_post > t_pre_last - delay_steps and t_post <= t_pre - delay_steps:
-                minus_dt = (t_pre_last - t_post - delay_steps) * \
-                    self.network.get_resolution()
-                w_norm = self.weight/self.w_max + self.lambda_val * \
-                    pow(1 - self.weight/self.w_max, self.mu_plus) * \
-                    np.exp(minus_dt / self.tau_plus)
-
-                # facilitate weight, clipping it to bounds if necessary
-                self.weight = w_norm * self.w_max if w_norm < 1 else self.w_max
-                post_data.set_potentiation_performed()
+        # perform potentiations of all postsynaptic spikes reaching the synapse until now
+        self.process_arrived_postsyn_spikes(t_pre)
 
         ### DEPRESSION ##############################################
-        # filter all items from self.postsynaptic_spiketimes that are no longer needed
-        # get all spikes till (now - delay)
-        # and grab the latest to perform weight change
-        t_post = self.filter_unnecessary_postsyn_spikes_and_get_latest_in_range()
+        # get latest postsynaptic spike strictly before (now - delay)
+        # to perform weight change
+        if self.last_postsynaptic_spike_timestep < t_pre - delay_steps:
+            t_post = self.last_postsynaptic_spike_timestep
+        else:
+            t_post = self.prev_postsynaptic_spike_timestep
         if t_post >= 0:
             # calculate minus delta t which must be negative
             minus_dt = (t_post - t_pre + delay_steps) * \
                 self.network.get_resolution()
 
-            # depression
-            w_norm = self.weight/self.w_max - self.lambda_val * self.alpha * \
-                pow(self.weight/self.w_max, self.mu_minus) * \
+            # depression, np.power gives the same results as the array operations of STDP_NN_SymmProjection
+            w_norm = self.potentiated_weight/self.w_max - self.lambda_val * self.alpha * \
+                np.power(self.potentiated_weight/self.w_max, self.mu_minus) * \
                 np.exp(minus_dt / self.tau_minus)
 
             # updating weight, clipping it to bounds if necessary
-            self.weight = w_norm * self.w_max if w_norm > 0. else 0.
+            self.potentiated_weight = w_norm * self.w_max if w_norm > 0. else 0.
 
         ##############################################################
 
+        self.weight = self.potentiated_weight
+
         # send signal to target neuron
         self.network.get_neuron_by_id(
             self.target_id).handle_incoming_spike(self.weight, self.delay)
 
         # update last spike
-        self.last_presynaptic_spike_timestep = self.network.get_timestep()
+        self.last_presynaptic_spike_timestep = t_pre
 
         # if weight has changed, call note_weight_change in order to be 
         # able to plot weight changes later
@@ -132,25 +117,233 @@ class STDP_NN_SymmSnyapse(Synapse):
     # OVERRIDE
     def handle_postsynaptic_spike(self):
         """ Handling of the postsynaptic spike. """  
+        ts = self.network.get_precise_timestep()
+        self.postsynaptic_spikes_in_delay_window.append(ts)
+        self.process_arrived_postsyn_spikes(ts)
 
-        self.postsynaptic_spikedata.append(
-            PostsynapticSpikeData(self.network.get_timestep()))
-
-    def filter_unnecessary_postsyn_spikes_and_get_latest_in_range(self):
-        """ Return latest postsynaptic spike that occured strictly before
-        current_timstep - delay and filter all postsynaptic spikes from the list
-        that are no longer needed. """
-        
-        # get current timestep
-        t = self.network.get_timestep()
-        # get all spikes before now - delay and grab last one
-        filtered_spikes = [
-            x.get_timestep() for x in self.postsynaptic_spikedata if x.get_timestep() < t - self.delay_steps]
-        if len(filtered_spikes) > 0:
-            last_postsyn_spike_before_delay = filtered_spikes[-1]
-            # remove all spikes whose potentiation have been performed and that are no longer needed
-            self.postsynaptic_spikedata = list(filter(lambda data: not (data.is_potentiation_performed() and
-                data.get_timestep() < last_postsyn_spike_before_delay), self.postsynaptic_spikedata))
-            return last_postsyn_spike_before_delay
-        else:
-            return -1
+    def process_arrived_postsyn_spikes(self, t):
+        """ Pair all postsynaptic spikes that reach the synapse until timestep t
+        with the last presynaptic spike and potentiate the weight. """
+        delay_steps = self.delay_steps
+        t_pre_last = self.last_presynaptic_spike_timestep
+        window = self.postsynaptic_spikes_in_delay_window
+        while len(window) > 0 and window[0] + delay_steps <= t:
+            t_post = window.pop(0)
+            # check if spike is in range to have an impact on the weight
+            if t_post > t_pre_last - delay_steps:
+                minus_dt = (t_pre_last - t_post - delay_steps) * \
+                    self.network.get_resolution()
+                w_norm = self.potentiated_weight/self.w_max + self.lambda_val * \
+                    np.power(1 - self.potentiated_weight/self.w_max, self.mu_plus) * \
+                    np.exp(minus_dt / self.tau_plus)
+
+                # facilitate weight, clipping it to bounds if necessary
+                self.potentiated_weight = w_norm * self.w_max if w_norm < 1 else self.w_max
+            self.prev_postsynaptic_spike_timestep = self.last_postsynaptic_spike_timestep
+            self.last_postsynaptic_spike_timestep = t_post
+
+
+def get_ranges(starts, counts):
+    """ Return concatenation of the index ranges [starts[i], starts[i] + counts[i]). """
+    ends = np.cumsum(counts)
+    return np.arange(ends[-1] if len(ends) > 0 else 0) + np.repeat(starts - ends + counts, counts)
+
+
+class STDP_NN_SymmProjection(StaticProjection):
+    """ Array-backed projection of STDP synapses with nearest neighbour pairing scheme. Every synapse evolves
+    exactly like a STDP_NN_SymmSnyapse object with the same parameters. Synapses with the same target neuron and
+    delay in steps form a group: a postsynaptic spike reaches all of them at the same time, so the last two
+    postsynaptic spikes that reached the synapses are kept once per group and one arriving spike potentiates
+    all synapses of its group with a few array operations. Postsynaptic spikes wait in a buffer until the next
+    presynaptic spikes of the projection, which first pair all spikes that have arrived until then in the order
+    of arrival and then depress the weights of all spiking synapses at once. Delays must be at least one timestep,
+    shorter delays raise ValueError; the builder creates STDP_NN_SymmSnyapse objects for them instead in single
+    process networks (see network.builder.get_projection_class). """
+
+    synapse_arrays = StaticProjection.synapse_arrays + ("initial_weights", "potentiated_weights", "last_presynaptic_steps",
+                                                        "creation_steps")
+    lookup_arrays = StaticProjection.lookup_arrays + ("group_synapses", "group_ptr", "group_targets", "group_delay_steps",
+                                                      "synapse_groups", "target_ptr", "group_keys", "last_postsynaptic_steps",
+                                                      "prev_postsynaptic_steps")
+    # with zero delay the pairing depends on the order of pre- and postsynaptic spikes within one timestep
+    min_delay_steps = 1
+
+    def __init__(self, network, source, target, sources, targets, weights, delays, params=None):
+        """ Initialize projection of stdp_nn_symm_synapse synapses.
+        network: Network instance the projection belongs to
+        source: Source population
+        target: Target population
+        sources: Array of source neuron indices inside the whole source population
+        targets: Array of target neuron indices inside the (local part of the) target population
+        weights: Initial weights, either a scalar or an array matching sources
+        delays: Delays in ms, either a scalar or an array matching sources
+        params: Dictionary with the parameters of STDP_NN_SymmSnyapse [None]
+        """
+        std_params = dict(DEFAULT_PARAMS)
+        if params is not None:
+            std_params.update(params)
+        params = std_params
+        self.params = params
+
+        self.lambda_val = params["lambda"]
+        self.tau_plus = params["tau_plus"]
+        self.tau_minus = params["tau_minus"]
+        self.alpha = params["alpha"]
+        self.mu_plus = params["mu_plus"]
+        self.mu_minus = params["mu_minus"]
+        self.w_max = params["w_max"]
+
+        # postsynaptic spikes as (timestep, target indices) that have not reached all their groups,
+        # all spikes arriving until processed_step have been paired
+        self.postsynaptic_spikes = []
+        self.processed_step = 0
+        self.group_keys = np.zeros(0, dtype=np.int64)
+
+        Projection.__init__(self, network, source, target, sources, targets, weights, delays, "stdp_nn_symm_synapse")
+
+    def init_synapse_arrays(self, sources, targets, weights, delays):
+        """ Return synapse arrays of new synapses including their plasticity state. """
+        if np.any(np.round(np.asarray(delays, dtype=float) / self.network.get_resolution()) < self.min_delay_steps):
+            raise ValueError("Delays of stdp_nn_symm_synapse projections must be at least one timestep ("
+                             + str(self.network.get_resolution()) + " ms).")
+        arrays = super().init_synapse_arrays(sources, targets, weights, delays)
+        n = len(arrays["sources"])
+        arrays["initial_weights"] = arrays["weights"].copy()
+        # weight including the potentiation of all postsynaptic spikes that have reached the synapse
+        arrays["potentiated_weights"] = arrays["weights"].astype(self.network.get_state_dtype())
+        arrays["last_presynaptic_steps"] = np.zeros(n, dtype=np.int64)
+        # synapses only see postsynaptic spikes from the timestep of their creation on
+        arrays["creation_steps"] = np.full(n, self.network.get_timestep(), dtype=np.int64)
+        return arrays
+
+    def rebuild(self):
+        """ Order synapses by source neuron and group them by target neuron and delay: the synapses of group g are
+        group_synapses[group_ptr[g]:group_ptr[g + 1]] and the groups of target neuron j are [target_ptr[j], target_ptr[j + 1]).
+        The postsynaptic state of groups that already existed is kept. """
+        super().rebuild()
+        # one integer key per synapse, groups are ordered by target neuron and delay
+        keys = self.targets * 2 ** 32 + self.delay_steps
+        self.group_synapses = np.argsort(keys, kind="stable")
+        sorted_keys = keys[self.group_synapses]
+        first = np.flatnonzero(np.diff(sorted_keys, prepend=-1))
+        self.group_ptr = np.append(first, len(keys))
+        group_keys = sorted_keys[first]
+        self.group_targets = group_keys // 2 ** 32
+        self.group_delay_steps = group_keys % 2 ** 32
+        self.synapse_groups = np.empty(len(keys), dtype=np.int64)
+        self.synapse_groups[self.group_synapses] = np.repeat(np.arange(len(group_keys)), np.diff(self.group_ptr))
+        self.target_ptr = np.searchsorted(self.group_targets, np.arange(self.target.size + 1))
+        self.max_delay_steps = int(self.delay_steps.max()) if len(keys) > 0 else 0
+
+        # last and previous postsynaptic spike timestep that reached each group, -1 if there is none
+        last = np.full(len(group_keys), -1, dtype=np.int64)
+        prev = np.full(len(group_keys), -1, dtype=np.int64)
+        if len(self.group_keys) > 0:
+            pos = np.minimum(np.searchsorted(self.group_keys, group_keys), len(self.group_keys) - 1)
+            found = self.group_keys[pos] == group_keys
+            last[found] = self.last_postsynaptic_steps[pos[found]]
+            prev[found] = self.prev_postsynaptic_steps[pos[found]]
+        self.group_keys = group_keys
+        self.last_postsynaptic_steps = last
+        self.prev_postsynaptic_steps = prev
+
+    def load(self, directory):
+        """ Replace the synapses of the empty projection by the ones saved in directory. """
+        super().load(directory)
+        self.max_delay_steps = int(self.delay_steps.max()) if len(self) > 0 else 0
+
+    def get_initial_weights(self):
+        """ Return weights of all synapses at their creation. """
+        return self.initial_weights
+
+    def has_params(self, params):
+        """ Return whether the synapses of the projection have the given parameters, missing ones taking their defaults. """
+        std_params = dict(DEFAULT_PARAMS)
+        if params is not None:
+            std_params.update(params)
+        return std_params == self.params
+
+    def handle_presynaptic_spikes(self, indices):
+        """ Potentiate the weights with all postsynaptic spikes that have arrived, depress the weights of all synapses whose
+        source neuron spiked with their nearest postsynaptic spike and send their spikes to the target population. """
+        t_pre = self.network.get_timestep()
+        self.process_postsynaptic_spikes(t_pre)
+
+        starts = self.indptr[indices]
+        syn = get_ranges(starts, self.indptr[indices + 1] - starts)
+        if self.num_removed > 0:
+            syn = syn[self.alive[syn]]
+        if len(syn) == 0:
+            return
+        delay_steps = self.delay_steps[syn]
+        groups = self.synapse_groups[syn]
+        potentiated = self.potentiated_weights[syn]
+
+        # latest postsynaptic spike strictly before (now - delay)
+        last = self.last_postsynaptic_steps[groups]
+        t_post = np.where(last < t_pre - delay_steps, last, self.prev_postsynaptic_steps[groups])
+        depressed = t_post >= self.creation_steps[syn]
+        minus_dt = (t_post - t_pre + delay_steps) * self.network.get_resolution()
+        w_norm = potentiated/self.w_max - self.lambda_val * self.alpha * \
+            np.power(potentiated/self.w_max, self.mu_minus) * np.exp(minus_dt / self.tau_minus)
+        # updating weights, clipping them to bounds if necessary
+        potentiated = np.where(depressed, np.where(w_norm > 0., w_norm * self.w_max, 0.), potentiated)
+        self.potentiated_weights[syn] = potentiated
+
+        weights = potentiated.astype(self.weights.dtype)
+        changed = weights != self.weights[syn]
+        self.weights[syn] = weights
+        self.last_presynaptic_steps[syn] = t_pre
+        if np.any(changed):
+            self.network.weight_events.record_batch(t_pre, self.synapse_indices[syn[changed]], weights[changed])
+
+        self.target.add_input(self.targets[syn], delay_steps, weights, (weights <= 0).astype(np.intp))
+
+    def handle_postsynaptic_spikes(self, indices):
+        """ Store the postsynaptic spikes of the target neurons with the given indices until they reach their synapses. """
+        self.postsynaptic_spikes.append((self.network.get_timestep(), indices))
+
+    def process_postsynaptic_spikes(self, t):
+        """ Pair all postsynaptic spikes that reach their groups after processed_step and until timestep t with the last
+        presynaptic spikes of the synapses, in the order of arrival. """
+        if len(self.postsynaptic_spikes) == 0:
+            return
+        steps = np.concatenate([np.full(len(targets), step) for step, targets in self.postsynaptic_spikes])
+        targets = np.concatenate([targets for _, targets in self.postsynaptic_spikes])
+        # every postsynaptic spike reaches all groups of its target neuron
+        starts = self.target_ptr[targets]
+        counts = self.target_ptr[targets + 1] - starts
+        groups = get_ranges(starts, counts)
+        post_steps = np.repeat(steps, counts)
+        arrivals = post_steps + self.group_delay_steps[groups]
+        due = np.flatnonzero((arrivals > self.processed_step) & (arrivals <= t))
+        due = due[np.argsort(arrivals[due], kind="stable")]
+        # a group gets at most one spike per arrival timestep, so all spikes arriving in the same timestep are paired at once
+        bounds = np.flatnonzero(np.diff(arrivals[due], prepend=-1, append=t + 1))
+        for first, last in zip(bounds[:-1], bounds[1:]):
+            self.potentiate(groups[due[first:last]], post_steps[due[first:last]])
+
+        self.processed_step = t
+        self.postsynaptic_spikes = [(step, targets) for step, targets in self.postsynaptic_spikes
+                                    if step + self.max_delay_steps > t]
+
+    def potentiate(self, groups, post_steps):
+        """ Potentiate the weights of all synapses of the given groups, which are reached by postsynaptic spikes
+        of the given timesteps, and make these spikes the last postsynaptic spikes of the groups. """
+        counts = self.group_ptr[groups + 1] - self.group_ptr[groups]
+        syn = self.group_synapses[get_ranges(self.group_ptr[groups], counts)]
+        t_post = np.repeat(post_steps, counts)
+        delay_steps = self.delay_steps[syn]
+        t_pre_last = self.last_presynaptic_steps[syn]
+        potentiated = self.potentiated_weights[syn]
+
+        # check if spike is in range to have an impact on the weight
+        in_range = (t_post > t_pre_last - delay_steps) & (t_post >= self.creation_steps[syn])
+        minus_dt = (t_pre_last - t_post - delay_steps) * self.network.get_resolution()
+        w_norm = potentiated/self.w_max + self.lambda_val * \
+            np.power(1 - potentiated/self.w_max, self.mu_plus) * np.exp(minus_dt / self.tau_plus)
+        # facilitate weights, clipping them to bounds if necessary
+        self.potentiated_weights[syn] = np.where(in_range, np.where(w_norm < 1, w_norm * self.w_max, self.w_max), potentiated)
+
+        self.prev_postsynaptic_steps[groups] = self.last_postsynaptic_steps[groups]
+        self.last_postsynaptic_steps[groups] = post_steps
@@ -1,10 +1,10 @@
 from abc import ABC as AbstractBaseClass, abstractmethod
-import matplotlib.pyplot as plt
-import numpy as np
 
 
 class Synapse(AbstractBaseClass):
     """ Abstract base class for synapses. """
+
+    __slots__ = ("network", "source_id", "target_id", "weight", "delay", "delay_steps", "index", "initial_weight")
     
     def __init__(self, network, source, target, weight, delay):
         """ Initialize commpon properties of synapses.
@@ -30,8 +30,7 @@ class Synapse(AbstractBaseClass):
         self.delay = delay
         self.delay_steps = int(round(self.delay / self.network.get_resolution()))
 
-        self.weight_changes = [self.weight]
-        self.weight_change_times = [0]
+        self.initial_weight = weight
         
         self.network.register_synapse(self)
         
@@ -48,29 +47,18 @@ class Synapse(AbstractBaseClass):
         return self.source_id
     
     def note_weight_change(self):
-        """ Save new weight to be ablte ot plot weight history """
-        self.weight_changes.append(self.weight)
-        self.weight_change_times.append(self.network.get_timestep())
+        """ Save new weight in the weight event buffer of the network to be able to plot weight history """
+        self.network.weight_events.record(self.network.get_timestep(), self.index, self.weight)
+
+    def get_weight_history(self):
+        """ Return timesteps and weights of all weight changes, starting with the initial weight at timestep 0. """
+        return self.network.weight_events.history(self.index, self.initial_weight)
 
     def plot_weight_history(self, title = None):
         """ Plot weight history """
-        if title is None:
-            title = "Synaptic weight history"
-
-        self.weight_change_times.append(int(round(self.network.get_simulation_duration() / self.network.get_resolution(), 0)))
-
-        weight_lists = [[self.weight_changes[i]]*(self.weight_change_times[i+1]-self.weight_change_times[i]) for i in range(len(self.weight_changes))]
-        weights = []
-        for l in weight_lists:
-            weights += l
-
-        fig, ax = plt.subplots()
-        fig.suptitle(title)
-        ax.set_xlabel("t [ms]", fontsize=14)
-        ax.plot(np.arange(0, self.network.get_simulation_duration(), self.network.get_resolution()), weights, linewidth=1)
-        ax.set_ylabel("w", fontsize=14)
-
-        plt.show()
+        # matplotlib is loaded lazily with the plotting module
+        from network.plotting import plot_weight_history
+        plot_weight_history(self, title)
 
     def get_target_id(self):
         """ Return id of target neuron. """
@@ -0,0 +1,49 @@
+import time
+import numpy as np
+from network import analysis
+
+dt = 0.1
+rng = np.random.default_rng(0)
+
+# small population of Poisson trains compared with loops over the neurons
+num_neurons, num_steps = 50, 20000
+spiking = rng.random((num_steps, num_neurons)) < 20. * dt / 1000.
+steps, indices = np.nonzero(spiking)
+steps = steps + 1
+trains = [steps[indices == i] for i in range(num_neurons)]
+
+counts = analysis.bin_spikes(steps, indices, num_neurons, dt, 50., t_stop=num_steps * dt)
+loop_counts = np.array([[np.count_nonzero((train > b * 500) & (train <= (b + 1) * 500)) for train in trains] for b in range(40)])
+print("binned counts match: ", np.array_equal(counts, loop_counts))
+
+mean, cv = analysis.isi_statistics(steps, indices, num_neurons, dt)
+loop_cv = np.array([np.std(np.diff(train)) / np.mean(np.diff(train)) for train in trains])
+print("CV of ISIs matches: ", np.allclose(cv, loop_cv), "mean CV: ", np.nanmean(cv))
+
+lags, corr = analysis.correlogram(trains[0], trains[1], dt, 1., 20., t_stop=num_steps * dt)
+bins_a, bins_b = (trains[0] - 1) // 10, (trains[1] - 1) // 10
+loop_corr = np.array([np.sum(bins_b[None, :] - bins_a[:, None] == lag) for lag in range(-20, 21)])
+print("correlogram matches: ", np.array_equal(corr, loop_corr))
+pairs = np.array([[0, 1], [1, 0], [2, 3], [0, 0]])
+lags, pair_corr = analysis.pairwise_correlograms(steps, indices, pairs, dt, 1., 20., t_stop=num_steps * dt, chunk_size=5000)
+print("pairwise correlograms match: ", np.array_equal(pair_corr[0], loop_corr) and np.array_equal(pair_corr[1], loop_corr[::-1]))
+
+sources, targets = rng.integers(0, num_neurons, 200), rng.integers(0, num_neurons, 200)
+causal, acausal = analysis.stdp_pairing(steps, indices, steps, indices, sources, targets, dt, 20., chunk_size=100)
+diffs = [trains[t][None, :] - trains[s][:, None] for s, t in zip(sources, targets)]
+print("STDP pairing matches: ", np.array_equal(causal, [np.sum((d > 0) & (d <= 200)) for d in diffs]) and
+      np.array_equal(acausal, [np.sum((d <= 0) & (d > -200)) for d in diffs]))
+
+# 100k neurons at 5 Hz for 10 s
+num_neurons, num_steps = 100000, 100000
+steps = rng.integers(1, num_steps + 1, 5 * 10 * num_neurons)
+indices = rng.integers(0, num_neurons, len(steps))
+t = time.perf_counter()
+rates = analysis.firing_rates(steps, indices, num_neurons, dt, t_stop=num_steps * dt)
+times, population = analysis.population_rate(steps, num_neurons, dt, 10., t_stop=num_steps * dt)
+cv = analysis.cv_isi(steps, indices, num_neurons, dt)
+lags, pair_corr = analysis.pairwise_correlograms(steps, indices, rng.integers(0, num_neurons, (2000, 2)), dt, 1., 50.)
+causal, acausal = analysis.stdp_pairing(steps, indices, steps, indices, rng.integers(0, num_neurons, 10 ** 5),
+                                        rng.integers(0, num_neurons, 10 ** 5), dt, 20.)
+print("analysis of 100k neurons with 5e6 spikes, 2000 correlograms and 1e5 synapses: ", time.perf_counter() - t, "s")
+print("mean rate: ", rates.mean(), "Hz, mean CV: ", np.nanmean(cv), "causal pairs per synapse: ", causal.mean())
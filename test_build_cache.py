@@ -0,0 +1,83 @@
+import shutil
+import tempfile
+import time
+import numpy as np
+from network.builder import build_network
+from network.build_cache import BuildCache
+from network.connectivity import export_connections
+from network.distributed import run_local
+
+directory = tempfile.mkdtemp()
+
+spec = {
+    "sim_params": {"t_sim": 100., "dt": 0.1},
+    "populations": {
+        "input": {"model": "poisson_generator", "size": 2000, "params": {"rate": 20.}},
+        "output": {"model": "lif_psc_exp_exact", "size": 5000, "record": ["V_m"]},
+    },
+    "projections": [{"source": "input", "target": "output", "connectivity": {"rule": "fixed_indegree", "indegree": 200},
+                     "weight": {"distribution": "normal", "mean": 20., "std": 20.},
+                     "delay": {"distribution": "uniform", "low": 0.5, "high": 3.}}],
+}
+
+
+def build(spec, cache=None):
+    t = time.perf_counter()
+    net = build_network(spec, cache=cache)
+    return net, time.perf_counter() - t
+
+
+def simulate_distributed(transport):
+    """ Build the local part of the network with the cache, simulate it and return the spikes of population output. """
+    net = build_network(spec, transport, cache=directory + "/distributed")
+    net.simulate()
+    return net.gather_spikes("output")
+
+
+if __name__ == "__main__":
+    uncached, uncached_time = build(spec)
+    cache = BuildCache(directory + "/serial")
+    first, first_time = build(spec, cache)
+    second, second_time = build(spec, cache)
+    print("build time without cache: ", uncached_time, "s, first build: ", first_time, "s, second build: ", second_time, "s")
+    print("hits: ", cache.num_hits, "misses: ", cache.num_misses, "cache size: ", cache.get_size() // 2 ** 20, "MB")
+    a, b = export_connections(uncached), export_connections(second)
+    print("connectivity identical: ", all(np.array_equal(a[key], b[key]) for key in ("source_ids", "target_ids", "weights", "delays")))
+    uncached.simulate()
+    second.simulate()
+    print("V_m identical: ", np.array_equal(uncached.get_population("output").V_m, second.get_population("output").V_m))
+
+    # a different simulation time uses the same entry, a different seed needs a new one
+    build(dict(spec, sim_params={"t_sim": 50., "dt": 0.1}), cache)
+    build(dict(spec, sim_params={"t_sim": 100., "dt": 0.1, "seed": 1}), cache)
+    print("hits: ", cache.num_hits, "misses: ", cache.num_misses, "entries: ", len(cache.get_entries()))
+
+    # least recently used entries are evicted when the cache is full, here with room for two entries
+    small = BuildCache(directory + "/small", max_size=int(2.5 * cache.get_size() / 2))
+    for seed in (0, 1, 0, 2):
+        build(dict(spec, sim_params={"t_sim": 100., "dt": 0.1, "seed": seed}), small)
+    print("hits: ", small.num_hits, "misses: ", small.num_misses, "entries after 4 builds with seeds 0, 1, 0, 2: ",
+          len(small.get_entries()), "size within limit: ", small.get_size() <= small.max_size)
+    build(spec, small)
+    print("seed 0 still cached: ", small.num_hits == 2)
+
+    # plastic projections adopt their synapse groups from the cache as well
+    plastic_spec = dict(spec, projections=[dict(spec["projections"][0], model="stdp_nn_symm_synapse",
+                                                weight={"distribution": "uniform", "low": 10., "high": 40.},
+                                                params={"w_max": 100., "lambda": 0.05})])
+    plastic_cache = BuildCache(directory + "/plastic")
+    nets = [build(plastic_spec, cache)[0] for cache in (None, plastic_cache, plastic_cache)]
+    for net in nets:
+        net.simulate()
+    plastic = [net.projection_dict_by_sources["input"][0] for net in nets]
+    print("plastic hits: ", plastic_cache.num_hits, "V_m identical: ",
+          all(np.array_equal(nets[0].get_population("output").V_m, net.get_population("output").V_m) for net in nets[1:]),
+          "weights identical: ", all(np.array_equal(plastic[0].get_weights(), proj.get_weights()) for proj in plastic[1:]))
+
+    steps, indices = uncached.get_population("output").get_spikes()
+    order = np.lexsort((indices, steps))
+    for run in ("first", "second"):
+        dist_steps, dist_indices = run_local(simulate_distributed, 2)[0]
+        print(run, "run on 2 ranks identical spikes: ", np.array_equal(steps[order], dist_steps) and
+              np.array_equal(indices[order], dist_indices))
+    shutil.rmtree(directory)
@@ -0,0 +1,75 @@
+import asyncio
+import numpy as np
+from network.builder import build_network
+from network.closed_loop import ClosedLoop
+
+spec = {
+    "sim_params": {"t_sim": 1000., "dt": 0.1},
+    "populations": {
+        "input": {"model": "poisson_generator", "size": 200, "params": {"rate": 50.}},
+        "output": {"model": "lif_psc_exp_exact", "size": 100, "record": ["V_m"]},
+    },
+    "projections": [{"source": "input", "target": "output", "connectivity": {"rule": "fixed_indegree", "indegree": 20},
+                     "weight": 80., "delay": 1.}],
+}
+
+
+async def stream(closed_loop):
+    """ Run the closed loop without injections and collect the streamed spikes of the output population. """
+    queue = closed_loop.subscribe(["output"])
+    consumer = asyncio.ensure_future(collect(queue))
+    async for timestep in closed_loop.run():
+        pass
+    return await consumer
+
+
+async def collect(queue):
+    chunks = []
+    while True:
+        spikes = await queue.get()
+        if spikes is None:
+            return chunks
+        chunks.append(spikes["output"])
+
+
+# streamed spikes of the stepping API match a plain simulation
+net = build_network(spec)
+net.simulate()
+steps, indices = net.get_population("output").get_spikes()
+chunks = asyncio.run(stream(ClosedLoop(build_network(spec), interval=25, in_thread=True)))
+print("streamed chunks: ", len(chunks), "identical spikes: ", np.array_equal(np.concatenate([c[0] for c in chunks]), steps)
+      and np.array_equal(np.concatenate([c[1] for c in chunks]), indices))
+
+# an injected spike arrives in the first timestep of the next chunk
+net = build_network(dict(spec, projections=[]))
+closed_loop = ClosedLoop(net, interval=50)
+
+
+async def inject_once():
+    async for timestep in closed_loop.run():
+        if timestep == 51:
+            closed_loop.inject_spikes("output", [0], 500.)
+
+asyncio.run(inject_once())
+V_m = net.get_population("output").V_m[:, 0]
+print("first timestep with input: ", np.flatnonzero(V_m > V_m[0])[0])
+
+# controller adjusting the external current every 10 ms to keep the output at 20 Hz
+net = build_network(spec)
+closed_loop = ClosedLoop(net, interval=100)
+queue = closed_loop.subscribe(["output"])
+
+
+async def control(target_rate=20., gain=2.):
+    current = 0.
+    rates = []
+    async for timestep in closed_loop.run():
+        steps, indices = (await queue.get())["output"]
+        rate = len(indices) / (100 * 0.01)
+        current += gain * (target_rate - rate)
+        closed_loop.inject_current("output", current)
+        rates.append(rate)
+    return rates, current
+
+rates, current = asyncio.run(control())
+print("rate in the first 100 ms: ", np.mean(rates[:10]), "Hz, in the last 500 ms: ", np.mean(rates[-50:]), "Hz, final current: ", current, "pA")
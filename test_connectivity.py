@@ -0,0 +1,55 @@
+import time
+import numpy as np
+from network.builder import build_network
+from network.connectivity import export_connections, import_connections, to_sparse, from_sparse
+
+# plastic network with populations, STDP synapse objects, a static and an STDP projection
+populations = {
+    "input": {"model": "lif_psc_exp_exact", "size": 4, "params": {"I_e": [400., 700., 600., 800.]}},
+    "output": {"model": "lif_psc_exp_exact", "size": 2, "params": {"I_e": 600.}},
+}
+spec = {
+    "sim_params": {"t_sim": 1000.},
+    "populations": populations,
+    "projections": [
+        {"source": "input", "target": "output", "model": "stdp_all_to_all_synapse", "weight": 500.,
+         "delay": {"distribution": "uniform", "low": 0.5, "high": 2.5}, "params": {"w_max": 1400}},
+        {"source": "input", "target": "output", "weight": 100., "delay": 1.5},
+        {"source": "input", "target": "output", "model": "stdp_nn_symm_synapse", "weight": 300.,
+         "delay": {"distribution": "uniform", "low": 0.5, "high": 2.5}, "params": {"w_max": 1000}},
+    ],
+}
+net = build_network(spec)
+net.simulate()
+connections = export_connections(net)
+synapses = [syn for syns in net.synapse_dict_by_sources.values() for syn in syns]
+print("models: ", connections["model_names"])
+print("weights match objects: ", all(connections["weights"][syn.index] == syn.weight for syn in synapses))
+print("delays match objects: ", all(connections["delays"][syn.index] == syn.delay for syn in synapses))
+
+# restore all synapses in a network with the same populations
+restored = build_network({"sim_params": {"t_sim": 1000.}, "populations": populations})
+import_connections(restored, connections, params={"stdp_all_to_all_synapse": {"w_max": 1400}, "stdp_nn_symm_synapse": {"w_max": 1000}})
+restored_connections = export_connections(restored)
+print("restored identical: ", all(np.array_equal(connections[key], restored_connections[key])
+                                   for key in ("source_ids", "target_ids", "weights", "delays", "models")),
+      "STDP projection restored: ", [proj.model_name for projs in restored.projection_dict_by_sources.values() for proj in projs])
+
+matrix = to_sparse(connections, net.num_neurons).tocsr()
+print("dense weight matrix matches: ", np.allclose(matrix.toarray(), net.get_weight_matrix(net.get_timestep())))
+
+# round trip of one million synapses through scipy.sparse
+spec = {
+    "sim_params": {"t_sim": 10.},
+    "populations": {"a": {"model": "lif_psc_exp_exact", "size": 1000}, "b": {"model": "lif_psc_exp_exact", "size": 1000}},
+    "projections": [{"source": "a", "target": "b", "weight": {"distribution": "normal", "mean": 0., "std": 10.}, "delay": 2.}],
+}
+net = build_network(spec)
+t = time.perf_counter()
+matrix = to_sparse(export_connections(net), net.num_neurons)
+print("export of 1e6 synapses: ", time.perf_counter() - t, "s")
+restored = build_network(dict(spec, projections=[]))
+t = time.perf_counter()
+import_connections(restored, from_sparse(matrix, delays=2.))
+print("import of 1e6 synapses: ", time.perf_counter() - t, "s")
+print("weights identical: ", np.array_equal(restored.get_synapse_table()[2], net.get_synapse_table()[2]))
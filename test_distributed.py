@@ -0,0 +1,57 @@
+import time
+import numpy as np
+from network.builder import build_network
+from network.distributed import run_local
+
+N = 200
+
+# recurrent network driven by an input population with different currents
+spec = {
+    "sim_params": {"t_sim": 200.},
+    "populations": {
+        "input": {"model": "lif_psc_exp_exact", "size": 50, "params": {"I_e": list(np.linspace(380., 800., 50))}},
+        "exc": {"model": "lif_psc_exp_exact", "size": N, "params": {"I_e": list(np.linspace(200., 370., N))}},
+    },
+    "projections": [
+        {"source": "input", "target": "exc", "connectivity": {"rule": "explicit", "sources": list(np.arange(N) % 50),
+                                                              "targets": list(range(N))}, "weight": 900., "delay": 1.0},
+        {"source": "exc", "target": "exc", "weight": list(np.linspace(-20., 30., N * N)), "delay": 1.5},
+    ],
+}
+
+
+def simulate(transport):
+    """ Build and simulate the local part of the network and return the spikes of population exc. """
+    net = build_network(spec, transport)
+    net.simulate()
+    return net.gather_spikes("exc")
+
+
+def simulate_failing(transport):
+    """ Simulate the network but raise an exception on rank 1 in the middle of the simulation. """
+    net = build_network(spec, transport)
+    if transport.rank == 1:
+        net.set_progress_callback(lambda report: 1 / 0, 1000)
+    net.simulate()
+
+
+if __name__ == "__main__":
+    net = build_network(spec)
+    net.simulate()
+    steps, indices = net.get_population("exc").get_spikes()
+    order = np.lexsort((indices, steps))
+    steps, indices = steps[order], indices[order]
+    print("spikes in single process: ", len(steps))
+
+    for size in (2, 3):
+        dist_steps, dist_indices = run_local(simulate, size)[0]
+        print(size, "ranks: ", len(dist_steps), "spikes, identical:",
+              np.array_equal(steps, dist_steps) and np.array_equal(indices, dist_indices))
+
+    # a failing rank stops all ranks instead of leaving the others waiting in allgather
+    start = time.perf_counter()
+    try:
+        run_local(simulate_failing, 3)
+    except RuntimeError as error:
+        print("failing rank raised after", time.perf_counter() - start, "s:", str(error).splitlines()[0],
+              str(error).splitlines()[-1])
@@ -0,0 +1,42 @@
+import time
+import numpy as np
+from network.network import Network
+from network.builder import build_network
+from synapse_models.static_synapse import StaticSynapse
+from neuron_models.leaky_integrate_and_fire import lif_neuron_euler, lif_neuron_euler_adaptive, lif_neuron_matrix
+
+# configuration of test_euler_vs_exact.py with the Euler model at dt and dt / 10 and the adaptive Euler model at dt
+def simulate(neuron_class, dt, params=None):
+    """ Simulate the two neuron network and return the output neuron and the spike times of both neurons. """
+    params = {} if params is None else params
+    net = Network(sim_params={"t_sim": 100., "dt": dt})
+    input_neuron = neuron_class(net, dict(params, I_e=900.))
+    output_neuron = neuron_class(net, dict(params, I_e=300.))
+    StaticSynapse(net, input_neuron, output_neuron, 700., 1.5)
+    spike_times = []
+    handle_spike = net.handle_spike
+    net.handle_spike = lambda neuron, offset=0.: (spike_times.append(round(net.get_timestep() * dt, 2)), handle_spike(neuron, offset))
+    net.simulate()
+    return output_neuron, spike_times
+
+exact, exact_spikes = simulate(lif_neuron_matrix, 0.1)
+for neuron_class, dt in ((lif_neuron_euler, 0.1), (lif_neuron_euler, 0.01), (lif_neuron_euler_adaptive, 0.1)):
+    neuron, spikes = simulate(neuron_class, dt)
+    step = int(round(0.1 / dt))
+    print(neuron.model_name, "dt =", dt, "mean diff to exact: ", np.mean(np.abs(neuron.V_m[::step] - exact.V_m)),
+          "same spike times: ", spikes == exact_spikes)
+print("substeps per timestep of the adaptive model: ", neuron.num_substeps / 1000)
+
+# population of neurons with different input currents, adaptive model at dt against Euler model at dt / 10
+N = 10000
+for model, dt in (("lif_psc_exp_euler", 0.01), ("lif_psc_exp_euler_adaptive", 0.1), ("lif_psc_exp_exact", 0.1)):
+    net = build_network({"sim_params": {"t_sim": 100., "dt": dt},
+                         "populations": {"pop": {"model": model, "size": N, "params": {"I_e": list(np.linspace(300., 1000., N))}}}})
+    start = time.perf_counter()
+    net.simulate()
+    steps, indices = net.get_population("pop").get_spikes()
+    print(model, "dt =", dt, "simulation time: ", time.perf_counter() - start, "s, spikes: ", len(steps))
+    if model == "lif_psc_exp_exact":
+        codes = np.setxor1d(steps * N + indices, adaptive_steps * N + adaptive_indices)
+        print("spikes of the adaptive model differing from the exact model: ", len(codes))
+    adaptive_steps, adaptive_indices = steps, indices
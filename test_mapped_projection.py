@@ -0,0 +1,88 @@
+import shutil
+import tempfile
+import time
+import numpy as np
+from network.builder import build_network
+from network.connectivity import export_connections
+from network.distributed import run_local
+from network.progress import get_memory_usage
+
+directory = tempfile.mkdtemp()
+
+spec = {
+    "sim_params": {"t_sim": 200., "dt": 0.1},
+    "populations": {
+        "input": {"model": "poisson_generator", "size": 2000, "params": {"rate": 20.}},
+        "output": {"model": "lif_psc_exp_exact", "size": 5000, "record": ["V_m"]},
+    },
+    "projections": [{"source": "input", "target": "output", "connectivity": {"rule": "fixed_indegree", "indegree": 200},
+                     "weight": {"distribution": "normal", "mean": 20., "std": 20.},
+                     "delay": {"distribution": "uniform", "low": 0.5, "high": 3.}}],
+}
+
+
+def mapped(spec, path):
+    """ Return spec with all projections stored in memory-mapped files below path. """
+    return dict(spec, projections=[dict(proj, directory=path) for proj in spec["projections"]])
+
+
+def simulate(spec, transport=None):
+    net = build_network(spec, transport)
+    t = time.perf_counter()
+    net.simulate()
+    return net, time.perf_counter() - t
+
+
+def simulate_distributed(transport):
+    """ Build and simulate the local part of the memory-mapped network and return the spikes of population output. """
+    net, _ = simulate(mapped(spec, directory + "/distributed"), transport)
+    return net.gather_spikes("output")
+
+
+if __name__ == "__main__":
+    # memory-mapped connectivity gives the same dynamics as connectivity in memory
+    in_memory, memory_time = simulate(spec)
+    on_disk, disk_time = simulate(mapped(spec, directory + "/serial"))
+    V_m = in_memory.get_population("output").V_m
+    print("synapses: ", len(on_disk.projection_dict_by_sources["input"][0]),
+          "simulation time in memory: ", memory_time, "s, memory-mapped: ", disk_time, "s")
+    print("V_m identical: ", np.array_equal(V_m, on_disk.get_population("output").V_m))
+    a, b = export_connections(in_memory), export_connections(on_disk)
+    order = np.lexsort((a["target_ids"], a["source_ids"]))
+    # delays are stored in timesteps
+    a["delays"] = np.round(a["delays"] / 0.1) * 0.1
+    print("exported connectivity identical: ", all(np.array_equal(a[key][order], b[key])
+                                                   for key in ("source_ids", "target_ids", "weights", "delays")))
+
+    proj = on_disk.projection_dict_by_sources["input"][0]
+    print("source indices match row pointers: ", np.array_equal(proj.sources, np.repeat(np.arange(2000), np.diff(proj.indptr))),
+          "files read-only: ", not proj.weights.flags.writeable and not proj.targets.flags.writeable)
+
+    # delivery in blocks of at most 1000 synapses and of 128 synapses, which splits the rows of about 500 synapses
+    for block_size in (1000, 128):
+        small_blocks = build_network(mapped(spec, directory + "/blocks_" + str(block_size)))
+        small_blocks.projection_dict_by_sources["input"][0].block_size = block_size
+        target = small_blocks.get_population("output")
+        add_input, sizes = target.add_input, []
+        target.add_input = lambda targets, *args: (sizes.append(len(targets)), add_input(targets, *args))
+        small_blocks.simulate()
+        print("V_m identical with blocks of", block_size, "synapses: ", np.array_equal(V_m, target.V_m),
+              "largest block: ", max(sizes), "synapses delivered: ", sum(sizes))
+
+    steps, indices = in_memory.get_population("output").get_spikes()
+    order = np.lexsort((indices, steps))
+    dist_steps, dist_indices = run_local(simulate_distributed, 2)[0]
+    print("2 ranks identical spikes: ", np.array_equal(steps[order], dist_steps) and np.array_equal(indices[order], dist_indices))
+
+    # resident memory of 1e7 synapses memory-mapped and in memory
+    large = dict(spec, sim_params={"t_sim": 10., "dt": 0.1}, populations={
+        "input": {"model": "poisson_generator", "size": 10000, "params": {"rate": 20.}},
+        "output": {"model": "lif_psc_exp_exact", "size": 10000}})
+    large["projections"] = [dict(spec["projections"][0], connectivity={"rule": "fixed_indegree", "indegree": 1000})]
+    for name, large_spec in (("memory-mapped", mapped(large, directory + "/large")), ("in memory", large)):
+        before = get_memory_usage()
+        net, sim_time = simulate(large_spec)
+        print(name, "1e7 synapses: resident memory increase ", (get_memory_usage() - before) // 2 ** 20, "MB, simulation time ",
+              sim_time, "s")
+        del net
+    shutil.rmtree(directory)
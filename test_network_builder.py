@@ -0,0 +1,86 @@
+import time
+import numpy as np
+from network.network import Network
+from network.builder import build_network
+from synapse_models.static_synapse import StaticSynapse
+from synapse_models.stdp_nn_symm_synapse import STDP_NN_SymmSnyapse
+from neuron_models.leaky_integrate_and_fire import lif_neuron_matrix
+
+# configuration of test_lif_exp_static.py, once declarative and once with single objects
+spec = {
+    "sim_params": {"t_sim": 100.},
+    "populations": {
+        "input": {"model": "lif_psc_exp_exact", "size": 10, "params": {"I_e": [600. - (i % 5) * 100 for i in range(10)]}},
+        "output": {"model": "lif_psc_exp_exact", "size": 1, "record": ["V_m"]},
+    },
+    "projections": [
+        {"source": "input", "target": "output", "model": "static_synapse", "weight": 700., "delay": 2.5},
+    ],
+}
+net = build_network(spec)
+net.simulate()
+
+net_obj = Network(sim_params={"t_sim": 100.})
+input_neurons = [lif_neuron_matrix(net_obj, {"I_e": 600. - (i % 5) * 100}) for i in range(10)]
+output_neuron = lif_neuron_matrix(net_obj)
+for i in range(10):
+    StaticSynapse(net_obj, input_neurons[i], output_neuron, 700., 2.5)
+net_obj.simulate()
+
+print("static max diff: ", np.max(np.abs(net.get_population("output").V_m[:, 0] - output_neuron.V_m)))
+
+# plastic synapses onto a population neuron
+spec = {
+    "sim_params": {"t_sim": 1000.},
+    "populations": {
+        "input": {"model": "lif_psc_exp_exact", "size": 4, "params": {"I_e": [400., 700., 600., 800.]}},
+        "output": {"model": "lif_psc_exp_exact", "size": 1, "params": {"I_e": 600.}, "record": ["V_m"]},
+    },
+    "projections": [
+        {"source": "input", "target": "output", "model": "stdp_nn_symm_synapse", "weight": [700., 300., 400., 800.],
+         "delay": [1.5, 2.5, 2., 0.5], "params": {"w_max": 1400}},
+    ],
+}
+net = build_network(spec)
+net.simulate()
+
+net_obj = Network(sim_params={"t_sim": 1000.})
+input_neurons = [lif_neuron_matrix(net_obj, {"I_e": I_e}) for I_e in (400., 700., 600., 800.)]
+output_neuron = lif_neuron_matrix(net_obj, {"I_e": 600.})
+for neuron, w, d in zip(input_neurons, (700., 300., 400., 800.), (1.5, 2.5, 2., 0.5)):
+    STDP_NN_SymmSnyapse(net_obj, neuron, output_neuron, init_weight=w, delay=d, params={"w_max": 1400})
+net_obj.simulate()
+
+print("stdp max diff: ", np.max(np.abs(net.get_population("output").V_m[:, 0] - output_neuron.V_m)))
+
+# allow_autapses only removes connections within one population, unknown keys and parameters of static synapses are rejected
+spec = {
+    "populations": {"a": {"model": "lif_psc_exp_exact", "size": 10}, "b": {"model": "lif_psc_exp_exact", "size": 10}},
+    "projections": [{"source": "a", "target": b, "connectivity": {"rule": "all_to_all", "allow_autapses": False}}
+                    for b in ("a", "b")],
+}
+net = build_network(spec)
+print("synapses within and between populations without autapses: ",
+      [len(net.projection_dict_by_sources["a"][i]) for i in range(2)])
+for key, value in (("rule", "fixed_indegree"), ("weights", 1.), ("params", {"w_max": 100.})):
+    try:
+        build_network(dict(spec, projections=[dict(spec["projections"][1], **{key: value})]))
+    except ValueError as error:
+        print("rejected: ", error)
+
+# build time of a network with one million synapses
+spec = {
+    "sim_params": {"t_sim": 10.},
+    "populations": {
+        "exc": {"model": "lif_psc_exp_exact", "size": 1000, "params": {"I_e": 400.}},
+    },
+    "projections": [
+        {"source": "exc", "target": "exc", "weight": 5., "delay": 1.5},
+    ],
+}
+start = time.perf_counter()
+net = build_network(spec)
+print("build time of 1e6 synapses: ", time.perf_counter() - start, "s")
+start = time.perf_counter()
+net.simulate()
+print("simulation time: ", time.perf_counter() - start, "s")
@@ -0,0 +1,75 @@
+import numpy as np
+from network.network import Network
+from network.builder import build_network, register_population_model
+from neuron_models.perfect_integrate_and_fire import pif_population
+from neuron_models.population_model import PopulationModel, GenericPopulation
+from synapse_models.static_synapse import StaticProjection
+
+
+class pif_model(PopulationModel):
+    """ pif_psc_exp neuron as population model. """
+
+    model_name = "pif_psc_exp_generic"
+    default_params = {'V_th': -55.0, 'V_reset': -70.0, 'C_m': 250.0, 'I_e': 0., 'V_init': -70.0,
+                      'E_L': -70.0, 't_ref': 2.0, 'tau_in': 2.0, 'tau_ex': 2.0}
+    state_variables = {"V_m": "V_init", "I_syn_ex": 0., "I_syn_in": 0.}
+
+    def update(self, state, params, spikes_ex, spikes_in, dt):
+        """ Evolve synaptic currents and membrane voltage with the Euler method. """
+        state["I_syn_in"] += spikes_in + dt * (- state["I_syn_in"] / params["tau_in"])
+        state["I_syn_ex"] += spikes_ex + dt * (- state["I_syn_ex"] / params["tau_ex"])
+        cur_current = params["I_e"] + state["I_syn_in"] + state["I_syn_ex"]
+        state["V_m"] += dt * cur_current / params["C_m"]
+        return cur_current
+
+    def threshold(self, state, params):
+        """ Spike if the membrane voltage is above threshold. """
+        return state["V_m"] > params["V_th"]
+
+
+class adaptive_lif_model(PopulationModel):
+    """ Leaky integrate and fire neuron with spike-frequency adaptation current w. """
+
+    model_name = "lif_adaptive_generic"
+    default_params = {'V_th': -55.0, 'V_reset': -70.0, 'tau_m': 10.0, 'C_m': 250.0, 'I_e': 0., 'E_L': -70.0,
+                      't_ref': 2.0, 'tau_w': 100.0, 'b': 50.0}
+    state_variables = {"V_m": -70.0, "w": 0.}
+
+    def update(self, state, params, spikes_ex, spikes_in, dt):
+        """ Evolve membrane voltage and adaptation current with the Euler method, spikes are voltage jumps. """
+        current = params["I_e"] - state["w"]
+        state["V_m"] += dt * (current / params["C_m"] - (state["V_m"] - params["E_L"]) / params["tau_m"]) + (spikes_ex + spikes_in) / params["C_m"]
+        state["w"] -= dt * state["w"] / params["tau_w"]
+        return current
+
+    def reset(self, state, params, spiked):
+        """ Reset membrane voltage and increase adaptation current. """
+        super().reset(state, params, spiked)
+        state["w"][spiked] += params["b"][spiked]
+
+
+# the plugin version of pif_psc_exp evolves exactly like pif_population
+N = 100
+results = []
+for make_population in (lambda net, p: pif_population(net, N, p, record=["V_m"]),
+                        lambda net, p: GenericPopulation(net, N, p, record=["V_m"], model=pif_model())):
+    net = Network(sim_params={"t_sim": 200.})
+    pop = make_population(net, {"I_e": list(np.linspace(100., 800., N))})
+    StaticProjection(net, pop, pop, np.arange(N), (np.arange(N) + 1) % N, 300., 1.5)
+    net.simulate()
+    results.append(pop)
+print("max diff to pif_population: ", np.max(np.abs(results[0].V_m - results[1].V_m)),
+      "same spikes: ", all(np.array_equal(a, b) for a, b in zip(results[0].get_spikes(), results[1].get_spikes())))
+
+# a new model in a network specification
+register_population_model(adaptive_lif_model())
+net = build_network({
+    "sim_params": {"t_sim": 500.},
+    "populations": {"adaptive": {"model": "lif_adaptive_generic", "size": 3, "params": {"I_e": [500., 800., 1200.]}, "record": ["V_m", "w"]}},
+})
+net.simulate()
+pop = net.get_population("adaptive")
+steps, indices = pop.get_spikes()
+for i in range(3):
+    isi = np.diff(steps[indices == i]) * net.get_resolution()
+    print("neuron", i, "first and last ISI in ms: ", isi[0], isi[-1], "final adaptation current: ", pop.state_traces["w"][-1, i])
@@ -0,0 +1,28 @@
+import time
+import numpy as np
+from network.network import Network
+from neuron_models.leaky_integrate_and_fire import lif_neuron_matrix, lif_neuron_matrix_ps
+from synapse_models.stdp_nn_symm_synapse import STDP_NN_SymmSnyapse
+from synapse_models.stdp_all_to_all_synapse import STDPAllToAllSynapse
+
+# configuration of test_stdp_NN.py with delays on the 1 ms grid, grid based and precise
+# spike timing at dt = 1.0 ms and 0.1 ms against precise spike timing at dt = 0.01 ms
+def simulate(neuron_class, dt, synapse_class):
+    """ Simulate the network and return the final weights and the simulation time. """
+    net = Network(sim_params={"t_sim": 1000., "dt": dt})
+    input_neurons = [neuron_class(net, {"I_e": I_e}) for I_e in (400., 700., 600., 800.)]
+    output_neuron = neuron_class(net, {"I_e": 600.})
+    synapses = [synapse_class(net, neuron, output_neuron, init_weight=w, delay=d, params={"w_max": 1400})
+                for neuron, w, d in zip(input_neurons, (700., 300., 400., 800.), (1., 3., 2., 1.))]
+    start = time.perf_counter()
+    net.simulate()
+    return np.array([syn.weight for syn in synapses]), time.perf_counter() - start
+
+for synapse_class in (STDP_NN_SymmSnyapse, STDPAllToAllSynapse):
+    reference = simulate(lif_neuron_matrix_ps, 0.01, synapse_class)[0]
+    print(synapse_class.__name__, "reference weights: ", reference)
+    for neuron_class in (lif_neuron_matrix, lif_neuron_matrix_ps):
+        for dt in (1.0, 0.1):
+            weights, duration = simulate(neuron_class, dt, synapse_class)
+            print(neuron_class.__name__, "dt =", dt, "max weight diff: ", np.max(np.abs(weights - reference)),
+                  "simulation time: ", duration, "s")
@@ -0,0 +1,35 @@
+import time
+from network.builder import build_network
+from network.progress import print_progress
+
+spec = {
+    "sim_params": {"t_sim": 2000., "dt": 0.1},
+    "populations": {
+        "input": {"model": "poisson_generator", "size": 1000, "params": {"rate": 20.}},
+        "output": {"model": "lif_psc_exp_exact", "size": 1000, "params": {"I_e": 350.}},
+    },
+    "projections": [{"source": "input", "target": "output", "connectivity": {"rule": "fixed_indegree", "indegree": 100},
+                     "weight": 50., "delay": 1.}],
+}
+
+
+def simulate(callback, interval):
+    net = build_network(spec)
+    if callback is not None:
+        net.set_progress_callback(callback, interval)
+    t = time.perf_counter()
+    net.simulate()
+    return net, time.perf_counter() - t
+
+
+# progress printed every 5000 steps
+net, _ = simulate(print_progress, 5000)
+steps, indices = net.get_population("output").get_spikes()
+reports = []
+net, _ = simulate(reports.append, 5000)
+print("reports: ", len(reports), "spikes counted: ", reports[-1]["spikes"], "of", len(net.get_population("input").get_spikes()[1]) + len(indices))
+
+# overhead of coarse reporting
+plain_time = min(simulate(None, 1)[1] for _ in range(3))
+report_time = min(simulate(lambda report: None, 1000)[1] for _ in range(3))
+print("simulation time without reports: ", plain_time, "s, with reports every 1000 steps: ", report_time, "s")
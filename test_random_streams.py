@@ -0,0 +1,60 @@
+import numpy as np
+from network.builder import build_network
+from network.distributed import run_local
+
+N = 10000
+
+# random network: Poisson input, random initial voltages, random connectivity and random weights
+spec = {
+    "sim_params": {"t_sim": 50., "seed": 1234},
+    "populations": {
+        "noise": {"model": "poisson_generator", "size": N, "params": {"rate": 200.}},
+        "exc": {"model": "lif_psc_exp_exact", "size": N,
+                "params": {"V_init": {"distribution": "uniform", "low": -70., "high": -56.}, "I_e": 300.}},
+    },
+    "projections": [
+        {"source": "noise", "target": "exc", "connectivity": {"rule": "pairwise_bernoulli", "p": 0.001},
+         "weight": 100., "delay": 1.0},
+        {"source": "exc", "target": "exc", "connectivity": {"rule": "fixed_indegree", "indegree": 20, "allow_autapses": False},
+         "weight": {"distribution": "normal", "mean": 5., "std": 20.}, "delay": {"distribution": "uniform", "low": 1., "high": 3.}},
+    ],
+}
+
+
+def get_spikes(net):
+    """ Return spikes of population exc of a single process network sorted by timestep and index. """
+    steps, indices = net.get_population("exc").get_spikes()
+    order = np.lexsort((indices, steps))
+    return steps[order], indices[order]
+
+
+def simulate(transport):
+    """ Build and simulate the local part of the network and return the spikes of population exc. """
+    net = build_network(spec, transport)
+    net.simulate()
+    return net.gather_spikes("exc")
+
+
+if __name__ == "__main__":
+    net = build_network(spec)
+    net.simulate()
+    steps, indices = get_spikes(net)
+    print("spikes in single thread: ", len(steps))
+
+    spec["sim_params"]["threads"] = 2
+    net = build_network(spec)
+    net.simulate()
+    thread_steps, thread_indices = get_spikes(net)
+    print("2 threads: ", len(thread_steps), "spikes, identical:",
+          np.array_equal(steps, thread_steps) and np.array_equal(indices, thread_indices))
+    spec["sim_params"]["threads"] = 1
+
+    for size in (2, 3):
+        dist_steps, dist_indices = run_local(simulate, size)[0]
+        print(size, "ranks: ", len(dist_steps), "spikes, identical:",
+              np.array_equal(steps, dist_steps) and np.array_equal(indices, dist_indices))
+
+    spec["sim_params"]["seed"] = 4321
+    net = build_network(spec)
+    net.simulate()
+    print("other seed: ", len(get_spikes(net)[0]), "spikes")
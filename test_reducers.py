@@ -0,0 +1,32 @@
+import numpy as np
+from network.builder import build_network
+from network.reducers import SpikeCountReducer, PopulationRateReducer, MeanVmReducer
+
+N = 100
+
+spec = {
+    "sim_params": {"t_sim": 500.},
+    "populations": {
+        "exc": {"model": "lif_psc_exp_exact", "size": N, "params": {"I_e": list(np.linspace(300., 900., N))}, "record": ["V_m"]},
+    },
+    "projections": [
+        {"source": "exc", "target": "exc", "weight": list(np.linspace(-10., 15., N * N)), "delay": 1.5},
+    ],
+}
+net = build_network(spec)
+counts = net.add_reducer("exc", SpikeCountReducer())
+rates = net.add_reducer("exc", PopulationRateReducer(bin_size=50.))
+mean_V_m = net.add_reducer("exc", MeanVmReducer())
+net.simulate()
+
+# compare with post-processing of the recorded traces
+population = net.get_population("exc")
+steps, indices = population.get_spikes()
+assert np.array_equal(counts.get_result(), np.bincount(indices, minlength=N))
+assert np.allclose(mean_V_m.get_result(), population.V_m[1:].mean(axis=0))
+times, rate = rates.get_result()
+assert np.allclose(rate, np.bincount((steps - 1) // 500, minlength=10) / (N * 0.05))
+
+for t, r in zip(times, rate):
+    print(t, r)
+print("mean V_m: ", mean_V_m.get_result()[::10])
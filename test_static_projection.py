@@ -0,0 +1,33 @@
+import time
+import numpy as np
+from network.builder import build_network, create_synapses
+
+# dense fan-out from Poisson sources, synapses created once ordered by source and once shuffled
+spec = {
+    "sim_params": {"t_sim": 200., "dt": 0.1},
+    "populations": {
+        "input": {"model": "poisson_generator", "size": 1000, "params": {"rate": 50.}},
+        "output": {"model": "lif_psc_exp_exact", "size": 1000, "record": ["V_m"]},
+    },
+}
+rng = np.random.default_rng(1)
+sources, targets = np.divmod(np.arange(1000 * 1000), 1000)
+# integer weights, so the summed input does not depend on the order of the additions
+weights = rng.integers(-4, 5, len(sources)).astype(float)
+delays = rng.integers(1, 30, len(sources)) / 10.
+
+
+def simulate(order):
+    net = build_network(spec)
+    source, target = net.populations
+    create_synapses(net, source, target, sources[order], targets[order], weights[order], delays[order])
+    t = time.perf_counter()
+    net.simulate()
+    return target, time.perf_counter() - t
+
+
+ordered, ordered_time = simulate(np.arange(len(sources)))
+shuffled, shuffled_time = simulate(rng.permutation(len(sources)))
+print("simulation time with 1e6 synapses ordered: ", ordered_time, "s, shuffled: ", shuffled_time, "s")
+print("V_m identical: ", np.array_equal(ordered.V_m, shuffled.V_m))
+print("V_m range: ", ordered.V_m.min(), ordered.V_m.max())
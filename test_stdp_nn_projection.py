@@ -0,0 +1,94 @@
+import time
+import numpy as np
+from network.network import Network
+from network.builder import build_network
+from network.distributed import run_local
+from neuron_models.leaky_integrate_and_fire import lif_neuron_matrix
+from synapse_models.stdp_nn_symm_synapse import STDP_NN_SymmSnyapse, STDP_NN_SymmProjection
+
+# configuration of test_stdp_NN.py, once with single objects and once with a projection
+net_obj = Network(sim_params={"t_sim": 1000.})
+input_neurons = [lif_neuron_matrix(net_obj, {"I_e": I_e}) for I_e in (400., 700., 600., 800.)]
+output_neuron = lif_neuron_matrix(net_obj, {"I_e": 600.})
+synapses = [STDP_NN_SymmSnyapse(net_obj, neuron, output_neuron, init_weight=w, delay=d, params={"w_max": 1400})
+            for neuron, w, d in zip(input_neurons, (700., 300., 400., 800.), (1.5, 2.5, 2., 0.5))]
+net_obj.simulate()
+
+spec = {
+    "sim_params": {"t_sim": 1000.},
+    "populations": {
+        "input": {"model": "lif_psc_exp_exact", "size": 4, "params": {"I_e": [400., 700., 600., 800.]}},
+        "output": {"model": "lif_psc_exp_exact", "size": 1, "params": {"I_e": 600.}, "record": ["V_m"]},
+    },
+    "projections": [
+        {"source": "input", "target": "output", "model": "stdp_nn_symm_synapse", "weight": [700., 300., 400., 800.],
+         "delay": [1.5, 2.5, 2., 0.5], "params": {"w_max": 1400}},
+    ],
+}
+net = build_network(spec)
+net.simulate()
+proj = net.projection_dict_by_sources["input"][0]
+print("V_m identical: ", np.array_equal(net.get_population("output").V_m[:, 0], output_neuron.V_m))
+histories = [net.weight_events.history(i, w) for i, w in zip(proj.synapse_indices, proj.get_initial_weights())]
+print("weight histories identical: ", all(np.array_equal(a, b) for syn, history in zip(synapses, histories)
+                                           for a, b in zip(syn.get_weight_history(), history)),
+      "weight changes: ", sum(len(history[0]) - 1 for history in histories))
+
+# delays below one timestep are built as synapse objects, which the projection rejects
+short_spec = dict(spec, projections=[dict(spec["projections"][0], delay=[1.5, 2.5, 0.05, 0.5])])
+net_short = build_network(short_spec)
+net_short.simulate()
+short_synapses = [syn for syns in net_short.synapse_dict_by_sources.values() for syn in syns]
+print("synapse objects for delays below one timestep: ", len(short_synapses), "projections: ",
+      sum(len(projs) for projs in net_short.projection_dict_by_sources.values()))
+try:
+    STDP_NN_SymmProjection(net_short, net_short.get_population("input"), net_short.get_population("output"), [0], [0], 100., 0.05)
+except ValueError as error:
+    print("rejected: ", error)
+
+# many synapses sharing target neuron and delay, compared with synapse objects onto the same populations
+large_spec = {
+    "sim_params": {"t_sim": 1000., "dt": 0.1},
+    "populations": {
+        "input": {"model": "poisson_generator", "size": 500, "params": {"rate": 10.}},
+        "output": {"model": "lif_psc_exp_exact", "size": 20, "params": {"I_e": 300.}, "record": ["V_m"]},
+    },
+    "projections": [{"source": "input", "target": "output", "model": "stdp_nn_symm_synapse",
+                     "weight": {"distribution": "uniform", "low": 20., "high": 60.}, "delay": [1., 1.5, 2.] * 3334,
+                     "params": {"w_max": 100., "lambda": 0.05, "alpha": 1.1, "mu_plus": 0.5, "mu_minus": 0.5}}],
+}
+large_spec["projections"][0]["delay"] = large_spec["projections"][0]["delay"][:10000]
+
+
+def simulate_large(transport=None):
+    """ Build and simulate the local part of the large network and return the spikes of population output. """
+    net = build_network(large_spec, transport)
+    net.simulate()
+    return net.gather_spikes("output")
+
+
+if __name__ == "__main__":
+    net = build_network(large_spec)
+    t = time.perf_counter()
+    net.simulate()
+    proj_time = time.perf_counter() - t
+    proj = net.projection_dict_by_sources["input"][0]
+
+    net_obj = build_network(dict(large_spec, projections=[]))
+    source, target = net_obj.get_population("input"), net_obj.get_population("output")
+    params = large_spec["projections"][0]["params"]
+    objects = [STDP_NN_SymmSnyapse(net_obj, int(s) + source.first_id, int(j) + target.first_id, init_weight=w, delay=d, params=params)
+               for s, j, w, d in zip(proj.sources.tolist(), proj.targets.tolist(), proj.get_initial_weights().tolist(), proj.delays.tolist())]
+    t = time.perf_counter()
+    net_obj.simulate()
+    obj_time = time.perf_counter() - t
+    print("synapses: ", len(proj), "groups of target and delay: ", len(proj.group_ptr) - 1)
+    print("V_m identical: ", np.array_equal(net.get_population("output").V_m, net_obj.get_population("output").V_m))
+    print("weights identical: ", np.array_equal(proj.get_weights(), [syn.weight for syn in objects]),
+          "mean weight: ", proj.get_weights().mean(), "weight changes: ", len(net.weight_events))
+    print("simulation time with synapse objects: ", obj_time, "s, with projection: ", proj_time, "s")
+
+    steps, indices = net.get_population("output").get_spikes()
+    order = np.lexsort((indices, steps))
+    dist_steps, dist_indices = run_local(simulate_large, 2)[0]
+    print("2 ranks identical spikes: ", np.array_equal(steps[order], dist_steps) and np.array_equal(indices[order], dist_indices))
@@ -0,0 +1,95 @@
+import shutil
+import tempfile
+import numpy as np
+from network.builder import build_network
+from network.connectivity import export_connections
+from network.distributed import run_local
+
+# STDP synapse objects with dominating additive depression, so most weights are driven to 0
+stdp_spec = {
+    "sim_params": {"t_sim": 2000., "dt": 0.1},
+    "populations": {
+        "input": {"model": "poisson_generator", "size": 100, "params": {"rate": 20.}},
+        "output": {"model": "lif_psc_exp_exact", "size": 20, "params": {"I_e": 300.}},
+    },
+    "projections": [{"source": "input", "target": "output", "model": "stdp_all_to_all_synapse", "weight": 200., "delay": 1.,
+                     "params": {"alpha": 3., "mu_minus": 0., "lambda": 0.05, "w_max": 400.}}],
+}
+
+
+def simulate_stdp(structural_plasticity):
+    net = build_network(dict(stdp_spec, structural_plasticity=structural_plasticity))
+    wall_times = []
+    net.set_progress_callback(lambda report: wall_times.append(report["wall_time"]), 5000)
+    net.simulate()
+    return net, np.diff(wall_times, prepend=0.)
+
+
+net, fixed_times = simulate_stdp(None)
+print("without pruning: ", len(export_connections(net)["weights"]), "synapses, wall time of the 4 quarters: ", fixed_times)
+net, pruned_times = simulate_stdp({"interval": 50., "threshold": 1.})
+print("with pruning: ", len(export_connections(net)["weights"]), "synapses, wall time of the 4 quarters: ", pruned_times)
+
+# pruning synapses of weight 0 in a static projection does not change the dynamics
+static_spec = {
+    "sim_params": {"t_sim": 500., "dt": 0.1},
+    "populations": {
+        "input": {"model": "poisson_generator", "size": 200, "params": {"rate": 50.}},
+        "output": {"model": "lif_psc_exp_exact", "size": 100, "record": ["V_m"]},
+    },
+    "projections": [{"source": "input", "target": "output", "weight": list(np.tile([0., 40.], 10000)), "delay": 1.}],
+}
+fixed = build_network(static_spec)
+fixed.simulate()
+pruned = build_network(dict(static_spec, structural_plasticity={"interval": 20.}))
+pruned.simulate()
+proj = pruned.projection_dict_by_sources["input"][0]
+print("synapses after pruning: ", proj.get_num_synapses(), "entries: ", len(proj),
+      "V_m identical: ", np.array_equal(fixed.get_population("output").V_m, pruned.get_population("output").V_m))
+connections = export_connections(pruned)
+print("exported: ", len(connections["weights"]), "min weight: ", connections["weights"].min(),
+      "synapses at step 0: ", len(export_connections(pruned, 0)["weights"]))
+
+# grown synapses are only added to a projection with the same parameters
+params = {"w_max": 400.}
+nn_spec = dict(static_spec, projections=[dict(static_spec["projections"][0], model="stdp_nn_symm_synapse", params=params)])
+for growth_params in (params, {"w_max": 800.}):
+    net = build_network(dict(nn_spec, structural_plasticity={"interval": 250., "threshold": 0., "growth": [
+        {"source": "input", "target": "output", "n": 100, "weight": 20., "delay": 1., "model": "stdp_nn_symm_synapse",
+         "params": growth_params}]}))
+    net.simulate()
+    print("growth with w_max ", growth_params["w_max"], ": projections ",
+          [(len(proj), proj.w_max) for proj in net.projection_dict_by_sources["input"]])
+
+# memory-mapped projections are skipped by pruning
+directory = tempfile.mkdtemp()
+mapped = build_network(dict(static_spec, projections=[dict(static_spec["projections"][0], directory=directory)],
+                            structural_plasticity={"interval": 20.}))
+mapped.simulate()
+print("memory-mapped synapses after pruning: ", len(mapped.projection_dict_by_sources["input"][0]),
+      "V_m identical: ", np.array_equal(fixed.get_population("output").V_m, mapped.get_population("output").V_m))
+shutil.rmtree(directory)
+
+# growing synapses gives the same connectivity and spikes in a single and in several processes
+growth_spec = dict(static_spec, structural_plasticity={
+    "interval": 50., "growth": [{"source": "input", "target": "output", "n": 500, "weight": 20., "delay": 1.5}]})
+
+
+def simulate_growth(transport):
+    """ Build and simulate the local part of the network and return the spikes of population output. """
+    net = build_network(growth_spec, transport)
+    net.simulate()
+    return net.gather_spikes("output"), net.structural_plasticity.num_created, net.structural_plasticity.num_removed
+
+
+if __name__ == "__main__":
+    net = build_network(growth_spec)
+    net.simulate()
+    steps, indices = net.get_population("output").get_spikes()
+    order = np.lexsort((indices, steps))
+    print("created: ", net.structural_plasticity.num_created, "removed: ", net.structural_plasticity.num_removed,
+          "spikes: ", len(steps))
+    results = run_local(simulate_growth, 2)
+    (dist_steps, dist_indices), _, _ = results[0]
+    print("2 ranks created: ", sum(r[1] for r in results), "removed: ", sum(r[2] for r in results), "identical spikes: ",
+          np.array_equal(steps[order], dist_steps) and np.array_equal(indices[order], dist_indices))
@@ -0,0 +1,29 @@
+import numpy as np
+from network.network import Network
+from neuron_models.leaky_integrate_and_fire import lif_neuron_matrix
+from synapse_models.stdp_all_to_all_synapse import STDPAllToAllSynapse
+from synapse_models.static_synapse import StaticSynapse
+
+net = Network(sim_params={"t_sim": 1000.})
+
+input_neurons = [lif_neuron_matrix(net, {"I_e": I_e}) for I_e in (400., 700., 600., 800.)]
+output_neuron = lif_neuron_matrix(net, {"I_e": 350.})
+
+synapses = [STDPAllToAllSynapse(net, neuron, output_neuron, init_weight=w, delay=d, params={"w_max": 1400})
+            for neuron, w, d in zip(input_neurons, (700., 300., 400., 800.), (1.5, 2.5, 2., 0.5))]
+StaticSynapse(net, input_neurons[0], input_neurons[1], 100., 1.)
+
+net.simulate()
+
+print("number of weight change records: ", len(net.weight_events))
+
+# rebuild weight matrices from the event buffer and compare with the single synapse histories
+for step in (0, 2500, 5000, 10000):
+    W = net.get_weight_matrix(step)
+    for syn in synapses:
+        steps, weights = syn.get_weight_history()
+        expected = weights[np.searchsorted(steps, step, side="right") - 1]
+        assert W[syn.get_source_id(), syn.get_target_id()] == expected
+    print(step * net.get_resolution(), W[:4, 4])
+
+assert np.array_equal(net.get_weights_at(10000)[:4], [syn.get_weight() for syn in synapses])